@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backlog', '0020_add_scoring_mode_to_factors'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='costfactoranswer',
+            index=models.Index(fields=['costfactor', 'score'], name='cfanswer_factor_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='valuefactoranswer',
+            index=models.Index(fields=['valuefactor', 'score'], name='vfanswer_factor_score_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backlog', '0021_add_answer_score_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='storyhistory',
+            index=models.Index(fields=['story', '-changed_at'], name='history_story_changed_idx'),
+        ),
+    ]
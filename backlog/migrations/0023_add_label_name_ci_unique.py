@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:04
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def merge_case_duplicate_labels(apps, schema_editor):
+    """Merge labels whose names differ only by case within a category.
+    
+    The oldest label of each group is kept; the stories of the others are
+    moved onto it before they are deleted, so the constraint can be added.
+    Names are compared with the database's LOWER(), as the constraint does.
+    """
+    Label = apps.get_model('backlog', 'Label')
+    Story = apps.get_model('backlog', 'Story')
+    StoryLabel = Story.labels.through
+
+    keepers = {}
+    duplicates = {}  # duplicate label id -> kept label id
+    labels = Label.objects.annotate(name_ci=Lower('name')).order_by('id')
+    for label_id, category_id, name_ci in labels.values_list('id', 'category_id', 'name_ci'):
+        keeper_id = keepers.setdefault((category_id, name_ci), label_id)
+        if keeper_id != label_id:
+            duplicates[label_id] = keeper_id
+    if not duplicates:
+        return
+
+    # Link each duplicate's stories to the kept label, skipping existing links
+    linked = set(
+        StoryLabel.objects.filter(label_id__in=set(duplicates.values())).values_list('story_id', 'label_id')
+    )
+    new_links = set()
+    for story_id, label_id in StoryLabel.objects.filter(label_id__in=duplicates).values_list('story_id', 'label_id'):
+        link = (story_id, duplicates[label_id])
+        if link not in linked:
+            new_links.add(link)
+    StoryLabel.objects.bulk_create(
+        [StoryLabel(story_id=story_id, label_id=label_id) for story_id, label_id in new_links]
+    )
+    Label.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backlog', '0022_add_story_history_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_case_duplicate_labels, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='label',
+            constraint=models.UniqueConstraint(models.F('category'), django.db.models.functions.text.Lower('name'), name='label_category_name_ci_unique'),
+        ),
+    ]
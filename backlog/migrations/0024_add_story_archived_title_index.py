@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backlog', '0023_add_label_name_ci_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['archived', 'title'], name='story_archived_title_idx'),
+        ),
+    ]
@@ -13,9 +13,14 @@ This module defines the core data models:
 The WSJF score is calculated as:
     Result = sum(value_section_averages) / sum(cost_section_averages)
 """
+import time
+
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models import Case, Exists, ExpressionWrapper, F, OuterRef, Q, Value, When
+from django.db.models.functions import Lower, Replace, Trim
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 
@@ -66,6 +71,12 @@ class Label(models.Model):
         verbose_name_plural = "labels"
         ordering = ['category__name', 'name']
         unique_together = [['category', 'name']]
+        constraints = [
+            # Label names are unique per category regardless of case
+            models.UniqueConstraint(
+                'category', Lower('name'), name='label_category_name_ci_unique'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.category.icon} {self.name}"
@@ -85,6 +96,11 @@ class Label(models.Model):
 # Story Model
 # =============================================================================
 
+# Whitespace ignored when deciding whether a story's text field is filled in.
+# The SQL status annotation can only strip this ASCII set, so the Python
+# checks strip the same set instead of str.strip()'s Unicode whitespace.
+_BLANK_CHARS = ' \t\n\r\x0b\x0c'
+
 
 class Story(models.Model):
     """A user story representing a unit of work to be prioritized and completed.
@@ -123,23 +139,12 @@ class Story(models.Model):
         Note: For optimal performance, prefetch 'scores' and 'cost_scores' before
         accessing this property on multiple stories.
         """
-        # Priority order: blocked > done > started > planned > ready > idea
-        if self.blocked and self.blocked.strip():
-            return 'blocked'
-        if self.finished:
-            return 'done'
-        if self.started:
-            return 'started'
-        if self.planned:
-            return 'planned'
-        
-        # Check if all text fields are filled
-        has_title = bool(self.title and self.title.strip())
-        has_goal = bool(self.goal and self.goal.strip())
-        has_workitems = bool(self.workitems and self.workitems.strip())
-        
-        if not (has_title and has_goal and has_workitems):
-            return 'idea'
+        status = Story.status_from_fields(
+            self.blocked, self.finished, self.started, self.planned,
+            self.title, self.goal, self.workitems,
+        )
+        if status is not None:
+            return status
         
         # Use prefetched scores if available (avoids N+1 queries)
         if hasattr(self, '_prefetched_objects_cache'):
@@ -151,7 +156,7 @@ class Story(models.Model):
             story_vf_ids = set(self.scores.filter(answer__isnull=False).values_list('valuefactor_id', flat=True))
             story_cf_ids = set(self.cost_scores.filter(answer__isnull=False).values_list('costfactor_id', flat=True))
         
-        # Get all factor IDs (cached at class level for performance)
+        # Get all factor IDs (cached across requests for performance)
         all_vf_ids = Story._get_all_value_factor_ids()
         all_cf_ids = Story._get_all_cost_factor_ids()
         
@@ -161,29 +166,141 @@ class Story(models.Model):
         
         return 'ready'
     
-    # Class-level cache for factor IDs to avoid repeated queries
-    _cached_value_factor_ids = None
-    _cached_cost_factor_ids = None
+    @staticmethod
+    def status_from_fields(blocked, finished, started, planned, title, goal, workitems):
+        """Return the status decided by the story's own fields, or None.
+        
+        None means the text fields are complete and the status ('ready' or
+        'idea') depends on whether all factors are scored. Shared by
+        computed_status and views that work with `.values()` rows.
+        """
+        # Priority order: blocked > done > started > planned > ready > idea
+        if Story.has_text(blocked):
+            return 'blocked'
+        if finished:
+            return 'done'
+        if started:
+            return 'started'
+        if planned:
+            return 'planned'
+        
+        # Check if all text fields are filled
+        has_title = Story.has_text(title)
+        has_goal = Story.has_text(goal)
+        has_workitems = Story.has_text(workitems)
+        
+        if not (has_title and has_goal and has_workitems):
+            return 'idea'
+        return None
+    
+    @staticmethod
+    def has_text(value):
+        """Whether a text field holds anything besides whitespace (see _BLANK_CHARS)."""
+        return bool(value and value.strip(_BLANK_CHARS))
+    
+    @staticmethod
+    def _strip_whitespace(field):
+        """Return a SQL expression for `field` stripped like Story.has_text() strips it.
+        
+        SQL TRIM only removes spaces, so tabs, newlines and the other
+        _BLANK_CHARS are turned into spaces first. Otherwise a field holding
+        only '\\r\\n' would count as filled in SQL but as blank in
+        computed_status.
+        """
+        expression = F(field)
+        for char in _BLANK_CHARS[1:]:  # everything but the space, which TRIM removes
+            expression = Replace(expression, Value(char), Value(' '), output_field=models.TextField())
+        return Trim(expression)
     
     @classmethod
-    def _get_all_value_factor_ids(cls):
-        """Get all value factor IDs (cached at class level)."""
-        if cls._cached_value_factor_ids is None:
-            cls._cached_value_factor_ids = set(ValueFactor.objects.values_list('id', flat=True))
-        return cls._cached_value_factor_ids
+    def with_status(cls, queryset=None):
+        """Annotate stories with `annotated_status`, computed in the database.
+        
+        Mirrors computed_status so stories can be filtered by status in SQL
+        instead of loading every row and checking the property in Python.
+        
+        Args:
+            queryset: Optional Story queryset to annotate (defaults to all stories)
+            
+        Returns:
+            Story queryset with an `annotated_status` annotation
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        missing_value, missing_cost = cls._missing_scores_exists()
+        return queryset.annotate(
+            _blocked_trim=cls._strip_whitespace('blocked'),
+            _title_trim=cls._strip_whitespace('title'),
+            _goal_trim=cls._strip_whitespace('goal'),
+            _workitems_trim=cls._strip_whitespace('workitems'),
+        ).annotate(annotated_status=Case(
+            # Priority order: blocked > done > started > planned > ready > idea
+            When(~Q(_blocked_trim=''), then=Value('blocked')),
+            When(finished__isnull=False, then=Value('done')),
+            When(started__isnull=False, then=Value('started')),
+            When(planned__isnull=False, then=Value('planned')),
+            When(Q(_title_trim='') | Q(_goal_trim='') | Q(_workitems_trim=''), then=Value('idea')),
+            When(missing_value, then=Value('idea')),
+            When(missing_cost, then=Value('idea')),
+            default=Value('ready'),
+            output_field=models.CharField(),
+        ))
     
     @classmethod
-    def _get_all_cost_factor_ids(cls):
-        """Get all cost factor IDs (cached at class level)."""
-        if cls._cached_cost_factor_ids is None:
-            cls._cached_cost_factor_ids = set(CostFactor.objects.values_list('id', flat=True))
-        return cls._cached_cost_factor_ids
+    def with_scores_complete(cls, queryset=None):
+        """Annotate stories with `scores_complete`, computed in the database.
+        
+        True when every value and cost factor has an answered score for the
+        story, so list views can show completeness without loading scores.
+        
+        Args:
+            queryset: Optional Story queryset to annotate (defaults to all stories)
+            
+        Returns:
+            Story queryset with a boolean `scores_complete` annotation
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        missing_value, missing_cost = cls._missing_scores_exists()
+        return queryset.annotate(scores_complete=ExpressionWrapper(
+            ~missing_value & ~missing_cost, output_field=models.BooleanField()
+        ))
+    
+    @staticmethod
+    def _missing_scores_exists():
+        """Build Exists() expressions for factors the outer story has not answered.
+        
+        Returns:
+            Tuple of (missing_value, missing_cost) Exists expressions
+        """
+        answered_value = StoryValueFactorScore.objects.filter(
+            story=OuterRef(OuterRef('pk')), answer__isnull=False
+        ).values('valuefactor_id')
+        answered_cost = StoryCostFactorScore.objects.filter(
+            story=OuterRef(OuterRef('pk')), answer__isnull=False
+        ).values('costfactor_id')
+        return (
+            Exists(ValueFactor.objects.exclude(id__in=answered_value)),
+            Exists(CostFactor.objects.exclude(id__in=answered_cost)),
+        )
     
     @classmethod
-    def clear_factor_cache(cls):
-        """Clear the cached factor IDs (call after adding/removing factors)."""
-        cls._cached_value_factor_ids = None
-        cls._cached_cost_factor_ids = None
+    def _get_all_value_factor_ids(cls):
+        """Get all value factor IDs as a frozenset (cached across requests and workers)."""
+        return cache.get_or_set(
+            VALUE_FACTOR_IDS_CACHE_KEY,
+            lambda: frozenset(ValueFactor.objects.values_list('id', flat=True)),
+            _FACTOR_IDS_CACHE_TIMEOUT,
+        )
+    
+    @classmethod
+    def _get_all_cost_factor_ids(cls):
+        """Get all cost factor IDs as a frozenset (cached across requests and workers)."""
+        return cache.get_or_set(
+            COST_FACTOR_IDS_CACHE_KEY,
+            lambda: frozenset(CostFactor.objects.values_list('id', flat=True)),
+            _FACTOR_IDS_CACHE_TIMEOUT,
+        )
 
     class Meta:
         verbose_name = "story"
@@ -194,12 +311,13 @@ class Story(models.Model):
         indexes = [
             models.Index(fields=['archived', 'status'], name='story_archived_status_idx'),
             models.Index(fields=['archived', 'created_at'], name='story_archived_created_idx'),
+            models.Index(fields=['archived', 'title'], name='story_archived_title_idx'),
         ]
 
     def save(self, *args, **kwargs):
         """Auto-update status based on goal and workitems fields."""
-        has_goal = bool(self.goal and self.goal.strip())
-        has_work = bool(self.workitems and self.workitems.strip())
+        has_goal = self.has_text(self.goal)
+        has_work = self.has_text(self.workitems)
         desired = self.STATUS_REFINED if (has_goal and has_work) else self.STATUS_NEW
         if self.status != desired:
             self.status = desired
@@ -271,6 +389,10 @@ class ValueFactorAnswer(models.Model):
         verbose_name = "value factor answer"
         verbose_name_plural = "value factor answers"
         ordering = ['valuefactor', 'score']
+        # Answers are listed per factor in score order (relative ranking boundaries)
+        indexes = [
+            models.Index(fields=['valuefactor', 'score'], name='vfanswer_factor_score_idx'),
+        ]
 
     def __str__(self):
         return f"{self.description} ({self.score})"
@@ -373,6 +495,10 @@ class CostFactorAnswer(models.Model):
         verbose_name = "cost factor answer"
         verbose_name_plural = "cost factor answers"
         ordering = ['costfactor', 'score']
+        # Answers are listed per factor in score order (relative ranking boundaries)
+        indexes = [
+            models.Index(fields=['costfactor', 'score'], name='cfanswer_factor_score_idx'),
+        ]
 
     def __str__(self):
         return f"{self.description} ({self.score})"
@@ -431,7 +557,9 @@ def ensure_scores_for_story(sender, instance: Story, created, **kwargs):
     if not created:
         return
     
-    # Bulk create value scores
+    # Bulk create value scores. The factor IDs are queried fresh rather than
+    # taken from the cached factor ID sets: a factor deleted since the set was
+    # cached would otherwise fail the foreign key check.
     value_factor_ids = list(ValueFactor.objects.values_list('id', flat=True))
     StoryValueFactorScore.objects.bulk_create([
         StoryValueFactorScore(story=instance, valuefactor_id=vf_id, answer=None)
@@ -446,6 +574,139 @@ def ensure_scores_for_story(sender, instance: Story, created, **kwargs):
     ], ignore_conflicts=True)
 
 
+# Cache key for the per-factor answer score ranges (see relative_report)
+FACTOR_RANGES_CACHE_KEY = 'wsjf:factor_ranges:v1'
+
+# Cache key for the report's sections with their factors (see report_view)
+REPORT_SECTIONS_CACHE_KEY = 'wsjf:report_sections:v1'
+
+# Cache key for the sections -> factors -> answers tree of the refine form
+REFINE_FACTOR_TREE_CACHE_KEY = 'wsjf:refine_factor_tree:v1'
+
+# Cache keys for the frozensets of all factor IDs (see Story._get_all_value_factor_ids)
+VALUE_FACTOR_IDS_CACHE_KEY = 'wsjf:value_factor_ids:v1'
+COST_FACTOR_IDS_CACHE_KEY = 'wsjf:cost_factor_ids:v1'
+
+# Seconds the factor ID sets stay cached (signals also drop them)
+_FACTOR_IDS_CACHE_TIMEOUT = 3600
+
+# Cache key for the label categories and their labels (see get_label_filter_context)
+LABEL_CATEGORIES_CACHE_KEY = 'wsjf:label_categories:v1'
+
+
+def _delete_cached(keys):
+    """Drop cache entries now and again once the surrounding transaction commits.
+    
+    Until the commit other workers still read the old data and may cache it
+    again in between.
+    """
+    keys = list(keys)
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver([post_save, post_delete], sender=Label)
+@receiver([post_save, post_delete], sender=LabelCategory)
+def invalidate_label_cache(sender, **kwargs):
+    """Signal handler to drop the cached label categories when labels change."""
+    _delete_cached([LABEL_CATEGORIES_CACHE_KEY])
+
+
+@receiver([post_save, post_delete], sender=ValueFactor)
+@receiver([post_save, post_delete], sender=CostFactor)
+def invalidate_factor_cache(sender, instance, **kwargs):
+    """Signal handler to drop cached factor data when factors change."""
+    _delete_cached([
+        factor_cache_key(sender, instance.id), FACTOR_RANGES_CACHE_KEY, REPORT_SECTIONS_CACHE_KEY,
+        REFINE_FACTOR_TREE_CACHE_KEY, VALUE_FACTOR_IDS_CACHE_KEY, COST_FACTOR_IDS_CACHE_KEY,
+    ])
+
+
+def factor_cache_key(factor_model, factor_id):
+    """Cache key for a factor and its answer boundaries (see relative_ranking).
+    
+    Args:
+        factor_model: ValueFactor or CostFactor
+        factor_id: Primary key of the factor
+    """
+    prefix = 'vfactor' if factor_model is ValueFactor else 'cfactor'
+    return f'{prefix}:{factor_id}'
+
+
+@receiver([post_save, post_delete], sender=ValueFactorAnswer)
+def invalidate_value_answer_cache(sender, instance, **kwargs):
+    """Signal handler to drop cached value factor data when its answers change."""
+    _delete_cached([
+        factor_cache_key(ValueFactor, instance.valuefactor_id), FACTOR_RANGES_CACHE_KEY,
+        REFINE_FACTOR_TREE_CACHE_KEY,
+    ])
+
+
+@receiver([post_save, post_delete], sender=CostFactorAnswer)
+def invalidate_cost_answer_cache(sender, instance, **kwargs):
+    """Signal handler to drop cached cost factor data when its answers change."""
+    _delete_cached([
+        factor_cache_key(CostFactor, instance.costfactor_id), FACTOR_RANGES_CACHE_KEY,
+        REFINE_FACTOR_TREE_CACHE_KEY,
+    ])
+
+
+@receiver([post_save, post_delete], sender=ValueFactorSection)
+@receiver([post_save, post_delete], sender=CostFactorSection)
+def invalidate_section_factor_cache(sender, instance, **kwargs):
+    """Signal handler to drop cached sections and the factors of a renamed section."""
+    factor_model = ValueFactor if sender is ValueFactorSection else CostFactor
+    factor_ids = factor_model.objects.filter(section=instance).values_list('id', flat=True)
+    _delete_cached([
+        *(factor_cache_key(factor_model, fid) for fid in factor_ids), REPORT_SECTIONS_CACHE_KEY,
+        REFINE_FACTOR_TREE_CACHE_KEY,
+    ])
+
+
+# Cache key for the version stamp of the data shown on the WSJF report and WBS
+REPORT_CACHE_VERSION_KEY = 'wsjf:report_version'
+
+
+def report_cache_version():
+    """Current version stamp of the data shown on the WSJF report (see report_view)."""
+    return cache.get_or_set(REPORT_CACHE_VERSION_KEY, time.time_ns, None)
+
+
+def _set_report_cache_version():
+    cache.set(REPORT_CACHE_VERSION_KEY, time.time_ns(), None)
+
+
+def bump_report_cache_version():
+    """Move to a new report version stamp, orphaning every cached report page.
+    
+    Called by signals; queryset update() calls that touch report data must
+    call it themselves since update() sends no signals.
+    
+    The version is bumped right away and again once the surrounding
+    transaction commits: until then other workers still read the old data
+    and may cache pages built from it under the first new version.
+    """
+    _set_report_cache_version()
+    transaction.on_commit(_set_report_cache_version)
+
+
+@receiver([post_save, post_delete], sender=Story)
+@receiver([post_save, post_delete], sender=StoryValueFactorScore)
+@receiver([post_save, post_delete], sender=StoryCostFactorScore)
+@receiver([post_save, post_delete], sender=ValueFactorSection)
+@receiver([post_save, post_delete], sender=CostFactorSection)
+@receiver([post_save, post_delete], sender=ValueFactor)
+@receiver([post_save, post_delete], sender=CostFactor)
+@receiver([post_save, post_delete], sender=ValueFactorAnswer)
+@receiver([post_save, post_delete], sender=CostFactorAnswer)
+@receiver([post_save, post_delete], sender=Label)
+@receiver([post_save, post_delete], sender=LabelCategory)
+@receiver(m2m_changed, sender=Story.labels.through)
+def invalidate_report_cache(sender, **kwargs):
+    """Signal handler to invalidate cached report pages when report data changes."""
+    bump_report_cache_version()
+
+
 class StoryDependency(models.Model):
     """Represents a dependency relationship between two stories.
     
@@ -464,6 +725,38 @@ class StoryDependency(models.Model):
     def __str__(self):
         return f"{self.story.title} → {self.depends_on.title}"
 
+    @classmethod
+    def would_create_cycle(cls, story_id, depends_on_id):
+        """Check whether adding `story_id` depends on `depends_on_id` closes a cycle.
+        
+        Walks the existing dependencies breadth-first from `depends_on_id`,
+        one query per level, visiting only the stories reachable from it.
+        
+        Args:
+            story_id: ID of the story that would get the dependency
+            depends_on_id: ID of the story it would depend on
+            
+        Returns:
+            True if `depends_on_id` already depends on `story_id`, directly
+            or transitively (or both IDs are the same)
+        """
+        seen = {depends_on_id}
+        frontier = seen
+        while frontier:
+            if story_id in frontier:
+                return True
+            frontier = set(
+                cls.objects.filter(story_id__in=frontier).values_list('depends_on_id', flat=True)
+            ) - seen
+            seen |= frontier
+        return False
+
+
+@receiver([post_save, post_delete], sender=StoryDependency)
+def invalidate_dependency_cache(sender, **kwargs):
+    """Signal handler to invalidate cached WBS data when dependencies change."""
+    bump_report_cache_version()
+
 
 class StoryHistory(models.Model):
     """Audit trail for changes made to a story.
@@ -480,6 +773,10 @@ class StoryHistory(models.Model):
         verbose_name = "story history"
         verbose_name_plural = "story history entries"
         ordering = ['-changed_at']
+        # A story's recent history is read newest first (refine page)
+        indexes = [
+            models.Index(fields=['story', '-changed_at'], name='history_story_changed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.story.title}: {self.field_name} changed at {self.changed_at}"
@@ -16,7 +16,10 @@ These tests cover:
 import json
 from datetime import timedelta
 
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -34,14 +37,28 @@ from .models import (
     StoryHistory,
     LabelCategory,
     Label,
+    LABEL_CATEGORIES_CACHE_KEY,
+    VALUE_FACTOR_IDS_CACHE_KEY,
+    COST_FACTOR_IDS_CACHE_KEY,
+    bump_report_cache_version,
 )
 
 
+# Tests use an in-memory cache rather than the on-disk cache of the settings,
+# so running them never touches (or clears) the cache of a live deployment
+_TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'wos-tests'},
+}
+
+
+@override_settings(CACHES=_TEST_CACHES)
 class BaseTestCase(TestCase):
     """Base test case with common setup for all tests."""
 
     def setUp(self):
         """Set up test data used across multiple tests."""
+        # The in-memory cache outlives a test, so start every test from an empty one
+        cache.clear()
         self.client = Client()
         
         # Create value factor section and factors
@@ -146,6 +163,16 @@ class StoryModelTests(BaseTestCase):
         self.assertEqual(story.status, Story.STATUS_NEW)
 
 
+    def test_factor_id_cache_invalidated_on_factor_change(self):
+        """Test that the cached factor IDs follow factor creation and deletion."""
+        self.assertIn(self.value_factor.id, Story._get_all_value_factor_ids())
+        extra = ValueFactor.objects.create(section=self.value_section, name="Extra")
+        self.assertIn(extra.id, Story._get_all_value_factor_ids())
+        extra_id = extra.id
+        extra.delete()
+        self.assertNotIn(extra_id, Story._get_all_value_factor_ids())
+
+
 class ComputedStatusTests(BaseTestCase):
     """Tests for Story.computed_status property - critical for status display."""
 
@@ -274,6 +301,48 @@ class ComputedStatusTests(BaseTestCase):
         self.assertEqual(story.computed_status, "started")
 
 
+    def test_with_status_matches_computed_status(self):
+        """Test the database-side status annotation agrees with computed_status."""
+        now = timezone.now()
+        ready = Story.objects.create(title="Ready", goal="Goal", workitems="Work")
+        StoryValueFactorScore.objects.filter(story=ready).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=ready).update(answer=self.cf_answer_2)
+        Story.objects.create(title="Idea", goal="Goal", workitems="Work")
+        Story.objects.create(title="Blank goal", goal="   ", workitems="Work")
+        Story.objects.create(title="Planned", planned=now)
+        Story.objects.create(title="Started", planned=now, started=now)
+        Story.objects.create(title="Done", started=now, finished=now)
+        Story.objects.create(title="Blocked", finished=now, blocked="Waiting")
+        Story.objects.create(title="Blank blocked", blocked="  ")
+        
+        annotated = dict(Story.with_status().values_list('title', 'annotated_status'))
+        expected = {s.title: s.computed_status for s in Story.objects.all()}
+        self.assertEqual(annotated, expected)
+        self.assertEqual(annotated["Ready"], 'ready')
+        self.assertEqual(annotated["Blank goal"], 'idea')
+
+    def test_with_status_treats_whitespace_only_fields_as_blank(self):
+        """Test SQL status agrees with computed_status for tabs and newlines."""
+        for title, blocked, goal, workitems in [
+            ("CRLF work items", "", "Goal", "\r\n"),
+            ("Newline blocked", "\n", "Goal", "Work"),
+            ("Tab goal", "", "\t", "Work"),
+            ("Mixed goal", "", " \t\r\n\x0b\x0c ", "Work"),
+            ("Unicode whitespace", "", "\xa0", "\x1c"),
+        ]:
+            story = Story.objects.create(title=title, blocked=blocked, goal=goal, workitems=workitems)
+            StoryValueFactorScore.objects.filter(story=story).update(answer=self.vf_answer_5)
+            StoryCostFactorScore.objects.filter(story=story).update(answer=self.cf_answer_2)
+        
+        annotated = dict(Story.with_status().values_list('title', 'annotated_status'))
+        expected = {s.title: s.computed_status for s in Story.objects.all()}
+        self.assertEqual(annotated, expected)
+        self.assertEqual(set(annotated.values()), {'idea', 'ready'})
+        self.assertEqual(annotated["Newline blocked"], 'ready')
+        # Only ASCII whitespace counts as blank, on both sides
+        self.assertEqual(annotated["Unicode whitespace"], 'ready')
+
+
 class StoryHistoryTests(BaseTestCase):
     """Tests for StoryHistory model and tracking."""
 
@@ -362,6 +431,76 @@ class StoryViewTests(BaseTestCase):
         self.assertContains(response, "Done Story")
         self.assertNotContains(response, "Idea Story")
 
+    def test_stories_scores_complete_requires_answers(self):
+        """Test score completeness counts only answered score rows."""
+        scored = Story.objects.create(title="Scored", goal="g", workitems="w")
+        StoryValueFactorScore.objects.filter(story=scored).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=scored).update(answer=self.cf_answer_2)
+        Story.objects.create(title="Unscored", goal="g", workitems="w")
+        
+        response = self.client.get(reverse('backlog:stories'))
+        completeness = {
+            item['story'].title: (item['details_complete'], item['scores_complete'])
+            for item in response.context['stories']
+        }
+        self.assertEqual(completeness, {'Scored': (True, True), 'Unscored': (True, False)})
+
+    def test_stories_details_complete_ignores_blank_fields(self):
+        """Test details completeness treats whitespace-only fields as missing."""
+        Story.objects.create(title="Full", goal="g", workitems="w")
+        Story.objects.create(title="Blank goal", goal="   ", workitems="w")
+        Story.objects.create(title="No work items", goal="g")
+        Story.objects.create(title="Newline work items", goal="g", workitems="\r\n")
+        
+        response = self.client.get(reverse('backlog:stories'))
+        details = {item['story'].title: item['details_complete'] for item in response.context['stories']}
+        self.assertEqual(details, {
+            'Full': True, 'Blank goal': False, 'No work items': False, 'Newline work items': False,
+        })
+
+    def test_stories_scores_complete_matches_computed_status(self):
+        """Test the annotated completeness and status agree with the model properties."""
+        scored = Story.objects.create(title="Scored", goal="g", workitems="w")
+        StoryValueFactorScore.objects.filter(story=scored).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=scored).update(answer=self.cf_answer_2)
+        Story.objects.create(title="Partial", goal="g", workitems="w")
+        
+        response = self.client.get(reverse('backlog:stories'))
+        for item in response.context['stories']:
+            story = Story.objects.get(pk=item['story'].pk)
+            self.assertEqual(item['story'].annotated_status, story.computed_status)
+        self.assertContains(response, 'status-ready')
+        self.assertContains(response, 'status-idea')
+
+    def test_stories_sort_by_status(self):
+        """Test sorting stories by computed status in both directions."""
+        Story.objects.create(title="Idea Story")
+        Story.objects.create(title="Done Story", finished=timezone.now())
+        Story.objects.create(title="Blocked Story", blocked="waiting")
+        url = reverse('backlog:stories')
+        
+        response = self.client.get(url, {'sort': 'status'})
+        titles = [item['story'].title for item in response.context['stories']]
+        self.assertEqual(titles, ['Blocked Story', 'Done Story', 'Idea Story'])
+        
+        response = self.client.get(url, {'sort': 'status', 'order': 'desc', 'status': 'done'})
+        titles = [item['story'].title for item in response.context['stories']]
+        self.assertEqual(titles, ['Done Story'])
+
+    def test_stories_paginated(self):
+        """Test the story list shows one page of stories and keeps filters in page links."""
+        Story.objects.bulk_create([Story(title=f"Story {i:02d}") for i in range(55)])
+        url = reverse('backlog:stories')
+        
+        response = self.client.get(url, {'q': 'Story'})
+        self.assertEqual(len(response.context['stories']), 50)
+        self.assertContains(response, 'Page 1 of 2')
+        self.assertContains(response, '?q=Story&page=2')
+        
+        response = self.client.get(url, {'q': 'Story', 'page': '2'})
+        titles = [item['story'].title for item in response.context['stories']]
+        self.assertEqual(titles, [f"Story {i}" for i in range(50, 55)])
+
     def test_stories_filter_by_review_required(self):
         """Test filtering stories by review_required."""
         story_needs_review = Story.objects.create(
@@ -410,6 +549,16 @@ class StoryViewTests(BaseTestCase):
         self.assertEqual(response.status_code, 302)
         story.refresh_from_db()
         self.assertTrue(story.review_required)
+        
+        self.client.post(reverse('backlog:stories'), {'action': 'toggle_review', 'story_id': story.pk})
+        story.refresh_from_db()
+        self.assertFalse(story.review_required)
+
+    def test_stories_action_unknown_story(self):
+        """Test list actions on a missing story return 404."""
+        for action in ('archive_story', 'toggle_review', 'delete_story'):
+            response = self.client.post(reverse('backlog:stories'), {'action': action, 'story_id': 9999})
+            self.assertEqual(response.status_code, 404)
 
 
 class RefineStoryTests(BaseTestCase):
@@ -422,6 +571,79 @@ class RefineStoryTests(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Test Story")
 
+    def test_refine_page_shows_linked_story_status(self):
+        """Test dependencies and dependents show the linked story's computed status."""
+        story = Story.objects.create(title="Middle")
+        blocker = Story.objects.create(title="Blocker", finished=timezone.now())
+        waiting = Story.objects.create(title="Waiting", blocked="needs middle")
+        StoryDependency.objects.create(story=story, depends_on=blocker)
+        StoryDependency.objects.create(story=waiting, depends_on=story)
+        
+        response = self.client.get(reverse('backlog:story_detail', args=[story.pk]))
+        self.assertEqual([d.linked_status for d in response.context['dependencies']], ['done'])
+        self.assertEqual([d.linked_status for d in response.context['dependents']], ['blocked'])
+        self.assertContains(response, 'class="status-done"')
+
+    def test_refine_page_marks_story_labels(self):
+        """Test the label picker checks only the story's own labels."""
+        category = LabelCategory.objects.create(name="Area")
+        backend = Label.objects.create(category=category, name="Backend")
+        Label.objects.create(category=category, name="Frontend")
+        story = Story.objects.create(title="Test Story")
+        story.labels.add(backend)
+        other = Story.objects.create(title="Other Story")
+        other.labels.add(*Label.objects.all())
+        
+        response = self.client.get(reverse('backlog:story_detail', args=[story.pk]))
+        self.assertEqual(response.context['story_labels'], {backend.id})
+        self.assertContains(response, f'value="{backend.id}" checked')
+
+    def test_refine_page_factor_tree_refreshes(self):
+        """Test the cached factor tree picks up new answers and keeps per-story selection."""
+        story = Story.objects.create(title="Test Story")
+        StoryValueFactorScore.objects.filter(story=story).update(answer=self.vf_answer_5)
+        url = reverse('backlog:story_detail', args=[story.pk])
+        response = self.client.get(url)
+        self.assertNotContains(response, 'Huge impact')
+        
+        ValueFactorAnswer.objects.create(valuefactor=self.value_factor, score=20, description="Huge impact")
+        response = self.client.get(url)
+        self.assertContains(response, 'Huge impact')
+        entry = response.context['value_sections'][0]['valuefactors'][0]
+        self.assertEqual(entry['selected'], self.vf_answer_5.pk)
+        self.assertEqual([a.score for a in entry['answers'][1:]], [0, 5, 10, 20])
+        
+        other = Story.objects.create(title="Other Story")
+        response = self.client.get(reverse('backlog:story_detail', args=[other.pk]))
+        self.assertEqual(response.context['value_sections'][0]['valuefactors'][0]['selected'], '')
+
+    def test_refine_page_scoring_fragment_follows_selection(self):
+        """Test the cached scoring grid is keyed by the story's selected answers."""
+        story = Story.objects.create(title="Test Story")
+        url = reverse('backlog:story_detail', args=[story.pk])
+        checked = f'name="vf_{self.value_factor.pk}" value="{self.vf_answer_10.pk}" checked'
+        self.assertNotContains(self.client.get(url), checked)
+        
+        StoryValueFactorScore.objects.filter(story=story).update(answer=self.vf_answer_10)
+        self.assertContains(self.client.get(url), checked)
+        self.assertNotContains(self.client.get(reverse('backlog:story_create')), checked)
+
+    def test_refine_page_history_newest_first(self):
+        """Test the refine page lists history newest first without per-entry queries."""
+        story = Story.objects.create(title="Test Story")
+        url = reverse('backlog:story_detail', args=[story.pk])
+        StoryHistory.objects.create(story=story, field_name='First', new_value='1')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        for i in range(3):
+            StoryHistory.objects.create(story=story, field_name=f'Later {i}', new_value='2')
+        with CaptureQueriesContext(connection) as more:
+            response = self.client.get(url)
+        self.assertEqual(len(more.captured_queries), len(few.captured_queries))
+        fields = [entry.field_name for entry in response.context['history']]
+        self.assertEqual(fields, ['Later 2', 'Later 1', 'Later 0', 'First'])
+
     def test_refine_story_title_save(self):
         """Test saving story title - critical regression test (was broken before)."""
         story = Story.objects.create(title="Original Title")
@@ -531,6 +753,62 @@ class RefineStoryTests(BaseTestCase):
         self.assertTrue(history.filter(field_name='Title').exists())
         self.assertTrue(history.filter(field_name='Goal').exists())
 
+    def test_refine_story_unchanged_save_skips_update(self):
+        """Test an unchanged refine save writes nothing; a goal change refreshes status."""
+        story = Story.objects.create(title="Same", goal="", workitems="work")
+        url = reverse('backlog:story_detail', args=[story.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url, {'title': 'Same', 'goal': '', 'workitems': 'work', 'blocked': ''})
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "backlog_story"')])
+        
+        self.client.post(url, {'title': 'Same', 'goal': 'Goal', 'workitems': 'work', 'blocked': ''})
+        story.refresh_from_db()
+        self.assertEqual((story.goal, story.status), ('Goal', Story.STATUS_REFINED))
+
+    def test_refine_story_post_skips_form_data(self):
+        """Test a refine action POST does not load the form's scores or picker."""
+        story = Story.objects.create(title="Test Story")
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('backlog:story_detail', args=[story.pk]), {'action': 'toggle_review'})
+        sql = [q['sql'] for q in ctx.captured_queries]
+        self.assertFalse([q for q in sql if 'backlog_storyvaluefactorscore' in q])
+        self.assertFalse([q for q in sql if 'annotated_status' in q])
+
+    def test_refine_story_history_inserted_once(self):
+        """Test all history entries of a refine save are written in one insert."""
+        story = Story.objects.create(title="Old title")
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('backlog:story_detail', args=[story.pk]), {
+                'title': 'New title',
+                'goal': 'New goal',
+                'workitems': 'New work',
+                'blocked': 'waiting',
+                f'vf_{self.value_factor.pk}': str(self.vf_answer_10.pk),
+            })
+        inserts = [q for q in ctx.captured_queries
+                   if q['sql'].startswith('INSERT INTO "backlog_storyhistory"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            set(StoryHistory.objects.filter(story=story).values_list('field_name', flat=True)),
+            {'Title', 'Goal', 'Work items', 'Blocked', f'Value: {self.value_factor.name}'},
+        )
+
+    def test_refine_story_label_change_history(self):
+        """Test a label change records the old and new label names."""
+        category = LabelCategory.objects.create(name="Area")
+        old_label = Label.objects.create(category=category, name="Backend")
+        new_label = Label.objects.create(category=category, name="Frontend")
+        story = Story.objects.create(title="Test Story")
+        story.labels.add(old_label)
+        
+        self.client.post(reverse('backlog:story_detail', args=[story.pk]), {
+            'title': 'Test Story',
+            'blocked': '',
+            'labels': [new_label.pk, old_label.pk],
+        })
+        entry = StoryHistory.objects.get(story=story, field_name='Labels')
+        self.assertEqual((entry.old_value, entry.new_value), ('Backend', 'Backend, Frontend'))
+
     def test_refine_story_value_factor_score(self):
         """Test saving value factor scores."""
         story = Story.objects.create(title="Test Story")
@@ -547,6 +825,29 @@ class RefineStoryTests(BaseTestCase):
         score = StoryValueFactorScore.objects.get(story=story, valuefactor=self.value_factor)
         self.assertEqual(score.answer, self.vf_answer_10)
 
+    def test_refine_story_scores_factor_missing_from_id_cache(self):
+        """Test answers for a factor added by another worker are saved.
+        
+        The cached factor ID set may not include the factor yet, e.g. while
+        the transaction adding it is still being committed.
+        """
+        story = Story.objects.create(title="Test Story")
+        new_factor = ValueFactor.objects.create(section=self.value_section, name="Reach")
+        new_answer = ValueFactorAnswer.objects.create(valuefactor=new_factor, score=3, description="Some")
+        cache.set(VALUE_FACTOR_IDS_CACHE_KEY, frozenset({self.value_factor.id}), None)
+        
+        response = self.client.post(reverse('backlog:story_detail', args=[story.pk]), {
+            'title': 'Test Story',
+            'goal': '',
+            'workitems': '',
+            'blocked': '',
+            f'vf_{new_factor.pk}': str(new_answer.pk),
+            'vf_9999': str(new_answer.pk),
+        })
+        self.assertEqual(response.status_code, 302)
+        score = StoryValueFactorScore.objects.get(story=story, valuefactor=new_factor)
+        self.assertEqual(score.answer, new_answer)
+
     def test_refine_story_cost_factor_score(self):
         """Test saving cost factor scores."""
         story = Story.objects.create(title="Test Story")
@@ -563,6 +864,42 @@ class RefineStoryTests(BaseTestCase):
         score = StoryCostFactorScore.objects.get(story=story, costfactor=self.cost_factor)
         self.assertEqual(score.answer, self.cf_answer_5)
 
+    def test_refine_story_score_changes_tracked(self):
+        """Test score changes are saved and recorded, ignoring foreign answers."""
+        story = Story.objects.create(title="Test Story")
+        StoryCostFactorScore.objects.filter(story=story, costfactor=self.cost_factor).update(
+            answer=self.cf_answer_5
+        )
+        other_factor = ValueFactor.objects.create(section=self.value_section, name="Reach")
+        other_answer = ValueFactorAnswer.objects.create(valuefactor=other_factor, score=3)
+        
+        response = self.client.post(reverse('backlog:story_detail', args=[story.pk]), {
+            'title': 'Test Story',
+            'blocked': '',
+            # An answer of another factor is ignored
+            f'vf_{self.value_factor.pk}': str(other_answer.pk),
+            f'cf_{self.cost_factor.pk}': '',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIsNone(StoryValueFactorScore.objects.get(story=story, valuefactor=self.value_factor).answer)
+        self.assertIsNone(StoryCostFactorScore.objects.get(story=story).answer)
+        history = StoryHistory.objects.filter(story=story)
+        self.assertFalse(history.filter(field_name=f'Value: {self.value_factor.name}').exists())
+        entry = history.get(field_name=f'Cost: {self.cost_factor.name}')
+        self.assertEqual((entry.old_value, entry.new_value), ('5', 'Undefined'))
+        
+        self.client.post(reverse('backlog:story_detail', args=[story.pk]), {
+            'title': 'Test Story',
+            'blocked': '',
+            f'vf_{self.value_factor.pk}': str(self.vf_answer_10.pk),
+        })
+        self.assertEqual(
+            StoryValueFactorScore.objects.get(story=story, valuefactor=self.value_factor).answer,
+            self.vf_answer_10,
+        )
+        entry = history.get(field_name=f'Value: {self.value_factor.name}')
+        self.assertEqual((entry.old_value, entry.new_value), ('Undefined', '10'))
+
     def test_refine_story_add_dependency(self):
         """Test adding a dependency."""
         story1 = Story.objects.create(title="Story 1")
@@ -577,6 +914,44 @@ class RefineStoryTests(BaseTestCase):
             StoryDependency.objects.filter(story=story1, depends_on=story2).exists()
         )
 
+    def test_refine_story_add_dependency_history(self):
+        """Test adding a dependency records its title once and rejects unknown stories."""
+        story1 = Story.objects.create(title="Story 1")
+        story2 = Story.objects.create(title="Story 2")
+        url = reverse('backlog:story_detail', args=[story1.pk])
+        
+        for _ in range(2):
+            self.client.post(url, {'action': 'add_dependency', 'dependency_story_id': story2.pk})
+        history = StoryHistory.objects.filter(story=story1, field_name='Dependency added')
+        self.assertEqual(list(history.values_list('new_value', flat=True)), ['Story 2'])
+        
+        response = self.client.post(url, {'action': 'add_dependency', 'dependency_story_id': 'x'})
+        self.assertEqual(response.status_code, 404)
+        
+        self.client.post(url, {'action': 'add_dependency', 'dependency_story_id': story1.pk})
+        self.assertEqual(StoryDependency.objects.filter(story=story1).count(), 1)
+
+    def test_refine_missing_story_post_returns_404(self):
+        """Test saving a story that does not exist returns 404 and writes nothing."""
+        response = self.client.post(reverse('backlog:story_detail', args=[99999]), {'title': 'Ghost'})
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Story.objects.exists())
+        self.assertFalse(StoryHistory.objects.exists())
+
+    def test_refine_add_dependency_rejects_cycle(self):
+        """Test the refine page refuses a dependency on a story that depends on it."""
+        story1 = Story.objects.create(title="Story 1")
+        story2 = Story.objects.create(title="Story 2")
+        StoryDependency.objects.create(story=story2, depends_on=story1)
+        
+        response = self.client.post(
+            reverse('backlog:story_detail', args=[story1.pk]),
+            {'action': 'add_dependency', 'dependency_story_id': story2.pk},
+            follow=True,
+        )
+        self.assertContains(response, 'already depends on this story')
+        self.assertFalse(StoryDependency.objects.filter(story=story1).exists())
+
     def test_refine_story_remove_dependency(self):
         """Test removing a dependency."""
         story1 = Story.objects.create(title="Story 1")
@@ -591,6 +966,57 @@ class RefineStoryTests(BaseTestCase):
         self.assertFalse(
             StoryDependency.objects.filter(story=story1, depends_on=story2).exists()
         )
+        history = StoryHistory.objects.get(story=story1, field_name='Dependency removed')
+        self.assertEqual(history.old_value, 'Story 2')
+
+
+    def test_refine_page_dependency_status_without_per_story_queries(self):
+        """Test dependency statuses render without a query per linked story."""
+        story = Story.objects.create(title="Main")
+        others = []
+        for i in range(4):
+            other = Story.objects.create(title=f"Linked {i}", goal="g", workitems="w")
+            StoryValueFactorScore.objects.filter(story=other).update(answer=self.vf_answer_5)
+            StoryCostFactorScore.objects.filter(story=other).update(answer=self.cf_answer_2)
+            others.append(other)
+        url = reverse('backlog:story_detail', args=[story.pk])
+        StoryDependency.objects.create(story=story, depends_on=others[0])
+        StoryDependency.objects.create(story=others[1], depends_on=story)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        
+        StoryDependency.objects.create(story=story, depends_on=others[2])
+        StoryDependency.objects.create(story=others[3], depends_on=story)
+        with CaptureQueriesContext(connection) as more:
+            response = self.client.get(url)
+        self.assertEqual(len(more.captured_queries), len(few.captured_queries))
+        self.assertEqual(
+            [dep.depends_on.computed_status for dep in response.context['dependencies']],
+            ['ready', 'ready'],
+        )
+        self.assertEqual(
+            [dep.story.computed_status for dep in response.context['dependents']],
+            ['ready', 'ready'],
+        )
+
+    def test_refine_page_dependency_picker_status(self):
+        """Test the dependency picker lists other stories with status in one query."""
+        story = Story.objects.create(title="Main")
+        Story.objects.create(title="Blocked one", blocked="waiting")
+        url = reverse('backlog:story_detail', args=[story.pk])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        Story.objects.create(title="Idea one")
+        with CaptureQueriesContext(connection) as more:
+            response = self.client.get(url)
+        self.assertEqual(len(more.captured_queries), len(few.captured_queries))
+        self.assertEqual(
+            [(s['title'], s['annotated_status']) for s in response.context['other_stories']],
+            [('Blocked one', 'blocked'), ('Idea one', 'idea')],
+        )
+        self.assertContains(response, 'Idea one (idea)')
 
 
 class CreateStoryTests(BaseTestCase):
@@ -626,6 +1052,21 @@ class CreateStoryTests(BaseTestCase):
         history = StoryHistory.objects.filter(story=story, field_name='Story created')
         self.assertTrue(history.exists())
 
+    def test_create_story_with_scores(self):
+        """Test answers submitted on creation are saved; unknown factors are ignored."""
+        response = self.client.post(reverse('backlog:story_create'), {
+            'title': 'New Story',
+            'blocked': '',
+            f'vf_{self.value_factor.pk}': str(self.vf_answer_5.pk),
+            f'cf_{self.cost_factor.pk}': '',
+            'vf_9999': str(self.vf_answer_5.pk),
+        })
+        self.assertEqual(response.status_code, 302)
+        story = Story.objects.get(title='New Story')
+        score = StoryValueFactorScore.objects.get(story=story, valuefactor=self.value_factor)
+        self.assertEqual(score.answer, self.vf_answer_5)
+        self.assertFalse(StoryCostFactorScore.objects.filter(story=story).exists())
+
     def test_create_story_missing_title(self):
         """Test creating story without title re-renders form."""
         response = self.client.post(reverse('backlog:story_create'), {
@@ -671,6 +1112,21 @@ class KanbanViewTests(BaseTestCase):
         response = self.client.get(reverse('backlog:kanban'))
         self.assertContains(response, "Ready Story")
         self.assertContains(response, "Done Story")
+        backlog_cards = response.context['columns']['backlog']
+        self.assertEqual([c['story']['id'] for c in backlog_cards], [story_ready.id])
+        self.assertEqual(backlog_cards[0]['result'], 2.5)
+
+    def test_kanban_sort_by_finished(self):
+        """Test done column ordering when sorting by finished date."""
+        now = timezone.now()
+        older = Story.objects.create(title="Older", finished=now - timedelta(days=2))
+        newer = Story.objects.create(title="Newer", finished=now)
+        response = self.client.get(reverse('backlog:kanban'), {'sort': 'finished', 'order': 'desc'})
+        done_ids = [c['story']['id'] for c in response.context['columns']['done']]
+        self.assertEqual(done_ids, [newer.id, older.id])
+        response = self.client.get(reverse('backlog:kanban'), {'sort': 'finished', 'order': 'asc'})
+        done_ids = [c['story']['id'] for c in response.context['columns']['done']]
+        self.assertEqual(done_ids, [older.id, newer.id])
 
     def test_kanban_move_to_planned(self):
         """Test moving a story to planned column."""
@@ -746,6 +1202,20 @@ class KanbanViewTests(BaseTestCase):
         self.assertIsNotNone(story.finished)
         self.assertEqual(story.computed_status, 'done')
 
+    def test_kanban_move_records_history(self):
+        """Test a kanban move records status and date changes in history."""
+        story = Story.objects.create(title="Test Story")
+        
+        self.client.post(
+            reverse('backlog:kanban_move'),
+            data=json.dumps({'story_id': story.pk, 'target': 'done'}),
+            content_type='application/json'
+        )
+        fields = set(story.history.values_list('field_name', flat=True))
+        self.assertEqual(fields, {'Status (Kanban)', 'Finished'})
+        status_entry = story.history.get(field_name='Status (Kanban)')
+        self.assertEqual((status_entry.old_value, status_entry.new_value), ('IDEA', 'DONE'))
+
     def test_kanban_move_to_backlog(self):
         """Test moving a story back to backlog clears dates."""
         story = Story.objects.create(
@@ -842,6 +1312,28 @@ class ReportViewTests(BaseTestCase):
         self.assertContains(response, "Done Story")
         self.assertNotContains(response, "Idea Story")
 
+    def test_report_filter_ready_requires_all_scores(self):
+        """Test the ready filter keeps only fully scored stories with goal and workitems."""
+        ready = Story.objects.create(title="Ready Story", goal="Goal", workitems="Work")
+        StoryValueFactorScore.objects.filter(story=ready).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=ready).update(answer=self.cf_answer_2)
+        Story.objects.create(title="Unscored Story", goal="Goal", workitems="Work")
+        
+        response = self.client.get(reverse('backlog:report'), {'status': 'ready'})
+        self.assertEqual([row['story'].id for row in response.context['rows']], [ready.id])
+
+    def test_report_row_status(self):
+        """Test report rows carry each story's computed status."""
+        ready = Story.objects.create(title="Ready Story", goal="Goal", workitems="Work")
+        StoryValueFactorScore.objects.filter(story=ready).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=ready).update(answer=self.cf_answer_2)
+        idea = Story.objects.create(title="Unscored Story", goal="Goal", workitems="Work")
+        
+        response = self.client.get(reverse('backlog:report'))
+        statuses = {row['story'].id: row['status'] for row in response.context['rows']}
+        self.assertEqual(statuses, {ready.id: 'ready', idea.id: 'idea'})
+        self.assertEqual(statuses[ready.id], Story.objects.get(pk=ready.pk).computed_status)
+
     def test_report_excludes_archived(self):
         """Test report excludes archived stories."""
         story_active = Story.objects.create(title="Active Story")
@@ -896,6 +1388,91 @@ class ReportViewTests(BaseTestCase):
         # Check for tweak input fields
         self.assertIn('class="tweak-input"', content)
 
+    def test_report_section_tooltips(self):
+        """Test section tooltips list factor scores, or a placeholder when unscored."""
+        story = Story.objects.create(title="Test Story")
+        StoryValueFactorScore.objects.filter(story=story).update(answer=self.vf_answer_10)
+        
+        response = self.client.get(reverse('backlog:report'))
+        row = response.context['rows'][0]
+        self.assertEqual(
+            row['value_section_data'][0]['tooltip'],
+            "• Revenue Impact: 10 (High impact)\n  Impact on revenue\n\nAverage: 10 ÷ 1 = 10.0"
+        )
+        self.assertIsNone(row['cost_section_data'][0]['avg'])
+        self.assertEqual(
+            row['cost_section_data'][0]['tooltip'],
+            "• Engineering Hours: —\n\nNo scores set"
+        )
+
+    def test_report_totals_and_result(self):
+        """Test value/cost totals, their tooltips and the result for a scored story."""
+        story = Story.objects.create(title="Test Story")
+        StoryValueFactorScore.objects.filter(story=story).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=story).update(answer=self.cf_answer_2)
+        
+        response = self.client.get(reverse('backlog:report'))
+        row = response.context['rows'][0]
+        self.assertEqual((row['value_sum'], row['cost_sum'], row['result']), (5, 2, 2.5))
+        self.assertEqual(row['value_total_tooltip'], "Business Value: 5.0 = 5.0")
+        self.assertEqual(row['cost_total_tooltip'], "Development Cost: 2.0 = 2.0")
+        self.assertEqual(row['result_tooltip'], "Value (5.0) ÷ Cost (2.0) = 2.50")
+
+    def test_report_sections_refresh_after_section_and_factor_changes(self):
+        """Test cached report sections pick up new factors and renamed sections."""
+        Story.objects.create(title="Test Story")
+        response = self.client.get(reverse('backlog:report'))
+        self.assertEqual(len(response.context['rows'][0]['value_section_data'][0]['factors']), 1)
+        
+        ValueFactor.objects.create(section=self.value_section, name="Reach")
+        self.value_section.name = "Customer Value"
+        self.value_section.save()
+        response = self.client.get(reverse('backlog:report'))
+        self.assertEqual(len(response.context['rows'][0]['value_section_data'][0]['factors']), 2)
+        self.assertEqual(
+            [vs.name for vs in response.context['value_sections']], ["Customer Value"]
+        )
+
+    def test_report_page_is_cached_until_data_changes(self):
+        """Test the rendered report is reused until report data changes."""
+        story = Story.objects.create(title="Cached Story")
+        response = self.client.get(reverse('backlog:report'))
+        self.assertIsNotNone(response.context)
+        
+        # Same filters and data: served from the cache without rendering
+        response = self.client.get(reverse('backlog:report'))
+        self.assertIsNone(response.context)
+        self.assertContains(response, "Cached Story")
+        
+        story.title = "Renamed Story"
+        story.save()
+        response = self.client.get(reverse('backlog:report'))
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, "Renamed Story")
+
+    def test_report_cache_version_bumped_again_on_commit(self):
+        """Test the report version is bumped again once the transaction commits.
+        
+        Other workers still read the old data until the commit, so pages they
+        cache in between must be orphaned as well.
+        """
+        from .models import report_cache_version
+        with self.captureOnCommitCallbacks(execute=True):
+            Story.objects.create(title="Committed Story")
+            version_before_commit = report_cache_version()
+        self.assertNotEqual(report_cache_version(), version_before_commit)
+
+    def test_report_cache_invalidated_by_bulk_update(self):
+        """Test bulk actions using queryset update() still invalidate the report cache."""
+        story = Story.objects.create(title="Bulk Story")
+        self.client.get(reverse('backlog:report'))
+        self.client.post(reverse('backlog:stories_bulk_action'), {
+            'action': 'archive', 'story_ids': str(story.id),
+        })
+        self.client.get(reverse('backlog:report'))  # consumes the flash message
+        response = self.client.get(reverse('backlog:report'))
+        self.assertNotContains(response, "Bulk Story")
+
     def test_report_has_tweak_hint(self):
         """Test report page has tweak mode hint that explains the feature."""
         response = self.client.get(reverse('backlog:report'))
@@ -968,6 +1545,47 @@ class WBSViewTests(BaseTestCase):
         )
         self.assertEqual(response.status_code, 400)
 
+    def test_wbs_dependency_invalid_ids(self):
+        """Test dependency endpoints reject missing or non-numeric IDs with 400."""
+        story = Story.objects.create(title="Story")
+        for name in ('backlog:wbs_add_dependency', 'backlog:wbs_remove_dependency'):
+            for payload in ({'story_id': story.pk}, {'story_id': story.pk, 'depends_on_id': 'abc'}):
+                response = self.client.post(
+                    reverse(name), data=json.dumps(payload), content_type='application/json'
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_wbs_add_dependency_rejects_cycle(self):
+        """Test adding a dependency that closes a cycle is rejected."""
+        a = Story.objects.create(title="A")
+        b = Story.objects.create(title="B")
+        c = Story.objects.create(title="C")
+        StoryDependency.objects.create(story=a, depends_on=b)
+        StoryDependency.objects.create(story=b, depends_on=c)
+        
+        response = self.client.post(
+            reverse('backlog:wbs_add_dependency'),
+            data=json.dumps({'story_id': c.pk, 'depends_on_id': a.pk}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'This dependency would create a cycle')
+        self.assertFalse(StoryDependency.objects.filter(story=c).exists())
+        # An edge in the same direction as the chain is fine
+        self.assertFalse(StoryDependency.would_create_cycle(a.pk, c.pk))
+
+    def test_wbs_add_dependency_missing_story(self):
+        """Test adding a dependency on a missing story returns 404."""
+        story = Story.objects.create(title="Story")
+        
+        response = self.client.post(
+            reverse('backlog:wbs_add_dependency'),
+            data=json.dumps({'story_id': story.pk, 'depends_on_id': 99999}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(StoryDependency.objects.exists())
+
     def test_wbs_remove_dependency(self):
         """Test removing dependency via WBS AJAX."""
         story1 = Story.objects.create(title="Story 1")
@@ -989,6 +1607,84 @@ class WBSViewTests(BaseTestCase):
             StoryDependency.objects.filter(story=story1, depends_on=story2).exists()
         )
 
+    def test_wbs_remove_missing_dependency(self):
+        """Test removing a dependency that does not exist returns 404."""
+        story1 = Story.objects.create(title="Story 1")
+        story2 = Story.objects.create(title="Story 2")
+        
+        response = self.client.post(
+            reverse('backlog:wbs_remove_dependency'),
+            data=json.dumps({'story_id': story1.pk, 'depends_on_id': story2.pk}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_wbs_costs_and_status(self):
+        """Test WBS bars use the summed answered cost scaled to the largest cost."""
+        costly = Story.objects.create(title="Costly", goal="g", workitems="w")
+        StoryCostFactorScore.objects.filter(story=costly).update(answer=self.cf_answer_5)
+        StoryValueFactorScore.objects.filter(story=costly).update(answer=self.vf_answer_5)
+        cheap = Story.objects.create(title="Cheap")
+        StoryCostFactorScore.objects.filter(story=cheap).update(answer=self.cf_answer_2)
+        Story.objects.create(title="Unscored")
+        
+        response = self.client.get(reverse('backlog:wbs'))
+        stories = {s['title']: (s['cost'], s['cost_percent'], s['status']) for s in response.context['stories']}
+        self.assertEqual(stories, {
+            'Costly': (5, 100.0, 'ready'),
+            'Cheap': (2, 40.0, 'idea'),
+            'Unscored': (0, 0.0, 'idea'),
+        })
+        self.assertEqual(response.context['max_cost'], 5)
+
+    def test_wbs_dropdown_lists_active_stories(self):
+        """Test the dependency dropdowns list active stories only, ignoring the label filter."""
+        category = LabelCategory.objects.create(name="Area")
+        label = Label.objects.create(category=category, name="Backend")
+        labelled = Story.objects.create(title="Labelled")
+        labelled.labels.add(label)
+        Story.objects.create(title="Unlabelled")
+        Story.objects.create(title="Archived", archived=True)
+        
+        response = self.client.get(reverse('backlog:wbs'), {'labels': str(label.id)})
+        titles = [s['title'] for s in response.context['all_stories']]
+        self.assertEqual(titles, ['Labelled', 'Unlabelled'])
+
+    def test_wbs_dependency_edges(self):
+        """Test WBS lists dependency edges only for the shown stories."""
+        first = Story.objects.create(title="First")
+        second = Story.objects.create(title="Second")
+        archived = Story.objects.create(title="Old", archived=True)
+        StoryDependency.objects.create(story=second, depends_on=first)
+        StoryDependency.objects.create(story=archived, depends_on=first)
+        
+        response = self.client.get(reverse('backlog:wbs'))
+        self.assertEqual(response.context['dependencies'], [{'from_id': second.id, 'to_id': first.id}])
+
+    def test_wbs_data_cached_until_data_changes(self):
+        """Test WBS data is served from the cache and refreshed after story or dependency changes."""
+        first = Story.objects.create(title="First")
+        second = Story.objects.create(title="Second")
+        url = reverse('backlog:wbs')
+        self.client.get(url)
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertFalse(any('"backlog_storydependency"' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(response.context['dependencies'], [])
+        
+        self.client.post(
+            reverse('backlog:wbs_add_dependency'),
+            data=json.dumps({'story_id': second.pk, 'depends_on_id': first.pk}),
+            content_type='application/json'
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.context['dependencies'], [{'from_id': second.id, 'to_id': first.id}])
+        
+        Story.objects.create(title="Third")
+        response = self.client.get(url)
+        self.assertEqual([s['title'] for s in response.context['stories']], ['First', 'Second', 'Third'])
+
     def test_wbs_excludes_archived(self):
         """Test WBS excludes archived stories from the main view."""
         Story.objects.create(title="Active Story WBS")
@@ -1040,6 +1736,32 @@ class ScoreSignalTests(BaseTestCase):
         self.assertIsNotNone(cf_score)
         self.assertIsNone(cf_score.answer)  # Undefined, not scored yet
 
+    def test_factor_id_sets_refreshed_after_factor_change(self):
+        """Test the shared factor ID sets are dropped when a factor is added."""
+        self.assertEqual(Story._get_all_value_factor_ids(), {self.value_factor.id})
+        self.assertIsNotNone(cache.get(VALUE_FACTOR_IDS_CACHE_KEY))
+        new_factor = ValueFactor.objects.create(section=self.value_section, name="Reach")
+        self.assertIsNone(cache.get(VALUE_FACTOR_IDS_CACHE_KEY))
+        self.assertEqual(Story._get_all_value_factor_ids(), {self.value_factor.id, new_factor.id})
+
+    def test_scores_created_despite_stale_factor_id_cache(self):
+        """Test story creation ignores the cached factor ID sets.
+        
+        A cached set may still hold a factor whose deletion is being
+        committed; creating a story must not reference the stale ID.
+        """
+        cache.set(VALUE_FACTOR_IDS_CACHE_KEY, frozenset({self.value_factor.id, 999999}), None)
+        cache.set(COST_FACTOR_IDS_CACHE_KEY, frozenset({self.cost_factor.id, 999999}), None)
+        story = Story.objects.create(title="New Story")
+        self.assertEqual(
+            list(story.scores.values_list('valuefactor_id', flat=True)),
+            [self.value_factor.id],
+        )
+        self.assertEqual(
+            list(story.cost_scores.values_list('costfactor_id', flat=True)),
+            [self.cost_factor.id],
+        )
+
 
 class IntegrationTests(BaseTestCase):
     """Integration tests for complete workflows."""
@@ -1147,6 +1869,54 @@ class DashboardViewTests(BaseTestCase):
         self.assertIn('summary', response.context)
         self.assertIn('thresholds', response.context)
 
+    def test_dashboard_not_modified_with_matching_etag(self):
+        """Test that an unchanged dashboard answers 304 to If-None-Match."""
+        response = self.client.get(reverse('backlog:dashboard'))
+        etag = response['ETag']
+        response = self.client.get(reverse('backlog:dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_dashboard_etag_changes_with_data(self):
+        """Test that the ETag changes when dashboard data changes."""
+        etag = self.client.get(reverse('backlog:dashboard'))['ETag']
+        Story.objects.create(title="Fresh story")
+        response = self.client.get(reverse('backlog:dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_dashboard_not_modified_without_queries(self):
+        """Test a matching If-None-Match is answered from the cache alone."""
+        Story.objects.create(title="Story")
+        etag = self.client.get(reverse('backlog:dashboard'))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('backlog:dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_dashboard_etag_changes_with_label_membership(self):
+        """Test adding a label to a story changes the ETag."""
+        story = Story.objects.create(title="Story")
+        category = LabelCategory.objects.create(name="Area")
+        label = Label.objects.create(category=category, name="Backend")
+        etag = self.client.get(reverse('backlog:dashboard'))['ETag']
+        story.labels.add(label)
+        response = self.client.get(reverse('backlog:dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard_etag_changes_when_story_starts_rotting(self):
+        """Test the ETag changes once a story's age crosses a whole day, mid-day included."""
+        from unittest import mock
+        now = timezone.now()
+        Story.objects.create(title="Almost rotting", started=now - timedelta(days=14, minutes=-30))
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            etag = self.client.get(reverse('backlog:dashboard'))['ETag']
+            response = self.client.get(reverse('backlog:dashboard'), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+        
+        with mock.patch('django.utils.timezone.now', return_value=now + timedelta(hours=1)):
+            response = self.client.get(reverse('backlog:dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['story']['title'] for r in response.context['rotting_stories']], ["Almost rotting"])
+
     def test_dashboard_summary_counts(self):
         """Test that summary counts are correct."""
         response = self.client.get(reverse('backlog:dashboard'))
@@ -1179,7 +1949,7 @@ class DashboardViewTests(BaseTestCase):
         self.assertIsNone(story.cost_scores.first().answer)
         
         response = self.client.get(reverse('backlog:dashboard'))
-        needs_scoring = [item['story'].id for item in response.context['needs_scoring']]
+        needs_scoring = [item['story']['id'] for item in response.context['needs_scoring']]
         
         # Story SHOULD be in needs_scoring since answers are None (undefined)
         self.assertIn(story.id, needs_scoring)
@@ -1210,7 +1980,7 @@ class DashboardViewTests(BaseTestCase):
         )
         
         response = self.client.get(reverse('backlog:dashboard'))
-        needs_scoring = [item['story'].id for item in response.context['needs_scoring']]
+        needs_scoring = [item['story']['id'] for item in response.context['needs_scoring']]
         
         # Story should be in needs_scoring since it's missing the new factor
         self.assertIn(story.id, needs_scoring)
@@ -1223,7 +1993,7 @@ class DashboardViewTests(BaseTestCase):
         )
         
         response = self.client.get(reverse('backlog:dashboard'))
-        needs_refinement = [item['story'].id for item in response.context['needs_refinement']]
+        needs_refinement = [item['story']['id'] for item in response.context['needs_refinement']]
         
         self.assertIn(story.id, needs_refinement)
 
@@ -1239,7 +2009,7 @@ class DashboardViewTests(BaseTestCase):
         story.cost_scores.update(answer=self.cf_answer_2)
         
         response = self.client.get(reverse('backlog:dashboard'))
-        needs_refinement = [item['story'].id for item in response.context['needs_refinement']]
+        needs_refinement = [item['story']['id'] for item in response.context['needs_refinement']]
         
         self.assertNotIn(story.id, needs_refinement)
 
@@ -1257,7 +2027,7 @@ class DashboardViewTests(BaseTestCase):
         )
         
         response = self.client.get(reverse('backlog:dashboard'))
-        rotting = [item['story'].id for item in response.context['rotting_stories']]
+        rotting = [item['story']['id'] for item in response.context['rotting_stories']]
         
         self.assertIn(story.id, rotting)
 
@@ -1271,7 +2041,7 @@ class DashboardViewTests(BaseTestCase):
         )
         
         response = self.client.get(reverse('backlog:dashboard'))
-        rotting = [item['story'].id for item in response.context['rotting_stories']]
+        rotting = [item['story']['id'] for item in response.context['rotting_stories']]
         
         self.assertIn(story.id, rotting)
 
@@ -1285,7 +2055,7 @@ class DashboardViewTests(BaseTestCase):
         )
         
         response = self.client.get(reverse('backlog:dashboard'))
-        rotting = [item['story'].id for item in response.context['rotting_stories']]
+        rotting = [item['story']['id'] for item in response.context['rotting_stories']]
         
         self.assertIn(story.id, rotting)
 
@@ -1299,7 +2069,7 @@ class DashboardViewTests(BaseTestCase):
         )
         
         response = self.client.get(reverse('backlog:dashboard'))
-        review_required = [item['story'].id for item in response.context['review_required']]
+        review_required = [item['story']['id'] for item in response.context['review_required']]
         
         self.assertIn(story.id, review_required)
 
@@ -1315,13 +2085,13 @@ class DashboardViewTests(BaseTestCase):
         # Check all lists
         all_story_ids = set()
         for item in response.context['needs_scoring']:
-            all_story_ids.add(item['story'].id)
+            all_story_ids.add(item['story']['id'])
         for item in response.context['needs_refinement']:
-            all_story_ids.add(item['story'].id)
+            all_story_ids.add(item['story']['id'])
         for item in response.context['rotting_stories']:
-            all_story_ids.add(item['story'].id)
+            all_story_ids.add(item['story']['id'])
         for item in response.context['review_required']:
-            all_story_ids.add(item['story'].id)
+            all_story_ids.add(item['story']['id'])
         
         self.assertNotIn(story.id, all_story_ids)
 
@@ -1636,6 +2406,18 @@ class DashboardViewTests(BaseTestCase):
         self.assertEqual(statistics['archived_stories'], 1)
         self.assertGreaterEqual(statistics['active_stories'], 1)
 
+    def test_statistics_status_counts(self):
+        """Test that status counts match each story's computed_status."""
+        Story.objects.create(title="Idea Story")
+        Story.objects.create(title="Planned Story", planned=timezone.now())
+        ready = Story.objects.create(title="Ready Story", goal="Goal", workitems="Work")
+        StoryValueFactorScore.objects.filter(story=ready).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=ready).update(answer=self.cf_answer_2)
+
+        response = self.client.get(reverse('backlog:dashboard'))
+        status_counts = response.context['statistics']['status_counts']
+        self.assertEqual(status_counts, {'idea': 1, 'planned': 1, 'ready': 1})
+
     def test_review_required_shown_first(self):
         """Test that review required section appears before other sections in template."""
         response = self.client.get(reverse('backlog:dashboard'))
@@ -1744,6 +2526,14 @@ class LabelFilterTests(BaseTestCase):
         self.assertEqual(len(stories), 1)
         self.assertEqual(stories[0].title, "Full Stack Story")
 
+    def test_apply_label_filter_requires_all_labels(self):
+        """Test apply_label_filter keeps each story once and only with every label."""
+        from .views.helpers import apply_label_filter
+        qs = apply_label_filter(Story.objects.all(), [self.label1.id, self.label2.id])
+        self.assertEqual(list(qs), [self.story_both])
+        qs = apply_label_filter(Story.objects.all(), {self.label1.id, 999999})
+        self.assertFalse(qs.exists())
+
     def test_stories_list_label_filter_context(self):
         """Test that label filter context is passed to template."""
         response = self.client.get(reverse('backlog:stories'))
@@ -1788,6 +2578,17 @@ class LabelFilterTests(BaseTestCase):
         self.assertIn('label_categories', response.context)
         self.assertIn('selected_labels', response.context)
 
+    def test_kanban_cards_include_labels(self):
+        """Test kanban cards carry the story's labels in display order."""
+        self.story_both.finished = timezone.now()
+        self.story_both.save()
+        
+        response = self.client.get(reverse('backlog:kanban'))
+        card = response.context['columns']['done'][0]
+        self.assertEqual(card['story']['id'], self.story_both.id)
+        self.assertEqual(card['labels'], [self.label2, self.label1, self.label3])
+        self.assertContains(response, "High Priority")
+
     def test_wbs_view_label_filter(self):
         """Test label filtering on WBS view."""
         response = self.client.get(reverse('backlog:wbs'), {'labels': str(self.label1.id)})
@@ -1805,6 +2606,57 @@ class LabelFilterTests(BaseTestCase):
         stories = [s['story'] for s in response.context['stories']]
         self.assertEqual(len(stories), 4)
 
+    def test_labels_param_tolerates_whitespace(self):
+        """Test that stray whitespace around label IDs is ignored."""
+        labels_param = f" {self.label1.id} , {self.label3.id} "
+        response = self.client.get(reverse('backlog:stories'), {'labels': labels_param})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['selected_labels'], {self.label1.id, self.label3.id})
+
+    def test_labels_param_skips_malformed_ids(self):
+        """Test that malformed label IDs are skipped rather than split into digits."""
+        labels_param = f"{self.label1.id}a{self.label3.id},x,-{self.label2.id},{self.label3.id}"
+        response = self.client.get(reverse('backlog:stories'), {'labels': labels_param})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['selected_labels'], {self.label3.id})
+
+    def test_label_filter_context_queries(self):
+        """Test label categories load in two queries and are then served from the cache."""
+        from django.test import RequestFactory
+        from .views.helpers import get_label_filter_context
+        request = RequestFactory().get('/')
+        with self.assertNumQueries(2):
+            ctx = get_label_filter_context(request)
+        self.assertEqual(
+            [[label.name for label in c['labels']] for c in ctx['label_categories']],
+            [["Backend", "Frontend"], ["High Priority"]],
+        )
+        
+        # Later requests are served from the cache, selected labels included
+        request = RequestFactory().get('/', {'labels': f'{self.label3.id},{self.label1.id}'})
+        with self.assertNumQueries(0):
+            ctx = get_label_filter_context(request)
+            selected = [(label.category.name, label.name) for label in ctx['selected_labels_objects']]
+        self.assertEqual(selected, [("Feature Area", "Frontend"), ("Priority", "High Priority")])
+        
+        # Renaming a label drops the cached categories
+        self.label2.name = "Server"
+        self.label2.save()
+        ctx = get_label_filter_context(RequestFactory().get('/'))
+        self.assertEqual([label.name for label in ctx['label_categories'][0]['labels']], ["Frontend", "Server"])
+
+    def test_label_categories_dropped_again_on_commit(self):
+        """Test categories cached before a label change commits are dropped on commit."""
+        from django.test import RequestFactory
+        from .views.helpers import get_label_filter_context
+        with self.captureOnCommitCallbacks(execute=True):
+            self.label2.name = "Server"
+            self.label2.save()
+            # Another worker caches the old categories before the rename commits
+            cache.set(LABEL_CATEGORIES_CACHE_KEY, [], None)
+        ctx = get_label_filter_context(RequestFactory().get('/'))
+        self.assertEqual([label.name for label in ctx['label_categories'][0]['labels']], ["Frontend", "Server"])
+
     def test_labels_filter_preserves_other_params(self):
         """Test that label filter works with other query parameters."""
         # To have computed_status = 'ready', story needs all text fields and scores set
@@ -1831,6 +2683,31 @@ class LabelFilterTests(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         stories = [s['story'] for s in response.context['stories']]
 
+    def test_create_label(self):
+        """Test creating a label via AJAX rejects a case-insensitive duplicate."""
+        url = reverse('backlog:create_label')
+        response = self.client.post(url, data=json.dumps({
+            'category_id': self.category1.id, 'name': 'Mobile'
+        }), content_type='application/json')
+        self.assertTrue(response.json()['success'])
+        self.assertTrue(Label.objects.filter(category=self.category1, name='Mobile').exists())
+        
+        response = self.client.post(url, data=json.dumps({
+            'category_id': self.category1.id, 'name': 'FRONTEND'
+        }), content_type='application/json')
+        self.assertEqual(response.json(), {'success': False, 'error': 'Label already exists in this category'})
+        
+        # The same name is allowed in another category
+        response = self.client.post(url, data=json.dumps({
+            'category_id': self.category2.id, 'name': 'Frontend'
+        }), content_type='application/json')
+        self.assertTrue(response.json()['success'])
+
+    def test_create_label_requires_post(self):
+        """Test the create label endpoint rejects GET requests."""
+        response = self.client.get(reverse('backlog:create_label'))
+        self.assertEqual(response.status_code, 405)
+
 
 class BulkActionsTests(BaseTestCase):
     """Test cases for bulk actions on stories."""
@@ -1938,6 +2815,22 @@ class BulkActionsTests(BaseTestCase):
         self.assertEqual(self.story2.blocked, 'Waiting for API')
         self.assertEqual(self.story3.blocked, '')
 
+    def test_bulk_set_blocked_single_update(self):
+        """Test bulk blocking writes one UPDATE and skips stories already blocked for the reason."""
+        self.story2.blocked = 'Waiting for API'
+        self.story2.save()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('backlog:stories_bulk_action'), {
+                'action': 'set_blocked',
+                'story_ids': f'{self.story1.id},{self.story2.id}',
+                'blocked_reason': 'Waiting for API',
+            })
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "backlog_story"')]
+        self.assertEqual(len(updates), 1)
+        self.story1.refresh_from_db()
+        self.assertEqual(self.story1.blocked, 'Waiting for API')
+        self.assertEqual(StoryHistory.objects.filter(story=self.story2, field_name='Blocked').count(), 0)
+
     def test_bulk_add_labels(self):
         """Test bulk adding labels to stories."""
         response = self.client.post(reverse('backlog:stories_bulk_action'), {
@@ -1952,6 +2845,24 @@ class BulkActionsTests(BaseTestCase):
         self.assertTrue(self.story2.labels.filter(id=self.bulk_label.id).exists())
         self.assertFalse(self.story3.labels.filter(id=self.bulk_label.id).exists())
 
+    def test_bulk_history_inserted_once(self):
+        """Test bulk label and blocked actions record history with one insert each."""
+        ids = f'{self.story1.id},{self.story2.id}'
+        for data in (
+            {'action': 'add_labels', 'label_ids': str(self.bulk_label.id)},
+            {'action': 'set_blocked', 'blocked_reason': 'Waiting for API'},
+        ):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(reverse('backlog:stories_bulk_action'), {'story_ids': ids, **data})
+            inserts = [q for q in ctx.captured_queries
+                       if q['sql'].startswith('INSERT INTO "backlog_storyhistory"')]
+            self.assertEqual(len(inserts), 1)
+        history = StoryHistory.objects.filter(story=self.story1).order_by('field_name')
+        self.assertEqual(
+            list(history.values_list('field_name', 'old_value', 'new_value')),
+            [('Blocked', '(not blocked)', 'Waiting for API'), ('Labels', '(added)', 'Bulk Label')],
+        )
+
     def test_bulk_delete_stories(self):
         """Test bulk deleting stories."""
         story1_id = self.story1.id
@@ -1978,4 +2889,279 @@ class BulkActionsTests(BaseTestCase):
         self.assertEqual(response.status_code, 302)
         # Stories should remain unchanged
         self.story1.refresh_from_db()
-        self.assertFalse(self.story1.archived)
\ No newline at end of file
+        self.assertFalse(self.story1.archived)
+
+    def test_bulk_action_skips_malformed_ids(self):
+        """Test story IDs with whitespace are parsed and non-numeric entries skipped."""
+        response = self.client.post(reverse('backlog:stories_bulk_action'), {
+            'action': 'archive',
+            'story_ids': f' {self.story1.id}, abc,,{self.story2.id} ',
+        }, follow=True)
+        self.assertContains(response, 'Archived 2 stories.')
+        self.story3.refresh_from_db()
+        self.assertFalse(self.story3.archived)
+
+    def test_bulk_action_counts_only_existing_stories(self):
+        """Test bulk messages count the stories actually changed, ignoring unknown IDs."""
+        url = reverse('backlog:stories_bulk_action')
+        response = self.client.post(url, {
+            'action': 'archive',
+            'story_ids': f'{self.story1.id},{self.story2.id},99999',
+        }, follow=True)
+        self.assertContains(response, 'Archived 2 stories.')
+        
+        response = self.client.post(url, {'action': 'delete', 'story_ids': '99999'}, follow=True)
+        self.assertContains(response, 'No valid stories found.')
+        self.assertEqual(Story.objects.count(), 3)
+
+
+class HelperTests(BaseTestCase):
+    """Tests for shared view helper functions."""
+
+    def test_build_factor_tooltip(self):
+        """Test tooltip lists each factor and the average line."""
+        from .views.helpers import build_factor_tooltip
+        factors_detail = [
+            {'name': 'Revenue', 'description': 'Impact on revenue', 'score': 5, 'answer_description': 'Medium'},
+            {'name': 'Reach', 'description': '', 'score': 3, 'answer_description': None},
+            {'name': 'Risk', 'description': '', 'score': None, 'answer_description': None},
+        ]
+        tooltip = build_factor_tooltip(factors_detail, 8, 2, 4.0)
+        self.assertEqual(
+            tooltip,
+            "• Revenue: 5 (Medium)\n  Impact on revenue\n"
+            "• Reach: 3\n"
+            "• Risk: —\n"
+            "\nAverage: 8 ÷ 2 = 4.0"
+        )
+
+    def test_build_factor_section_data_uses_prefetched_factors(self):
+        """Test section data is built without queries when factors are prefetched."""
+        from django.db.models import Prefetch
+        from .views.helpers import build_factor_section_data
+        sections = list(ValueFactorSection.objects.prefetch_related(
+            Prefetch('valuefactors', to_attr='_factors')
+        ))
+        answers_map = {self.value_factor.id: (5, 'Medium impact')}
+        with self.assertNumQueries(0):
+            section_data = build_factor_section_data(sections, 'valuefactors', answers_map, with_tooltips=True)
+        self.assertEqual(len(section_data), 1)
+        self.assertEqual(section_data[0]['avg'], 5)
+        self.assertIn('Revenue Impact: 5 (Medium impact)', section_data[0]['tooltip'])
+
+
+class RelativeRankingTests(BaseTestCase):
+    """Tests for the relative ranking page and its save endpoint."""
+
+    def setUp(self):
+        super().setUp()
+        self.story1 = Story.objects.create(title="First")
+        self.story2 = Story.objects.create(title="Second")
+
+    def test_missing_score_rows_are_created(self):
+        """Test that stories without a score row get one when the factor is opened."""
+        StoryValueFactorScore.objects.filter(story=self.story2).delete()
+        response = self.client.get(reverse('backlog:relative'), {
+            'type': 'value', 'factor': self.value_factor.id,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(StoryValueFactorScore.objects.filter(
+            story=self.story2, valuefactor=self.value_factor, answer=None, relative_rank=None
+        ).exists())
+        stories_data = json.loads(response.context['stories_data'])
+        self.assertEqual({s['id'] for s in stories_data['undefined']}, {self.story1.id, self.story2.id})
+
+    def test_save_rankings(self):
+        """Test that saving rankings updates relative_rank for each story."""
+        response = self.client.post(
+            reverse('backlog:relative_save'),
+            data=json.dumps({
+                'factor_type': 'value',
+                'factor_id': self.value_factor.id,
+                'rankings': [
+                    {'story_id': self.story1.id, 'rank': 2},
+                    {'story_id': self.story2.id, 'rank': 1},
+                ],
+            }),
+            content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'success': True})
+        ranks = dict(StoryValueFactorScore.objects.filter(
+            valuefactor=self.value_factor
+        ).values_list('story_id', 'relative_rank'))
+        self.assertEqual(ranks, {self.story1.id: 2, self.story2.id: 1})
+
+    def test_save_rankings_unknown_factor(self):
+        """Test that an unknown factor returns an error response."""
+        response = self.client.post(
+            reverse('backlog:relative_save'),
+            data=json.dumps({'factor_type': 'cost', 'factor_id': 99999, 'rankings': []}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_answer_boundaries_refresh_after_answer_change(self):
+        """Test cached answer boundaries are invalidated when answers change."""
+        params = {'type': 'value', 'factor': self.value_factor.id}
+        response = self.client.get(reverse('backlog:relative'), params)
+        scores = [a['score'] for a in json.loads(response.context['answer_boundaries'])]
+        self.assertEqual(scores, [10, 5, 0])
+        
+        ValueFactorAnswer.objects.create(valuefactor=self.value_factor, score=8, description="High-ish")
+        response = self.client.get(reverse('backlog:relative'), params)
+        scores = [a['score'] for a in json.loads(response.context['answer_boundaries'])]
+        self.assertEqual(scores, [10, 8, 5, 0])
+
+
+class RelativeReportTests(BaseTestCase):
+    """Tests for the hybrid (absolute + relative) report."""
+
+    def test_relative_report_loads(self):
+        """Test that the relative report page loads."""
+        Story.objects.create(title="Story", goal="Goal", workitems="Work")
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['rows']), 1)
+
+    def test_factor_score_ranges(self):
+        """Test min/max answer scores per factor, with a default for factors without answers."""
+        from .views.relative_report import _get_factor_score_ranges
+        empty = ValueFactor.objects.create(section=self.value_section, name="No answers")
+        value_ranges, cost_ranges = _get_factor_score_ranges()
+        self.assertEqual(value_ranges[self.value_factor.id], {'min': 0, 'max': 10})
+        self.assertEqual(value_ranges[empty.id], {'min': 1, 'max': 5})
+        self.assertEqual(cost_ranges[self.cost_factor.id], {'min': 0, 'max': 5})
+
+    def test_factor_score_ranges_refresh_after_answer_change(self):
+        """Test cached score ranges are invalidated when answers change."""
+        from .views.relative_report import _get_factor_score_ranges
+        value_ranges, _ = _get_factor_score_ranges()
+        self.assertEqual(value_ranges[self.value_factor.id], {'min': 0, 'max': 10})
+        ValueFactorAnswer.objects.create(valuefactor=self.value_factor, score=20, description="Huge")
+        with self.assertNumQueries(2):
+            value_ranges, _ = _get_factor_score_ranges()
+        self.assertEqual(value_ranges[self.value_factor.id], {'min': 0, 'max': 20})
+        with self.assertNumQueries(0):
+            _get_factor_score_ranges()
+
+    def test_relative_report_row_status_without_per_story_queries(self):
+        """Test row statuses come from the grouped score rows, not per-story queries."""
+        ready = Story.objects.create(title="Ready", goal="Goal", workitems="Work")
+        StoryValueFactorScore.objects.filter(story=ready).update(answer=self.vf_answer_5)
+        StoryCostFactorScore.objects.filter(story=ready).update(answer=self.cf_answer_2)
+        Story.objects.create(title="Idea", goal="Goal", workitems="Work")
+        self.client.get(reverse('backlog:relative_report'))  # warm the factor caches
+        bump_report_cache_version()  # render the page again instead of serving it cached
+        with CaptureQueriesContext(connection) as two_stories:
+            response = self.client.get(reverse('backlog:relative_report'))
+        statuses = {row['story'].title: row['status'] for row in response.context['rows']}
+        self.assertEqual(statuses, {'Ready': 'ready', 'Idea': 'idea'})
+        
+        for i in range(3):
+            Story.objects.create(title=f"Extra {i}")
+        with CaptureQueriesContext(connection) as five_stories:
+            self.client.get(reverse('backlog:relative_report'))
+        self.assertEqual(len(five_stories), len(two_stories))
+
+    def test_relative_report_page_rerenders_after_reranking(self):
+        """Test re-ranking stories, which sends no signals, invalidates the cached page."""
+        self.value_factor.scoring_mode = ValueFactor.SCORING_RELATIVE
+        self.value_factor.save()
+        first = Story.objects.create(title="A first")
+        second = Story.objects.create(title="B second")
+        self.client.get(reverse('backlog:relative_report'))
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertIsNone(response.context)  # served from the cache
+        
+        self.client.post(
+            reverse('backlog:relative_save'),
+            json.dumps({
+                'factor_type': 'value',
+                'factor_id': self.value_factor.id,
+                'rankings': [{'story_id': second.id, 'rank': 1}, {'story_id': first.id, 'rank': 2}],
+            }),
+            content_type='application/json',
+        )
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertIsNotNone(response.context)
+
+    def test_relative_report_cached_page_rerenders_after_change(self):
+        """Test the cached report page is re-rendered once report data changes."""
+        story = Story.objects.create(title="Original title")
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertContains(response, "Original title")
+        story.title = "Renamed title"
+        story.save()
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertContains(response, "Renamed title")
+        self.assertNotContains(response, "Original title")
+
+    def test_factor_caches_dropped_again_on_commit(self):
+        """Test factor data cached before a factor change commits is dropped on commit."""
+        from .models import FACTOR_RANGES_CACHE_KEY, REFINE_FACTOR_TREE_CACHE_KEY, REPORT_SECTIONS_CACHE_KEY
+        keys = [
+            FACTOR_RANGES_CACHE_KEY, REPORT_SECTIONS_CACHE_KEY, REFINE_FACTOR_TREE_CACHE_KEY,
+            VALUE_FACTOR_IDS_CACHE_KEY, COST_FACTOR_IDS_CACHE_KEY,
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.value_factor.name = "Reach"
+            self.value_factor.save()
+            # Another worker caches the old data before the change commits
+            cache.set_many(dict.fromkeys(keys, 'stale'), None)
+        self.assertEqual(cache.get_many(keys), {})
+
+    def test_absolute_only_report_skips_score_ranges(self):
+        """Test score ranges are only loaded when some factor is relative."""
+        from .models import FACTOR_RANGES_CACHE_KEY
+        Story.objects.create(title="Story")
+        cache.delete(FACTOR_RANGES_CACHE_KEY)
+        self.client.get(reverse('backlog:relative_report'))
+        self.assertIsNone(cache.get(FACTOR_RANGES_CACHE_KEY))
+        self.value_factor.scoring_mode = ValueFactor.SCORING_RELATIVE
+        self.value_factor.save()
+        self.client.get(reverse('backlog:relative_report'))
+        self.assertIsNotNone(cache.get(FACTOR_RANGES_CACHE_KEY))
+
+    def test_relative_report_flags_relative_factors(self):
+        """Test has_any_relative reflects whether any factor uses relative scoring."""
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertFalse(response.context['has_any_relative'])
+        self.cost_factor.scoring_mode = CostFactor.SCORING_RELATIVE
+        self.cost_factor.save()
+        response = self.client.get(reverse('backlog:relative_report'))
+        self.assertTrue(response.context['has_any_relative'])
+
+    def test_relative_report_status_filter(self):
+        """Test that the status filter keeps only stories with that status."""
+        Story.objects.create(title="Idea story")
+        done = Story.objects.create(title="Done story", finished=timezone.now())
+        response = self.client.get(reverse('backlog:relative_report'), {'status': 'done'})
+        self.assertEqual([row['story'].id for row in response.context['rows']], [done.id])
+
+    def test_relative_factor_scores_are_normalized(self):
+        """Test relative ranks map linearly onto the factor's answer scale."""
+        self.value_factor.scoring_mode = ValueFactor.SCORING_RELATIVE
+        self.value_factor.save()
+        first = Story.objects.create(title="A first")
+        second = Story.objects.create(title="B second")
+        StoryValueFactorScore.objects.filter(story=first).update(relative_rank=1)
+        StoryValueFactorScore.objects.filter(story=second).update(relative_rank=2)
+        
+        response = self.client.get(reverse('backlog:relative_report'))
+        avgs = {row['story'].id: row['value_section_data'][0]['avg'] for row in response.context['rows']}
+        self.assertEqual(avgs, {first.id: 10, second.id: 0})
+        tooltip = response.context['rows'][0]['value_section_data'][0]['tooltip']
+        self.assertIn("Revenue Impact: #1/2 → 10.0 [relative]", tooltip)
+
+    def test_relative_cost_factor_rank_one_gets_lowest_score(self):
+        """Test relative cost ranks map rank 1 onto the lowest (best) cost."""
+        self.cost_factor.scoring_mode = CostFactor.SCORING_RELATIVE
+        self.cost_factor.save()
+        stories = [Story.objects.create(title=f"Story {i}") for i in range(3)]
+        for rank, story in enumerate(stories, start=1):
+            StoryCostFactorScore.objects.filter(story=story).update(relative_rank=rank)
+        
+        response = self.client.get(reverse('backlog:relative_report'))
+        avgs = {row['story'].id: row['cost_section_data'][0]['avg'] for row in response.context['rows']}
+        self.assertEqual(avgs, {stories[0].id: 0, stories[1].id: 2.5, stories[2].id: 5})
@@ -8,10 +8,16 @@ Shows stories that need attention:
 - Review Required: Stories flagged for review
 - Housekeeping: Data integrity issues (orphaned scores, etc.)
 """
+import uuid
+from datetime import timedelta
+
 from django.contrib import messages
+from django.core.cache import cache
 from django.db.models import Count
 from django.shortcuts import redirect, render
 from django.utils import timezone
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
 
 from ..models import (
     CostFactor,
@@ -22,9 +28,87 @@ from ..models import (
     StoryHistory,
     StoryValueFactorScore,
     ValueFactor,
+    bump_report_cache_version,
+    report_cache_version,
+)
+from .helpers import compute_status_from_row
+
+# Story columns needed for the attention checks and dashboard tables
+_STORY_ROW_FIELDS = (
+    'id', 'title', 'goal', 'workitems', 'blocked', 'planned', 'started',
+    'finished', 'review_required', 'created_at', 'updated_at',
 )
 
+# The rotting checks count whole days of a story's age
+_DAY = timedelta(days=1)
+
+# How long finished stories stay in the recently completed list
+_RECENTLY_COMPLETED_AGE = timedelta(days=30)
+
+# Seconds a stored dashboard ETag stays valid (a data version bump orphans it sooner)
+_DASHBOARD_ETAG_TIMEOUT = 3600
+
+
+def _dashboard_etag_key(version):
+    """Cache key of the dashboard's ETag for a data version (see report_cache_version)."""
+    return f"dashboard_etag:{version}"
+
 
+def _dashboard_etag(request):
+    """Return the ETag of the dashboard last rendered for the current data version.
+    
+    The dashboard shows data covered by the report data version (stories,
+    scores, factors, labels and dependencies) plus day counts that change
+    with time alone. Each render stores its ETag with the next moment one of
+    those day counts ticks over; until then, and while the version is
+    unchanged, a matching If-None-Match lets the view answer 304 from a
+    single cache lookup.
+    
+    Returns None for non-GET requests, when flash messages are pending (so
+    cleanup actions and their confirmation messages are never skipped), and
+    when no current ETag is stored.
+    """
+    if request.method != 'GET' or len(messages.get_messages(request)):
+        return None
+    entry = cache.get(_dashboard_etag_key(report_cache_version()))
+    if entry is None:
+        return None
+    etag, next_tick = entry
+    if next_tick is not None and timezone.now() >= next_tick:
+        return None
+    return etag
+
+
+def _next_day_tick(now, stories):
+    """Return the next moment after `now` at which a dashboard day count changes.
+    
+    The rotting checks count whole days since a story was started, planned or
+    last updated, so each of those timestamps ticks over once every 24 hours,
+    not at midnight. Finished stories leave the recently completed list 30
+    days after they finished.
+    
+    Args:
+        now: The time the dashboard is rendered at
+        stories: Non-archived story rows with started, planned, updated_at and finished
+        
+    Returns:
+        The earliest such moment, or None if no story has a timestamp
+    """
+    ticks = [
+        now + (_DAY - (now - timestamp) % _DAY)
+        for story in stories
+        for timestamp in (story['started'], story['planned'], story['updated_at'])
+        if timestamp
+    ]
+    ticks.extend(
+        story['finished'] + _RECENTLY_COMPLETED_AGE
+        for story in stories
+        if story['finished'] and story['finished'] + _RECENTLY_COMPLETED_AGE > now
+    )
+    return min(ticks, default=None)
+
+
+@condition(etag_func=_dashboard_etag)
 def dashboard(request):
     """Dashboard showing stories that need attention.
     
@@ -82,6 +166,7 @@ def dashboard(request):
             deleted_count = StoryHistory.objects.exclude(
                 story_id__in=Story.objects.values_list('id', flat=True)
             ).delete()[0]
+            bump_report_cache_version()  # no signal handler watches StoryHistory
             messages.success(request, f'🧹 Cleaned up {deleted_count} orphaned history entries.')
             return redirect('backlog:dashboard')
         
@@ -103,14 +188,29 @@ def dashboard(request):
             messages.success(request, f'🧹 Cleaned up {deleted_count} scores for deleted cost factors.')
             return redirect('backlog:dashboard')
     
-    # Get all non-archived stories
-    stories = Story.objects.filter(archived=False).prefetch_related(
-        'scores', 'cost_scores'
-    )
+    # Read before loading any data, so a change made while rendering leaves
+    # the stored ETag under an already outdated version
+    version = report_cache_version()
+    
+    # Get all non-archived stories as plain dict rows (no model hydration);
+    # 'computed_status' is filled in below so templates can read it as before
+    stories = list(Story.objects.filter(archived=False).values(*_STORY_ROW_FIELDS))
     
-    # Get all factors to check completeness
-    all_value_factors = set(ValueFactor.objects.values_list('id', flat=True))
-    all_cost_factors = set(CostFactor.objects.values_list('id', flat=True))
+    # Get all factors to check completeness (cached, invalidated by signals)
+    all_value_factors = Story._get_all_value_factor_ids()
+    all_cost_factors = Story._get_all_cost_factor_ids()
+    
+    # Factor IDs with a defined answer, per story
+    scored_value_ids = {}
+    for story_id, factor_id in StoryValueFactorScore.objects.filter(
+        story__archived=False, answer__isnull=False
+    ).values_list('story_id', 'valuefactor_id'):
+        scored_value_ids.setdefault(story_id, set()).add(factor_id)
+    scored_cost_ids = {}
+    for story_id, factor_id in StoryCostFactorScore.objects.filter(
+        story__archived=False, answer__isnull=False
+    ).values_list('story_id', 'costfactor_id'):
+        scored_cost_ids.setdefault(story_id, set()).add(factor_id)
     
     # Rotting thresholds (configurable)
     STARTED_ROTTING_DAYS = 14  # Started but not done for 14+ days
@@ -123,17 +223,15 @@ def dashboard(request):
     needs_refinement = []
     rotting_stories = []
     review_required = []
+    # IDs of stories appearing in any attention category (for the healthy count)
+    attention_ids = set()
+    # Story counts by computed status (non-archived)
+    status_counts = {}
     
     for story in stories:
         # Check if needs scoring - either missing factor records OR answer=None (undefined)
-        story_vf_ids = set(
-            score.valuefactor_id for score in story.scores.all() 
-            if score.answer is not None
-        )
-        story_cf_ids = set(
-            score.costfactor_id for score in story.cost_scores.all()
-            if score.answer is not None
-        )
+        story_vf_ids = scored_value_ids.get(story['id'], set())
+        story_cf_ids = scored_cost_ids.get(story['id'], set())
         
         missing_value = all_value_factors - story_vf_ids
         missing_cost = all_cost_factors - story_cf_ids
@@ -144,50 +242,59 @@ def dashboard(request):
                 'missing_value_count': len(missing_value),
                 'missing_cost_count': len(missing_cost),
             })
+            attention_ids.add(story['id'])
+        
+        computed = compute_status_from_row(story, not (missing_value or missing_cost))
+        story['computed_status'] = computed
+        status_counts[computed] = status_counts.get(computed, 0) + 1
         
         # Check if needs refinement (idea status = missing goal/workitems)
-        computed = story.computed_status
         if computed == 'idea':
             missing = []
-            if not story.goal or not story.goal.strip():
+            if not Story.has_text(story['goal']):
                 missing.append('goal')
-            if not story.workitems or not story.workitems.strip():
+            if not Story.has_text(story['workitems']):
                 missing.append('workitems')
             needs_refinement.append({
                 'story': story,
                 'missing': missing,
             })
+            attention_ids.add(story['id'])
         
         # Check for rotting stories
-        if computed == 'started' and story.started:
-            days_since_started = (now - story.started).days
+        if computed == 'started' and story['started']:
+            days_since_started = (now - story['started']).days
             if days_since_started >= STARTED_ROTTING_DAYS:
                 rotting_stories.append({
                     'story': story,
                     'reason': 'started',
                     'days': days_since_started,
                 })
-        elif computed == 'planned' and story.planned:
-            days_since_planned = (now - story.planned).days
+                attention_ids.add(story['id'])
+        elif computed == 'planned' and story['planned']:
+            days_since_planned = (now - story['planned']).days
             if days_since_planned >= PLANNED_ROTTING_DAYS:
                 rotting_stories.append({
                     'story': story,
                     'reason': 'planned',
                     'days': days_since_planned,
                 })
-        elif computed == 'blocked' and story.updated_at:
-            days_blocked = (now - story.updated_at).days
+                attention_ids.add(story['id'])
+        elif computed == 'blocked' and story['updated_at']:
+            days_blocked = (now - story['updated_at']).days
             if days_blocked >= BLOCKED_ROTTING_DAYS:
                 rotting_stories.append({
                     'story': story,
                     'reason': 'blocked',
                     'days': days_blocked,
-                    'blocked_reason': story.blocked,
+                    'blocked_reason': story['blocked'],
                 })
+                attention_ids.add(story['id'])
         
         # Check if review required
-        if story.review_required:
+        if story['review_required']:
             review_required.append({'story': story})
+            attention_ids.add(story['id'])
     
     # Sort rotting stories by days (most stale first)
     rotting_stories.sort(key=lambda x: x['days'], reverse=True)
@@ -200,12 +307,15 @@ def dashboard(request):
         'total_issues': 0,
     }
     
-    # Reuse all_value_factors and all_cost_factors loaded earlier for story scoring
+    # Reuse all_value_factors and all_cost_factors loaded earlier for story scoring.
+    # Each metric is probed with exists() first so a clean database only pays
+    # for cheap LIMIT 1 lookups instead of full COUNT scans.
     # Get all story IDs (including archived) for orphan detection
     all_story_ids = set(Story.objects.values_list('id', flat=True))
     
     # 1. Orphaned value factor scores (scores for deleted stories)
-    orphan_value_scores = StoryValueFactorScore.objects.exclude(story_id__in=all_story_ids).count()
+    orphan_value_qs = StoryValueFactorScore.objects.exclude(story_id__in=all_story_ids)
+    orphan_value_scores = orphan_value_qs.count() if orphan_value_qs.exists() else 0
     if orphan_value_scores > 0:
         housekeeping['issues'].append({
             'type': 'orphan_value_scores',
@@ -219,7 +329,8 @@ def dashboard(request):
         })
     
     # 2. Orphaned cost factor scores (scores for deleted stories)
-    orphan_cost_scores = StoryCostFactorScore.objects.exclude(story_id__in=all_story_ids).count()
+    orphan_cost_qs = StoryCostFactorScore.objects.exclude(story_id__in=all_story_ids)
+    orphan_cost_scores = orphan_cost_qs.count() if orphan_cost_qs.exists() else 0
     if orphan_cost_scores > 0:
         housekeeping['issues'].append({
             'type': 'orphan_cost_scores',
@@ -233,8 +344,10 @@ def dashboard(request):
         })
     
     # 3. Orphaned dependencies (dependencies referencing deleted stories)
-    orphan_deps_from = StoryDependency.objects.exclude(story_id__in=all_story_ids).count()
-    orphan_deps_to = StoryDependency.objects.exclude(depends_on_id__in=all_story_ids).count()
+    orphan_deps_from_qs = StoryDependency.objects.exclude(story_id__in=all_story_ids)
+    orphan_deps_to_qs = StoryDependency.objects.exclude(depends_on_id__in=all_story_ids)
+    orphan_deps_from = orphan_deps_from_qs.count() if orphan_deps_from_qs.exists() else 0
+    orphan_deps_to = orphan_deps_to_qs.count() if orphan_deps_to_qs.exists() else 0
     orphan_deps_total = orphan_deps_from + orphan_deps_to
     if orphan_deps_total > 0:
         housekeeping['issues'].append({
@@ -249,7 +362,8 @@ def dashboard(request):
         })
     
     # 5. Orphaned history entries (history for deleted stories)
-    orphan_history = StoryHistory.objects.exclude(story_id__in=all_story_ids).count()
+    orphan_history_qs = StoryHistory.objects.exclude(story_id__in=all_story_ids)
+    orphan_history = orphan_history_qs.count() if orphan_history_qs.exists() else 0
     if orphan_history > 0:
         housekeeping['issues'].append({
             'type': 'orphan_history',
@@ -263,7 +377,8 @@ def dashboard(request):
         })
     
     # 6. Stale value scores (scores for deleted factors) - reuse all_value_factors
-    stale_value_scores = StoryValueFactorScore.objects.exclude(valuefactor_id__in=all_value_factors).count()
+    stale_value_qs = StoryValueFactorScore.objects.exclude(valuefactor_id__in=all_value_factors)
+    stale_value_scores = stale_value_qs.count() if stale_value_qs.exists() else 0
     if stale_value_scores > 0:
         housekeeping['issues'].append({
             'type': 'stale_value_scores',
@@ -277,7 +392,8 @@ def dashboard(request):
         })
     
     # 7. Stale cost scores (scores for deleted factors) - reuse all_cost_factors
-    stale_cost_scores = StoryCostFactorScore.objects.exclude(costfactor_id__in=all_cost_factors).count()
+    stale_cost_qs = StoryCostFactorScore.objects.exclude(costfactor_id__in=all_cost_factors)
+    stale_cost_scores = stale_cost_qs.count() if stale_cost_qs.exists() else 0
     if stale_cost_scores > 0:
         housekeeping['issues'].append({
             'type': 'stale_cost_scores',
@@ -292,7 +408,7 @@ def dashboard(request):
     
     # 7b. Labels with no stories (housekeeping reminder)
     unused_labels_qs = Label.objects.annotate(story_count=Count('stories')).filter(story_count=0).order_by('category__name', 'name')
-    unused_labels_count = unused_labels_qs.count()
+    unused_labels_count = unused_labels_qs.count() if unused_labels_qs.exists() else 0
     if unused_labels_count > 0:
         housekeeping['issues'].append({
             'type': 'unused_labels',
@@ -331,12 +447,6 @@ def dashboard(request):
     # All stories (including archived)
     all_stories = Story.objects.all()
     
-    # Story counts by status
-    status_counts = {}
-    for story in all_stories.filter(archived=False):
-        status = story.computed_status
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
     # Archived counts
     archived_stories = all_stories.filter(archived=True).count()
     
@@ -344,7 +454,7 @@ def dashboard(request):
     recently_completed = all_stories.filter(
         archived=False,
         finished__isnull=False,
-        finished__gte=now - timezone.timedelta(days=30)
+        finished__gte=now - _RECENTLY_COMPLETED_AGE
     ).order_by('-finished')[:5]
     
     # Oldest open stories
@@ -353,10 +463,18 @@ def dashboard(request):
         finished__isnull=True
     ).order_by('created_at')[:5]
     
+    # Dependency counts per story in both directions (one grouped query each)
+    dependency_counts = dict(
+        StoryDependency.objects.values_list('story_id').annotate(n=Count('id'))
+    )
+    dependent_counts = dict(
+        StoryDependency.objects.values_list('depends_on_id').annotate(n=Count('id'))
+    )
+    
     # Stories with most dependencies
     stories_with_deps = []
     for story in stories:
-        dep_count = story.dependencies.count()
+        dep_count = dependency_counts.get(story['id'], 0)
         if dep_count > 0:
             stories_with_deps.append({'story': story, 'dependency_count': dep_count})
     stories_with_deps.sort(key=lambda x: x['dependency_count'], reverse=True)
@@ -365,7 +483,7 @@ def dashboard(request):
     # Stories blocking others (most dependents)
     blocking_stories = []
     for story in stories:
-        dependent_count = story.dependents.count()
+        dependent_count = dependent_counts.get(story['id'], 0)
         if dependent_count > 0:
             blocking_stories.append({'story': story, 'dependent_count': dependent_count})
     blocking_stories.sort(key=lambda x: x['dependent_count'], reverse=True)
@@ -385,19 +503,14 @@ def dashboard(request):
     
     # Summary counts
     summary = {
-        'total_stories': stories.count(),
+        'total_stories': len(stories),
         'needs_scoring': len(needs_scoring),
         'needs_refinement': len(needs_refinement),
         'rotting': len(rotting_stories),
         'review_required': len(review_required),
         'housekeeping': housekeeping['total_issues'],
     }
-    summary['healthy'] = summary['total_stories'] - len(set(
-        [s['story'].id for s in needs_scoring] +
-        [s['story'].id for s in needs_refinement] +
-        [s['story'].id for s in rotting_stories] +
-        [s['story'].id for s in review_required]
-    ))
+    summary['healthy'] = summary['total_stories'] - len(attention_ids)
     
     context = {
         'review_required': review_required,  # First (most important)
@@ -413,4 +526,12 @@ def dashboard(request):
             'blocked_days': BLOCKED_ROTTING_DAYS,
         },
     }
-    return render(request, 'backlog/dashboard.html', context)
+    response = render(request, 'backlog/dashboard.html', context)
+    
+    # Store the ETag for later conditional requests (not while flash messages
+    # are shown, which must not be replayed from the browser cache)
+    if not len(messages.get_messages(request)):
+        etag = f"{version}-{uuid.uuid4().hex}"
+        cache.set(_dashboard_etag_key(version), (etag, _next_day_tick(now, stories)), _DASHBOARD_ETAG_TIMEOUT)
+        response['ETag'] = quote_etag(etag)
+    return response
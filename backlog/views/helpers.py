@@ -3,10 +3,28 @@ Helper functions for WoS backlog views.
 
 This module contains utility functions used across multiple view modules:
 - History tracking for story changes
+- Status computation for `.values()` story rows
 - Factor section data building for reports
 - Tooltip generation for score breakdowns
 """
-from ..models import StoryHistory
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db.models import Count, Prefetch
+
+from ..models import LABEL_CATEGORIES_CACHE_KEY, Label, LabelCategory, Story, StoryHistory
+
+# A single label ID of the comma-separated 'labels' GET parameter
+_LABEL_ID_RE = re.compile(r'\d+')
+
+# Seconds the label categories stay cached (signals also drop the entry
+# when a label or category changes)
+_LABEL_CATEGORIES_CACHE_TIMEOUT = 3600
+
+# History entries queued by an active collect_history() block (None outside one)
+_pending_history = ContextVar('pending_history', default=None)
 
 
 def track_story_change(story, field_name, old_value, new_value):
@@ -18,29 +36,97 @@ def track_story_change(story, field_name, old_value, new_value):
         old_value: Previous value (will be converted to string)
         new_value: New value (will be converted to string)
     """
-    old_str = str(old_value) if old_value is not None else ''
-    new_str = str(new_value) if new_value is not None else ''
-    
-    if old_str != new_str:
-        StoryHistory.objects.create(
-            story=story,
-            field_name=field_name,
-            old_value=old_str if old_str else None,
-            new_value=new_str if new_str else None,
-        )
+    track_story_changes(story, [(field_name, old_value, new_value)])
+
+
+def track_story_changes(story, changes):
+    """Record several story field changes with a single bulk insert.
+    
+    Args:
+        story: The Story instance being modified
+        changes: Iterable of (field_name, old_value, new_value) tuples; values
+            are converted to strings and unchanged fields are skipped
+    """
+    entries = []
+    for field_name, old_value, new_value in changes:
+        old_str = str(old_value) if old_value is not None else ''
+        new_str = str(new_value) if new_value is not None else ''
+        if old_str != new_str:
+            entries.append(StoryHistory(
+                story=story,
+                field_name=field_name,
+                old_value=old_str if old_str else None,
+                new_value=new_str if new_str else None,
+            ))
+    if not entries:
+        return
+    pending = _pending_history.get()
+    if pending is not None:
+        pending.extend(entries)
+    else:
+        StoryHistory.objects.bulk_create(entries)
+
+
+@contextmanager
+def collect_history():
+    """Queue the history entries tracked inside the block and insert them once.
+    
+    track_story_change / track_story_changes calls made in the block append
+    to a pending list that is written with a single bulk_create when the
+    block exits normally; nothing is written if it raises.
+    
+    Yields:
+        The list of pending StoryHistory instances
+    """
+    pending = []
+    token = _pending_history.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_history.reset(token)
+    if pending:
+        StoryHistory.objects.bulk_create(pending, batch_size=500)
 
 
-def build_factor_section_data(sections, factor_attr, answers_map, with_tooltips=False):
+def compute_status_from_row(row, scores_complete):
+    """Compute a story's status from a `.values()` row.
+    
+    Mirrors Story.computed_status without needing a model instance.
+    
+    Args:
+        row: Dict with blocked, finished, started, planned, title, goal and workitems
+        scores_complete: Whether every value and cost factor has an answer
+        
+    Returns:
+        One of 'blocked', 'done', 'started', 'planned', 'ready' or 'idea'
+    """
+    status = Story.status_from_fields(
+        row['blocked'], row['finished'], row['started'], row['planned'],
+        row['title'], row['goal'], row['workitems'],
+    )
+    if status is not None:
+        return status
+    return 'ready' if scores_complete else 'idea'
+
+
+def build_factor_section_data(sections, factor_attr, answers_map, with_tooltips=False,
+                              prefetched_attr='_factors'):
     """Build section data structure for value or cost factor sections.
     
     This is a helper function to reduce code duplication between value and cost
     factor processing in report_view and other views.
     
+    Sections should be loaded with their factors prefetched into a list, e.g.
+    ``prefetch_related(Prefetch('valuefactors', to_attr='_factors'))``, so no
+    query is issued per section. Sections without the prefetched attribute fall
+    back to ``getattr(section, factor_attr).all()``.
+    
     Args:
         sections: QuerySet of ValueFactorSection or CostFactorSection
         factor_attr: Attribute name to access factors ('valuefactors' or 'costfactors')
         answers_map: Dict mapping factor_id -> (score, answer_description) or factor_id -> score
         with_tooltips: Whether to build detailed tooltips (for report view)
+        prefetched_attr: Attribute holding the prefetched factor list (Prefetch to_attr)
         
     Returns:
         List of dicts with section data including averages and optionally tooltips
@@ -49,9 +135,14 @@ def build_factor_section_data(sections, factor_attr, answers_map, with_tooltips=
     
     for section in sections:
         factors_detail = []
-        vals = []
+        total = 0
+        count = 0
+        
+        factors = getattr(section, prefetched_attr, None)
+        if factors is None:
+            factors = getattr(section, factor_attr).all()
         
-        for factor in getattr(section, factor_attr).all():
+        for factor in factors:
             score_info = answers_map.get(factor.id)
             
             if score_info is not None:
@@ -60,7 +151,8 @@ def build_factor_section_data(sections, factor_attr, answers_map, with_tooltips=
                     sc, answer_desc = score_info
                 else:
                     sc, answer_desc = score_info, None
-                vals.append(sc)
+                total += sc
+                count += 1
                 factors_detail.append({
                     'name': factor.name,
                     'description': getattr(factor, 'description', ''),
@@ -75,11 +167,11 @@ def build_factor_section_data(sections, factor_attr, answers_map, with_tooltips=
                     'answer_description': None
                 })
         
-        if vals:
-            avg = sum(vals) / len(vals)
+        if count:
+            avg = total / count
             tooltip = ''
             if with_tooltips:
-                tooltip = build_factor_tooltip(factors_detail, sum(vals), len(vals), avg)
+                tooltip = build_factor_tooltip(factors_detail, total, count, avg)
             section_data.append({
                 'avg': avg,
                 'factors': factors_detail,
@@ -108,19 +200,17 @@ def build_factor_tooltip(factors_detail, total, count, avg):
     Returns:
         Multi-line string for tooltip display
     """
-    tooltip_lines = []
-    for f in factors_detail:
-        if f['score'] is not None:
-            line = f"• {f['name']}: {f['score']}"
-            if f.get('answer_description'):
-                line += f" ({f['answer_description']})"
-            if f.get('description'):
-                line += f"\n  {f['description']}"
-            tooltip_lines.append(line)
-        else:
-            tooltip_lines.append(f"• {f['name']}: —")
-    tooltip_lines.append(f"\nAverage: {total} ÷ {count} = {avg:.1f}")
-    return '\n'.join(tooltip_lines)
+    def _lines():
+        for f in factors_detail:
+            if f['score'] is None:
+                yield f"• {f['name']}: —"
+                continue
+            answer = f" ({f['answer_description']})" if f.get('answer_description') else ''
+            description = f"\n  {f['description']}" if f.get('description') else ''
+            yield f"• {f['name']}: {f['score']}{answer}{description}"
+        yield f"\nAverage: {total} ÷ {count} = {avg:.1f}"
+
+    return '\n'.join(_lines())
 
 
 def build_answers_with_undefined(answers_qs):
@@ -153,37 +243,23 @@ def get_label_filter_context(request):
         - selected_labels_objects: List of selected Label objects for display
         - labels_param: Comma-separated string of selected label IDs for URL params
     """
-    from ..models import Label, LabelCategory
-    
     # Parse selected labels from URL parameter (format: labels=1,2,3)
     labels_param = request.GET.get('labels', '').strip()
-    selected_labels = set()
-    if labels_param:
-        for lid in labels_param.split(','):
-            lid = lid.strip()
-            if lid.isdigit():
-                selected_labels.add(int(lid))
-    
-    # Get all categories with their labels, ordered
-    categories = LabelCategory.objects.prefetch_related('labels').order_by('name')
-    
-    label_categories = []
-    for cat in categories:
-        labels = list(cat.labels.order_by('name'))
-        if labels:  # Only include categories that have labels
-            label_categories.append({
-                'category': cat,
-                'labels': labels,
-            })
+    # Malformed entries such as '1a2' are skipped whole, not split into IDs
+    selected_labels = {
+        int(lid) for lid in map(str.strip, labels_param.split(',')) if _LABEL_ID_RE.fullmatch(lid)
+    } if labels_param else set()
     
-    # Get selected label objects for display (with category info)
-    selected_labels_objects = []
-    if selected_labels:
-        selected_labels_objects = list(
-            Label.objects.filter(id__in=selected_labels)
-            .select_related('category')
-            .order_by('category__name', 'name')
-        )
+    # All categories with their sorted labels, from the cache
+    label_categories = _all_categories_with_labels()
+    
+    # Selected label objects for display, in category then name order (the
+    # cached labels already carry their category)
+    selected_labels_objects = [
+        label
+        for cat in label_categories for label in cat['labels']
+        if label.id in selected_labels
+    ]
     
     return {
         'label_categories': label_categories,
@@ -193,11 +269,40 @@ def get_label_filter_context(request):
     }
 
 
+def _all_categories_with_labels():
+    """Get the label categories that have labels, with their labels.
+    
+    Cached across requests; signal handlers in models drop the entry when a
+    label or category changes.
+    
+    Returns:
+        List of dicts with 'category' and its 'labels' (sorted by name),
+        categories ordered by name
+    """
+    return cache.get_or_set(
+        LABEL_CATEGORIES_CACHE_KEY, _load_categories_with_labels, _LABEL_CATEGORIES_CACHE_TIMEOUT
+    )
+
+
+def _load_categories_with_labels():
+    """Load the uncached result of _all_categories_with_labels."""
+    # Labels are sorted by the prefetch query so no per-category query is issued
+    categories = LabelCategory.objects.prefetch_related(
+        Prefetch('labels', queryset=Label.objects.order_by('name'), to_attr='sorted_labels')
+    ).order_by('name')
+    return [
+        {'category': cat, 'labels': cat.sorted_labels}
+        for cat in categories
+        if cat.sorted_labels  # Only include categories that have labels
+    ]
+
+
 def apply_label_filter(queryset, selected_labels):
     """Apply label filter to a Story queryset.
     
     Filters stories that have ALL of the selected labels (AND logic).
-    Returns distinct results to avoid duplicates.
+    Uses a single `id IN (...)` subquery over the story-label table, so no
+    JOINs multiply rows and no DISTINCT is needed.
     
     Args:
         queryset: Story QuerySet to filter
@@ -208,7 +313,14 @@ def apply_label_filter(queryset, selected_labels):
     """
     if selected_labels:
         # AND logic: story must have ALL selected labels
-        for label_id in selected_labels:
-            queryset = queryset.filter(labels__id=label_id)
-        queryset = queryset.distinct()
+        selected_labels = set(selected_labels)
+        matching_story_ids = (
+            Story.labels.through.objects
+            .filter(label_id__in=selected_labels)
+            .values('story_id')
+            .annotate(label_count=Count('label_id'))
+            .filter(label_count=len(selected_labels))
+            .values('story_id')
+        )
+        queryset = queryset.filter(id__in=matching_story_ids)
     return queryset
@@ -6,15 +6,66 @@ Visual workflow board:
 - kanban_move: AJAX endpoint for drag-and-drop updates
 """
 import json
+from datetime import datetime, timezone as dt_timezone
+from operator import itemgetter
 
+from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 
-from ..models import Story, ValueFactorSection, CostFactorSection
-from .helpers import apply_label_filter, get_label_filter_context, track_story_change
-from .report import _calculate_story_score
+from ..models import (
+    CostFactorSection,
+    Story,
+    StoryCostFactorScore,
+    StoryValueFactorScore,
+    ValueFactorSection,
+)
+from .helpers import (
+    apply_label_filter,
+    compute_status_from_row,
+    get_label_filter_context,
+    track_story_changes,
+)
+from .report import _calculate_score_from_maps
+
+# Sort key for stories without a date (sorts before any real date)
+_MIN_DATETIME = datetime.min.replace(tzinfo=dt_timezone.utc)
+
+# Story columns needed to place, sort and render a kanban card
+_CARD_FIELDS = (
+    'id', 'title', 'goal', 'workitems', 'planned', 'started', 'finished', 'blocked',
+)
+
+# Board column for each computed_status ('idea' stories are not shown)
+_COLUMN_FOR_STATUS = {
+    'ready': 'backlog',
+    'planned': 'planned',
+    'started': 'doing',
+    'blocked': 'blocked',
+    'done': 'done',
+}
+
+# Story columns kanban_move needs to load
+_MOVE_LOAD_FIELDS = (
+    'id', 'title', 'goal', 'workitems', 'status',
+    'planned', 'started', 'finished', 'blocked',
+)
+
+# Columns written by kanban_move for each target column
+_MOVE_UPDATE_FIELDS = {
+    'backlog': ['planned', 'started', 'finished', 'blocked', 'updated_at'],
+    'planned': ['planned', 'blocked', 'updated_at'],
+    'doing': ['started', 'blocked', 'updated_at'],
+    'blocked': ['blocked', 'updated_at'],
+    'done': ['finished', 'blocked', 'updated_at'],
+}
+
+
+def _format_history_dt(dt):
+    """Format a kanban date for a history entry, or None if unset."""
+    return dt.strftime('%Y-%m-%d %H:%M') if dt else None
 
 
 def kanban_view(request):
@@ -42,37 +93,36 @@ def kanban_view(request):
     value_sections = list(ValueFactorSection.objects.prefetch_related("valuefactors").all())
     cost_sections = list(CostFactorSection.objects.prefetch_related("costfactors").all())
 
-    qs = Story.objects.filter(archived=False).prefetch_related('scores__answer', 'cost_scores__answer', 'labels__category')
+    qs = Story.objects.filter(archived=False)
     
     # Apply label filter
     qs = apply_label_filter(qs, label_filter_ctx['selected_labels'])
     
-    stories = list(qs)
+    # Cards only need a few story columns, so load plain dict rows
+    stories = list(qs.values(*_CARD_FIELDS))
 
-    # Calculate scores for each story (pass pre-loaded sections)
-    story_data = []
-    for s in stories:
-        score_info = _calculate_story_score(s, value_sections, cost_sections)
-        story_data.append({
-            'story': s,
-            'result': score_info['result'],
-            'value': score_info['value'],
-            'cost': score_info['cost'],
-        })
+    # Answered scores per story as factor id -> score maps; only these
+    # matter for the result and the computed status
+    value_scores = {}
+    for story_id, factor_id, score in StoryValueFactorScore.objects.filter(
+        story__in=qs, answer__isnull=False
+    ).values_list('story_id', 'valuefactor_id', 'answer__score'):
+        value_scores.setdefault(story_id, {})[factor_id] = score
+    cost_scores = {}
+    for story_id, factor_id, score in StoryCostFactorScore.objects.filter(
+        story__in=qs, answer__isnull=False
+    ).values_list('story_id', 'costfactor_id', 'answer__score'):
+        cost_scores.setdefault(story_id, {})[factor_id] = score
 
-    # Sort stories
-    reverse = (sort_order == 'desc')
-    if sort_by == 'result':
-        story_data.sort(key=lambda x: x['result'], reverse=reverse)
-    elif sort_by == 'started':
-        story_data.sort(key=lambda x: (x['story'].started or timezone.datetime.min.replace(tzinfo=timezone.utc)), reverse=reverse)
-    elif sort_by == 'finished':
-        story_data.sort(key=lambda x: (x['story'].finished or timezone.datetime.min.replace(tzinfo=timezone.utc)), reverse=reverse)
-    elif sort_by == 'blocked':
-        story_data.sort(key=lambda x: x['story'].blocked or '', reverse=reverse)
-    elif sort_by == 'status':
-        status_order = {'idea': 0, 'ready': 1, 'planned': 2, 'started': 3, 'blocked': 4, 'done': 5}
-        story_data.sort(key=lambda x: status_order.get(x['story'].computed_status, 0), reverse=reverse)
+    # Labels per story, in the same order as Label.Meta.ordering
+    story_labels = {}
+    for link in Story.labels.through.objects.filter(story__in=qs).select_related(
+        'label__category'
+    ).order_by('label__category__name', 'label__name'):
+        story_labels.setdefault(link.story_id, []).append(link.label)
+
+    all_value_factors = Story._get_all_value_factor_ids()
+    all_cost_factors = Story._get_all_cost_factor_ids()
 
     columns = {
         'backlog': [],   # computed_status == 'ready'
@@ -82,21 +132,44 @@ def kanban_view(request):
         'done': [],      # computed_status == 'done'
     }
 
-    for item in story_data:
-        s = item['story']
-        st = s.computed_status
-        card = {'story': s, 'result': item['result'], 'value': item['value'], 'cost': item['cost']}
-        if st == 'ready':
-            columns['backlog'].append(card)
-        elif st == 'planned':
-            columns['planned'].append(card)
-        elif st == 'started':
-            columns['doing'].append(card)
-        elif st == 'blocked':
-            columns['blocked'].append(card)
-        elif st == 'done':
-            columns['done'].append(card)
-        # ignore 'idea' stories from the board
+    # Partition stories into columns, scoring only the ones shown on the board
+    # (pass pre-loaded sections)
+    for s in stories:
+        vf_map = value_scores.get(s['id'], {})
+        cf_map = cost_scores.get(s['id'], {})
+        scores_complete = all_value_factors <= vf_map.keys() and all_cost_factors <= cf_map.keys()
+        column_name = _COLUMN_FOR_STATUS.get(compute_status_from_row(s, scores_complete))
+        if column_name is None:
+            continue  # ignore 'idea' stories from the board
+        column = columns[column_name]
+        score_info = _calculate_score_from_maps(vf_map, cf_map, value_sections, cost_sections)
+        card = {
+            'story': s,
+            'labels': story_labels.get(s['id'], []),
+            'result': score_info['result'],
+            'value': score_info['value'],
+            'cost': score_info['cost'],
+        }
+        if sort_by == 'started':
+            card['sort_key'] = s['started'] or _MIN_DATETIME
+        elif sort_by == 'finished':
+            card['sort_key'] = s['finished'] or _MIN_DATETIME
+        elif sort_by == 'blocked':
+            card['sort_key'] = s['blocked'] or ''
+        column.append(card)
+
+    # Sort each column independently. Every card in a column shares the same
+    # status, so sorting by status keeps the query order.
+    reverse = (sort_order == 'desc')
+    if sort_by == 'result':
+        sort_key = itemgetter('result')
+    elif sort_by in ('started', 'finished', 'blocked'):
+        sort_key = itemgetter('sort_key')
+    else:
+        sort_key = None
+    if sort_key is not None:
+        for column in columns.values():
+            column.sort(key=sort_key, reverse=reverse)
 
     context = {
         'columns': columns,
@@ -129,7 +202,8 @@ def kanban_move(request):
     if not story_id or not target:
         return JsonResponse({'ok': False, 'error': 'Missing story_id or target'}, status=400)
 
-    story = get_object_or_404(Story, pk=story_id)
+    # Load only the columns the move, computed_status and Story.save() read
+    story = get_object_or_404(Story.objects.only(*_MOVE_LOAD_FIELDS), pk=story_id)
     
     # Store old values for history tracking
     old_status = story.computed_status
@@ -159,37 +233,35 @@ def kanban_move(request):
     else:
         return JsonResponse({'ok': False, 'error': 'Invalid target'}, status=400)
 
-    story.save()
-    
-    # Track history changes
     new_status = story.computed_status
+
+    # Collect history entries and write them with the story in one transaction
+    changes = []
     if old_status != new_status:
-        track_story_change(story, 'Status (Kanban)', old_status.upper(), new_status.upper())
+        changes.append(('Status (Kanban)', old_status.upper(), new_status.upper()))
     
-    # Track date changes
-    if old_planned != story.planned:
-        old_val = old_planned.strftime('%Y-%m-%d %H:%M') if old_planned else None
-        new_val = story.planned.strftime('%Y-%m-%d %H:%M') if story.planned else None
-        track_story_change(story, 'Planned', old_val, new_val)
-    
-    if old_started != story.started:
-        old_val = old_started.strftime('%Y-%m-%d %H:%M') if old_started else None
-        new_val = story.started.strftime('%Y-%m-%d %H:%M') if story.started else None
-        track_story_change(story, 'Started', old_val, new_val)
-    
-    if old_finished != story.finished:
-        old_val = old_finished.strftime('%Y-%m-%d %H:%M') if old_finished else None
-        new_val = story.finished.strftime('%Y-%m-%d %H:%M') if story.finished else None
-        track_story_change(story, 'Finished', old_val, new_val)
+    # Track date changes (compare raw datetimes, format only what changed)
+    for label, old_dt, new_dt in (
+        ('Planned', old_planned, story.planned),
+        ('Started', old_started, story.started),
+        ('Finished', old_finished, story.finished),
+    ):
+        if old_dt != new_dt:
+            changes.append((label, _format_history_dt(old_dt), _format_history_dt(new_dt)))
     
     if old_blocked != story.blocked:
-        track_story_change(story, 'Blocked', old_blocked if old_blocked else None, story.blocked if story.blocked else None)
+        changes.append(('Blocked', old_blocked if old_blocked else None, story.blocked if story.blocked else None))
+    
+    with transaction.atomic():
+        # Only write the columns this target touches (plus auto_now updated_at)
+        story.save(update_fields=_MOVE_UPDATE_FIELDS[target])
+        track_story_changes(story, changes)
     
     return JsonResponse({
         'ok': True,
         'story': {
             'id': story.id,
-            'status': story.computed_status,
+            'status': new_status,
             'planned': story.planned.isoformat() if story.planned else None,
             'started': story.started.isoformat() if story.started else None,
             'finished': story.finished.isoformat() if story.finished else None,
@@ -6,7 +6,10 @@ Provides a UI to rank stories relative to each other for a specific factor:
 - relative_ranking_save: AJAX endpoint to save rankings
 """
 import json
+from operator import itemgetter
 
+from django.core.cache import cache
+from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.http import require_POST
@@ -17,8 +20,63 @@ from ..models import (
     StoryCostFactorScore,
     StoryValueFactorScore,
     ValueFactor,
+    bump_report_cache_version,
+    factor_cache_key,
 )
 
+# json.dumps separators without the default padding spaces
+_COMPACT_JSON = (',', ':')
+
+# Columns of the score rows (and joined story/answer) read by relative_ranking
+_SCORE_ROW_FIELDS = (
+    'story', 'answer', 'relative_rank',
+    'story__title', 'answer__score', 'answer__description',
+)
+
+# Seconds a factor and its answer boundaries stay cached (signals also
+# invalidate the entry when the factor, its answers or its section change)
+_FACTOR_CACHE_TIMEOUT = 300
+
+
+def _value_answer_key(story_info):
+    """Sort key for value factors: higher answer score first, unanswered last."""
+    answer_score = story_info['answer_score']
+    return (answer_score is None, -(answer_score or 0))
+
+
+def _cost_answer_key(story_info):
+    """Sort key for cost factors: lower answer score first, unanswered last."""
+    answer_score = story_info['answer_score']
+    return (answer_score is None, answer_score or 999)
+
+
+def _load_factor(factor_model, factor_id):
+    """Load a factor with its answer boundaries, cached per factor.
+    
+    Answer boundaries are the factor's score levels, best first: highest
+    score first for value factors, lowest first for cost factors.
+    
+    Args:
+        factor_model: ValueFactor or CostFactor
+        factor_id: Primary key of the factor
+        
+    Returns:
+        Tuple of (factor, answer_boundaries)
+        
+    Raises:
+        factor_model.DoesNotExist: If no such factor exists (not cached)
+    """
+    def load():
+        factor = factor_model.objects.select_related('section').get(pk=factor_id)
+        order = '-score' if factor_model is ValueFactor else 'score'
+        answer_boundaries = [
+            {'id': a.id, 'score': a.score, 'description': a.description}
+            for a in factor.answers.order_by(order)
+        ]
+        return factor, answer_boundaries
+    
+    return cache.get_or_set(factor_cache_key(factor_model, factor_id), load, _FACTOR_CACHE_TIMEOUT)
+
 
 def relative_ranking(request):
     """Relative ranking page for scoring stories against each other.
@@ -46,61 +104,45 @@ def relative_ranking(request):
     if factor_id:
         try:
             factor_id = int(factor_id)
+            selected_factor, answer_boundaries = _load_factor(
+                ValueFactor if factor_type == 'value' else CostFactor, factor_id
+            )
             if factor_type == 'value':
-                selected_factor = ValueFactor.objects.select_related('section').prefetch_related('answers').get(pk=factor_id)
                 # Get all non-archived stories with their scores for this factor
-                scores = StoryValueFactorScore.objects.filter(
+                scores = list(StoryValueFactorScore.objects.filter(
                     valuefactor=selected_factor,
                     story__archived=False
-                ).select_related('story', 'answer').order_by('relative_rank')
-                
-                # Build answer boundaries (score levels)
-                answers = list(selected_factor.answers.order_by('-score'))  # Highest score first
-                answer_boundaries = [{'id': a.id, 'score': a.score, 'description': a.description} for a in answers]
-                
+                ).select_related('story', 'answer').only(*_SCORE_ROW_FIELDS).order_by('relative_rank'))
             else:
-                selected_factor = CostFactor.objects.select_related('section').prefetch_related('answers').get(pk=factor_id)
-                scores = StoryCostFactorScore.objects.filter(
+                scores = list(StoryCostFactorScore.objects.filter(
                     costfactor=selected_factor,
                     story__archived=False
-                ).select_related('story', 'answer').order_by('relative_rank')
-                
-                # Build answer boundaries (score levels) - for cost, lower is better
-                answers = list(selected_factor.answers.order_by('score'))  # Lowest score first (best)
-                answer_boundaries = [{'id': a.id, 'score': a.score, 'description': a.description} for a in answers]
+                ).select_related('story', 'answer').only(*_SCORE_ROW_FIELDS).order_by('relative_rank'))
             
             # Get all stories that have a score record for this factor
             stories_with_scores = {score.story_id for score in scores}
             
             # Get all non-archived stories that DON'T have a score record yet
             # These need to have score records created
-            all_stories = Story.objects.filter(archived=False).exclude(id__in=stories_with_scores)
+            # (only id and title: the new rows are shown on the page as-is)
+            all_stories = list(Story.objects.filter(archived=False).exclude(
+                id__in=stories_with_scores
+            ).only('id', 'title'))
             
-            # Create score records for stories that don't have them
-            if factor_type == 'value':
-                for story in all_stories:
-                    StoryValueFactorScore.objects.get_or_create(
-                        story=story,
-                        valuefactor=selected_factor,
-                        defaults={'answer': None, 'relative_rank': None}
-                    )
-                # Re-fetch scores after creating missing ones
-                scores = StoryValueFactorScore.objects.filter(
-                    valuefactor=selected_factor,
-                    story__archived=False
-                ).select_related('story', 'answer').order_by('relative_rank')
-            else:
-                for story in all_stories:
-                    StoryCostFactorScore.objects.get_or_create(
-                        story=story,
-                        costfactor=selected_factor,
-                        defaults={'answer': None, 'relative_rank': None}
-                    )
-                # Re-fetch scores after creating missing ones
-                scores = StoryCostFactorScore.objects.filter(
-                    costfactor=selected_factor,
-                    story__archived=False
-                ).select_related('story', 'answer').order_by('relative_rank')
+            # Create score records for stories that don't have them and add
+            # the new (unranked, unanswered) rows in memory instead of re-fetching
+            if all_stories:
+                if factor_type == 'value':
+                    created = StoryValueFactorScore.objects.bulk_create([
+                        StoryValueFactorScore(story=story, valuefactor=selected_factor, answer=None, relative_rank=None)
+                        for story in all_stories
+                    ], ignore_conflicts=True)
+                else:
+                    created = StoryCostFactorScore.objects.bulk_create([
+                        StoryCostFactorScore(story=story, costfactor=selected_factor, answer=None, relative_rank=None)
+                        for story in all_stories
+                    ], ignore_conflicts=True)
+                scores.extend(created)
             
             # Separate into three categories:
             # 1. ranked: has a relative_rank (positive integer)
@@ -111,17 +153,20 @@ def relative_ranking(request):
             no_score_stories = []
             
             for score in scores:
+                story = score.story
+                answer = score.answer
+                rank = score.relative_rank
                 story_info = {
-                    'id': score.story.id,
-                    'title': score.story.title,
+                    'id': story.id,
+                    'title': story.title,
                     'answer_id': score.answer_id,
-                    'answer_score': score.answer.score if score.answer else None,
-                    'answer_desc': score.answer.description if score.answer else 'Undefined',
-                    'relative_rank': score.relative_rank,
+                    'answer_score': answer.score if answer else None,
+                    'answer_desc': answer.description if answer else 'Undefined',
+                    'relative_rank': rank,
                 }
-                if score.relative_rank is not None and score.relative_rank > 0:
+                if rank is not None and rank > 0:
                     ranked_stories.append(story_info)
-                elif score.relative_rank == 0:
+                elif rank == 0:
                     # Explicit "no score" marker
                     no_score_stories.append(story_info)
                 else:
@@ -129,17 +174,12 @@ def relative_ranking(request):
                     undefined_stories.append(story_info)
             
             # Sort ranked by rank
-            ranked_stories.sort(key=lambda x: x['relative_rank'])
+            ranked_stories.sort(key=itemgetter('relative_rank'))
             
             # Sort undefined by answer score (descending for value, ascending for cost)
-            if factor_type == 'value':
-                # Higher answer score = better = should be at top
-                undefined_stories.sort(key=lambda x: (x['answer_score'] is None, -(x['answer_score'] or 0)))
-                no_score_stories.sort(key=lambda x: (x['answer_score'] is None, -(x['answer_score'] or 0)))
-            else:
-                # Lower answer score = better = should be at top
-                undefined_stories.sort(key=lambda x: (x['answer_score'] is None, x['answer_score'] or 999))
-                no_score_stories.sort(key=lambda x: (x['answer_score'] is None, x['answer_score'] or 999))
+            answer_key = _value_answer_key if factor_type == 'value' else _cost_answer_key
+            undefined_stories.sort(key=answer_key)
+            no_score_stories.sort(key=answer_key)
             
             stories_data = {
                 'ranked': ranked_stories,
@@ -156,8 +196,8 @@ def relative_ranking(request):
         'factor_type': factor_type,
         'factor_id': factor_id,
         'selected_factor': selected_factor,
-        'stories_data': json.dumps(stories_data) if stories_data else '{}',
-        'answer_boundaries': json.dumps(answer_boundaries),
+        'stories_data': json.dumps(stories_data, separators=_COMPACT_JSON) if stories_data else '{}',
+        'answer_boundaries': json.dumps(answer_boundaries, separators=_COMPACT_JSON),
     }
     return render(request, 'backlog/relative.html', context)
 
@@ -182,20 +222,30 @@ def relative_ranking_save(request):
         factor_id = data.get('factor_id')
         rankings = data.get('rankings', [])
         
-        if factor_type == 'value':
-            factor = ValueFactor.objects.get(pk=factor_id)
-            for item in rankings:
-                StoryValueFactorScore.objects.filter(
-                    story_id=item['story_id'],
-                    valuefactor=factor
-                ).update(relative_rank=item['rank'])
-        else:
-            factor = CostFactor.objects.get(pk=factor_id)
-            for item in rankings:
-                StoryCostFactorScore.objects.filter(
-                    story_id=item['story_id'],
-                    costfactor=factor
-                ).update(relative_rank=item['rank'])
+        rank_map = {item['story_id']: item['rank'] for item in rankings}
+        
+        # Read and write in one transaction so the whole re-rank commits once
+        with transaction.atomic():
+            # Load the affected score rows once and write all ranks in one bulk_update
+            if factor_type == 'value':
+                factor = ValueFactor.objects.get(pk=factor_id)
+                score_model = StoryValueFactorScore
+                rows = list(StoryValueFactorScore.objects.filter(
+                    valuefactor=factor,
+                    story_id__in=rank_map
+                ).only('id', 'story_id', 'relative_rank'))
+            else:
+                factor = CostFactor.objects.get(pk=factor_id)
+                score_model = StoryCostFactorScore
+                rows = list(StoryCostFactorScore.objects.filter(
+                    costfactor=factor,
+                    story_id__in=rank_map
+                ).only('id', 'story_id', 'relative_rank'))
+            
+            for row in rows:
+                row.relative_rank = rank_map[row.story_id]
+            score_model.objects.bulk_update(rows, ['relative_rank'], batch_size=500)
+            bump_report_cache_version()  # bulk_update() sends no signals
         
         return JsonResponse({'success': True})
         
@@ -14,10 +14,17 @@ Normalization for relative ranks:
   - For value: rank 1 = best = highest score
   - For cost: rank 1 = best = lowest score (inverted)
 """
-from django.db.models import Max, Min, Count, Q
+import hashlib
+from collections import namedtuple
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.http import HttpResponse
 from django.shortcuts import render
 
 from ..models import (
+    FACTOR_RANGES_CACHE_KEY,
     CostFactor,
     CostFactorSection,
     Story,
@@ -25,96 +32,171 @@ from ..models import (
     StoryValueFactorScore,
     ValueFactor,
     ValueFactorSection,
+    report_cache_version,
 )
 from .helpers import apply_label_filter, get_label_filter_context
 
+# Seconds a rendered hybrid report page stays cached (data changes bump the
+# version in its key, so this only bounds how long orphaned pages linger)
+_REPORT_CACHE_TIMEOUT = 3600
+
+# Seconds the factor score ranges stay cached (signals also invalidate them)
+_FACTOR_RANGES_CACHE_TIMEOUT = 300
+
+# Score range for factors without answers (shared, never mutated)
+_DEFAULT_SCORE_RANGE = {'min': 1, 'max': 5}
+
+# Per-factor breakdown record behind the section tooltips; rank and
+# ranked_count are only set for relative factors
+FactorDetail = namedtuple(
+    'FactorDetail', 'name description score rank ranked_count mode answer_description'
+)
+
+# Story columns read by the view (status inputs) and the row template
+_STORY_FIELDS = (
+    'id', 'title', 'review_required',
+    'blocked', 'finished', 'started', 'planned', 'goal', 'workitems',
+)
+
+# Shared empty score map for stories without any score rows (never mutated)
+_NO_SCORES = {}
+
 
 def _get_factor_score_ranges():
     """Get min/max answer scores for each factor.
     
+    Cached across requests; signal handlers in models drop the entry when
+    factors or their answers change.
+    
     Returns:
         value_ranges: dict of {factor_id: {'min': int, 'max': int}}
         cost_ranges: dict of {factor_id: {'min': int, 'max': int}}
     """
+    return cache.get_or_set(
+        FACTOR_RANGES_CACHE_KEY, _compute_factor_score_ranges, _FACTOR_RANGES_CACHE_TIMEOUT
+    )
+
+
+def _compute_factor_score_ranges():
+    """Compute the uncached result of _get_factor_score_ranges."""
+    # One GROUP BY query per factor type; factors without answers get min/max None
     value_ranges = {}
-    for vf in ValueFactor.objects.prefetch_related('answers').all():
-        scores = [a.score for a in vf.answers.all()]
-        if scores:
-            value_ranges[vf.id] = {'min': min(scores), 'max': max(scores)}
+    for vf_id, mn, mx in ValueFactor.objects.annotate(
+        mn=Min('answers__score'), mx=Max('answers__score')
+    ).values_list('id', 'mn', 'mx'):
+        if mn is not None:
+            value_ranges[vf_id] = {'min': mn, 'max': mx}
         else:
-            value_ranges[vf.id] = {'min': 1, 'max': 5}  # default
+            value_ranges[vf_id] = _DEFAULT_SCORE_RANGE
     
     cost_ranges = {}
-    for cf in CostFactor.objects.prefetch_related('answers').all():
-        scores = [a.score for a in cf.answers.all()]
-        if scores:
-            cost_ranges[cf.id] = {'min': min(scores), 'max': max(scores)}
+    for cf_id, mn, mx in CostFactor.objects.annotate(
+        mn=Min('answers__score'), mx=Max('answers__score')
+    ).values_list('id', 'mn', 'mx'):
+        if mn is not None:
+            cost_ranges[cf_id] = {'min': mn, 'max': mx}
         else:
-            cost_ranges[cf.id] = {'min': 1, 'max': 5}  # default
+            cost_ranges[cf_id] = _DEFAULT_SCORE_RANGE
     
     return value_ranges, cost_ranges
 
 
-def _get_ranked_counts(story_ids):
-    """Get count of ranked stories (relative_rank > 0) per factor.
-    
+def _group_scores_by_story(score_model, factor_field, story_ids):
+    """Load score rows for the given stories as flat tuples grouped per story.
+
+    Also counts the ranked stories (relative_rank > 0) per factor from the
+    same rows, so no separate count query is needed.
+
     Args:
-        story_ids: List of story IDs to consider (filtered stories)
-    
+        score_model: StoryValueFactorScore or StoryCostFactorScore
+        factor_field: Factor foreign key column ('valuefactor_id' or 'costfactor_id')
+        story_ids: List of story IDs to load scores for
+
     Returns:
-        value_counts: dict of {factor_id: count}
-        cost_counts: dict of {factor_id: count}
+        by_story: dict of {story_id: {factor_id: (score, relative_rank, answer_desc)}}
+        ranked_counts: dict of {factor_id: count}
     """
-    # Count ranked stories per value factor
-    value_counts = {}
-    value_stats = StoryValueFactorScore.objects.filter(
-        story_id__in=story_ids,
-        relative_rank__gt=0
-    ).values('valuefactor_id').annotate(count=Count('id'))
-    for stat in value_stats:
-        value_counts[stat['valuefactor_id']] = stat['count']
+    by_story = {}
+    ranked_counts = {}
+    rows = score_model.objects.filter(story_id__in=story_ids).values_list(
+        'story_id', factor_field, 'relative_rank', 'answer__score', 'answer__description'
+    )
+    for story_id, factor_id, rank, score, answer_desc in rows:
+        # answer__description is None only when there is no answer
+        by_story.setdefault(story_id, {})[factor_id] = (
+            score, rank, answer_desc if answer_desc is not None else 'Undefined'
+        )
+        if rank is not None and rank > 0:
+            ranked_counts[factor_id] = ranked_counts.get(factor_id, 0) + 1
+    return by_story, ranked_counts
+
+
+def _build_section_defs(sections, factor_attr, ranges, ranked_counts, invert=False):
+    """Flatten each section's factors into tuples for the per-story loop.
     
-    # Count ranked stories per cost factor
-    cost_counts = {}
-    cost_stats = StoryCostFactorScore.objects.filter(
-        story_id__in=story_ids,
-        relative_rank__gt=0
-    ).values('costfactor_id').annotate(count=Count('id'))
-    for stat in cost_stats:
-        cost_counts[stat['costfactor_id']] = stat['count']
+    Relative ranks are normalized linearly onto the factor's answer scale:
+    rank 1 → best score, rank N → worst score. A rank's score is therefore
+    `best_score + (rank - 1) * rank_step`, with both terms precomputed here.
     
-    return value_counts, cost_counts
+    Args:
+        sections: Sections with their factors prefetched
+        factor_attr: Attribute name to access factors ('valuefactors' or 'costfactors')
+        ranges: Dict of factor_id -> {'min', 'max'} answer scores
+        ranked_counts: Dict of factor_id -> number of ranked stories
+        invert: If True, rank 1 → min score (for cost factors)
+                If False, rank 1 → max score (for value factors)
+        
+    Returns:
+        List of (section, factor_defs) where each factor def is a tuple of
+        (id, name, description, scoring_mode, best_score, rank_step, ranked_count)
+    """
+    section_defs = []
+    for section in sections:
+        factor_defs = []
+        for factor in getattr(section, factor_attr).all():
+            score_range = ranges.get(factor.id, _DEFAULT_SCORE_RANGE)
+            ranked_count = ranked_counts.get(factor.id, 1)
+            delta = score_range['max'] - score_range['min']
+            # With a single ranked story every rank gets the best score
+            step = delta / (ranked_count - 1) if ranked_count > 1 else 0
+            if invert:
+                best_score, rank_step = score_range['min'], step
+            else:
+                best_score, rank_step = score_range['max'], -step
+            factor_defs.append((
+                factor.id, factor.name, factor.description, factor.scoring_mode,
+                best_score, rank_step, ranked_count,
+            ))
+        section_defs.append((section, factor_defs))
+    return section_defs
+
 
+def _factor_tooltip_line(f):
+    """Format one factor's tooltip line (absolute score, normalized rank or unset)."""
+    if f.score is None:
+        mode_hint = "[relative]" if f.mode == 'relative' else ""
+        return f"• {f.name}: — {mode_hint}"
+    if f.mode == 'absolute':
+        return f"• {f.name}: {f.score} ({f.answer_description})"
+    return f"• {f.name}: #{f.rank}/{f.ranked_count} → {f.score:.1f} [relative]"
 
-def _normalize_rank(rank, ranked_count, min_score, max_score, invert=False):
-    """Normalize a rank to a score within the answer scale.
+
+def _build_section_tooltip(factors_detail, total, count):
+    """Build a section's multi-line tooltip for value and cost sections alike.
     
     Args:
-        rank: The relative rank (1 = best)
-        ranked_count: Total number of ranked stories for this factor
-        min_score: Minimum answer score for this factor
-        max_score: Maximum answer score for this factor
-        invert: If True, rank 1 → min_score (for cost factors)
-                If False, rank 1 → max_score (for value factors)
-    
+        factors_detail: List of FactorDetail records
+        total: Sum of the scores that went into the section average
+        count: Number of those scores
+        
     Returns:
-        Normalized score (float)
+        Multi-line string: one line per factor, then the average (or "No scores set")
     """
-    if ranked_count <= 1:
-        # Only one story ranked, give it the best score
-        return min_score if invert else max_score
-    
-    # Linear interpolation: rank 1 → best, rank N → worst
-    # For value: best = max_score, worst = min_score
-    # For cost: best = min_score, worst = max_score
-    t = (rank - 1) / (ranked_count - 1)  # 0 for rank 1, 1 for rank N
-    
-    if invert:
-        # Cost: rank 1 → min_score, rank N → max_score
-        return min_score + t * (max_score - min_score)
+    if count:
+        summary = f"\nAverage: {total:.1f} ÷ {count} = {total / count:.1f}"
     else:
-        # Value: rank 1 → max_score, rank N → min_score
-        return max_score - t * (max_score - min_score)
+        summary = '\nNo scores set'
+    return '\n'.join([*(_factor_tooltip_line(f) for f in factors_detail), summary])
 
 
 def relative_report_view(request):
@@ -134,6 +216,15 @@ def relative_report_view(request):
     - Value: rank 1 → max_score, rank N → min_score (higher = better)
     - Cost: rank 1 → min_score, rank N → max_score (lower = better)
     """
+    # Serve the rendered page from the cache while the report data version
+    # is unchanged (skipped with pending flash messages, which are per user)
+    cacheable = not len(messages.get_messages(request))
+    if cacheable:
+        cache_key = _report_cache_key(request)
+        html = cache.get(cache_key)
+        if html is not None:
+            return HttpResponse(html)
+    
     # Get label filter context
     label_filter_ctx = get_label_filter_context(request)
     status_filter = request.GET.get('status', '')
@@ -147,260 +238,170 @@ def relative_report_view(request):
 
     stories_qs = (
         Story.objects.filter(archived=False)
-        .prefetch_related(
-            "scores__valuefactor",
-            "scores__answer",
-            "cost_scores__costfactor", 
-            "cost_scores__answer",
-            "labels__category"
-        )
+        .only(*_STORY_FIELDS)
+        .prefetch_related("labels__category")
         .order_by("title")
     )
     
     # Apply label filter
     stories_qs = apply_label_filter(stories_qs, label_filter_ctx['selected_labels'])
     
-    # Status filtering requires post-processing since computed_status is a property
+    # Filter by status in the database via the annotated equivalent of computed_status
     if status_filter:
-        stories_qs = [s for s in stories_qs if s.computed_status == status_filter]
-    else:
-        stories_qs = list(stories_qs)
+        stories_qs = Story.with_status(stories_qs).filter(annotated_status=status_filter)
+    stories_qs = list(stories_qs)
 
-    # Get IDs of filtered stories for rank counting
+    # Get IDs of filtered stories for score loading and rank counting
     story_ids = [s.id for s in stories_qs]
     total_story_count = len(stories_qs)
     
-    # Get score ranges and ranked counts for normalization
-    value_ranges, cost_ranges = _get_factor_score_ranges()
-    value_ranked_counts, cost_ranked_counts = _get_ranked_counts(story_ids)
-    
-    # Check if we have any relative factors
-    has_relative_value_factors = ValueFactor.objects.filter(scoring_mode=ValueFactor.SCORING_RELATIVE).exists()
-    has_relative_cost_factors = CostFactor.objects.filter(scoring_mode=CostFactor.SCORING_RELATIVE).exists()
+    # Check if we have any relative factors (every factor belongs to a
+    # section, so the prefetched section factors cover them all)
+    has_relative_value_factors = any(
+        vf.scoring_mode == ValueFactor.SCORING_RELATIVE
+        for vs in value_sections for vf in vs.valuefactors.all()
+    )
+    has_relative_cost_factors = any(
+        cf.scoring_mode == CostFactor.SCORING_RELATIVE
+        for cs in cost_sections for cf in cs.costfactors.all()
+    )
     has_any_relative = has_relative_value_factors or has_relative_cost_factors
     
+    # Get score ranges for normalization (only relative factors use them)
+    if has_any_relative:
+        value_ranges, cost_ranges = _get_factor_score_ranges()
+    else:
+        value_ranges, cost_ranges = {}, {}
+    
+    # Flat score rows grouped per story instead of prefetched model instances,
+    # with the ranked story counts per factor taken from the same rows
+    value_by_story, value_ranked_counts = _group_scores_by_story(
+        StoryValueFactorScore, 'valuefactor_id', story_ids
+    )
+    cost_by_story, cost_ranked_counts = _group_scores_by_story(
+        StoryCostFactorScore, 'costfactor_id', story_ids
+    )
+    
+    # Per-section factor definitions with their normalization params, built
+    # once instead of per story
+    value_section_defs = _build_section_defs(
+        value_sections, 'valuefactors', value_ranges, value_ranked_counts
+    )
+    cost_section_defs = _build_section_defs(
+        cost_sections, 'costfactors', cost_ranges, cost_ranked_counts, invert=True
+    )
+    
+    all_vf_ids = Story._get_all_value_factor_ids()
+    all_cf_ids = Story._get_all_cost_factor_ids()
+    
     rows = []
     for s in stories_qs:
-        # Build maps for both absolute and relative scoring
-        # vf_map: factor_id -> {score, relative_rank, answer_desc, scoring_mode}
-        vf_map = {}
-        for sv in s.scores.all():
-            vf_map[sv.valuefactor_id] = {
-                'score': sv.answer.score if sv.answer else None,
-                'relative_rank': sv.relative_rank,
-                'answer_desc': sv.answer.description if sv.answer else 'Undefined',
-                'scoring_mode': sv.valuefactor.scoring_mode,
-            }
-        
-        cf_map = {}
-        for sv in s.cost_scores.all():
-            cf_map[sv.costfactor_id] = {
-                'score': sv.answer.score if sv.answer else None,
-                'relative_rank': sv.relative_rank,
-                'answer_desc': sv.answer.description if sv.answer else 'Undefined',
-                'scoring_mode': sv.costfactor.scoring_mode,
-            }
+        # factor_id -> (score, relative_rank, answer_desc)
+        vf_map = value_by_story.get(s.id, _NO_SCORES)
+        cf_map = cost_by_story.get(s.id, _NO_SCORES)
+
+        # Same result as s.computed_status, from the grouped score rows
+        status = Story.status_from_fields(
+            s.blocked, s.finished, s.started, s.planned, s.title, s.goal, s.workitems,
+        )
+        if status is None:
+            scores_complete = (
+                all_vf_ids <= {vf_id for vf_id, info in vf_map.items() if info[0] is not None}
+                and all_cf_ids <= {cf_id for cf_id, info in cf_map.items() if info[0] is not None}
+            )
+            status = 'ready' if scores_complete else 'idea'
+
+        # Whether any section produced an average
+        has_scores = False
 
         # per-value-section averages with breakdown details for tooltips
         value_section_data = []
-        for vs in value_sections:
+        for vs, factor_defs in value_section_defs:
             factors_detail = []
-            scores = []
-            for vf in vs.valuefactors.all():
-                factor_info = vf_map.get(vf.id)
+            total = 0
+            count = 0
+            for vf_id, name, description, scoring_mode, best_score, rank_step, ranked_count in factor_defs:
+                factor_info = vf_map.get(vf_id)
                 if factor_info:
-                    scoring_mode = factor_info['scoring_mode']
-                    
+                    score, rank, answer_desc = factor_info
                     if scoring_mode == ValueFactor.SCORING_ABSOLUTE:
                         # Use absolute score
-                        if factor_info['score'] is not None:
-                            scores.append(factor_info['score'])
-                            factors_detail.append({
-                                'name': vf.name,
-                                'description': vf.description,
-                                'score': factor_info['score'],
-                                'mode': 'absolute',
-                                'answer_description': factor_info['answer_desc']
-                            })
-                        else:
-                            factors_detail.append({
-                                'name': vf.name,
-                                'description': vf.description,
-                                'score': None,
-                                'mode': 'absolute',
-                                'answer_description': factor_info['answer_desc']
-                            })
-                    else:
+                        if score is not None:
+                            total += score
+                            count += 1
+                        factors_detail.append(FactorDetail(
+                            name, description, score, None, None, 'absolute', answer_desc
+                        ))
+                    elif rank is not None and rank > 0:
                         # Use relative rank, normalized to answer scale
-                        rank = factor_info['relative_rank']
-                        if rank is not None and rank > 0:
-                            # Get normalization params
-                            score_range = value_ranges.get(vf.id, {'min': 1, 'max': 5})
-                            ranked_count = value_ranked_counts.get(vf.id, 1)
-                            
-                            # Normalize: rank 1 → max_score, rank N → min_score
-                            normalized = _normalize_rank(
-                                rank, ranked_count,
-                                score_range['min'], score_range['max'],
-                                invert=False  # Value: higher = better
-                            )
-                            scores.append(normalized)
-                            factors_detail.append({
-                                'name': vf.name,
-                                'description': vf.description,
-                                'score': normalized,
-                                'rank': rank,
-                                'ranked_count': ranked_count,
-                                'mode': 'relative',
-                                'answer_description': factor_info['answer_desc']
-                            })
-                        else:
-                            factors_detail.append({
-                                'name': vf.name,
-                                'description': vf.description,
-                                'score': None,
-                                'rank': rank,
-                                'mode': 'relative',
-                                'answer_description': factor_info['answer_desc']
-                            })
+                        # Normalize: rank 1 → max_score, rank N → min_score
+                        normalized = best_score + (rank - 1) * rank_step
+                        total += normalized
+                        count += 1
+                        factors_detail.append(FactorDetail(
+                            name, description, normalized, rank, ranked_count, 'relative', answer_desc
+                        ))
+                    else:
+                        factors_detail.append(FactorDetail(
+                            name, description, None, rank, None, 'relative', answer_desc
+                        ))
                 else:
-                    factors_detail.append({
-                        'name': vf.name,
-                        'description': vf.description,
-                        'score': None,
-                        'mode': vf.scoring_mode,
-                        'answer_description': 'Undefined'
-                    })
+                    factors_detail.append(FactorDetail(
+                        name, description, None, None, None, scoring_mode, 'Undefined'
+                    ))
             
-            if scores:
-                avg = sum(scores) / len(scores)
-                # Build tooltip
-                tooltip_lines = []
-                for f in factors_detail:
-                    if f['score'] is not None:
-                        if f['mode'] == 'absolute':
-                            line = f"• {f['name']}: {f['score']} ({f['answer_description']})"
-                        else:
-                            ranked_count = f.get('ranked_count', '?')
-                            line = f"• {f['name']}: #{f.get('rank', '?')}/{ranked_count} → {f['score']:.1f} [relative]"
-                        tooltip_lines.append(line)
-                    else:
-                        mode_hint = "[relative]" if f['mode'] == 'relative' else ""
-                        tooltip_lines.append(f"• {f['name']}: — {mode_hint}")
-                tooltip_lines.append(f"\nAverage: {sum(scores):.1f} ÷ {len(scores)} = {avg:.1f}")
-                value_section_data.append({
-                    'avg': avg,
-                    'factors': factors_detail,
-                    'tooltip': '\n'.join(tooltip_lines)
-                })
-            else:
-                tooltip_lines = []
-                for f in factors_detail:
-                    mode_hint = "[relative]" if f['mode'] == 'relative' else ""
-                    tooltip_lines.append(f"• {f['name']}: — {mode_hint}")
-                tooltip_lines.append('\nNo scores set')
-                value_section_data.append({'avg': None, 'factors': factors_detail, 'tooltip': '\n'.join(tooltip_lines)})
+            if count:
+                has_scores = True
+            value_section_data.append({
+                'avg': total / count if count else None,
+                'factors': factors_detail,
+                'tooltip': _build_section_tooltip(factors_detail, total, count),
+            })
 
         # per-cost-section averages with breakdown details for tooltips
         cost_section_data = []
-        for cs in cost_sections:
+        for cs, factor_defs in cost_section_defs:
             factors_detail = []
-            scores = []
-            for cf in cs.costfactors.all():
-                factor_info = cf_map.get(cf.id)
+            total = 0
+            count = 0
+            for cf_id, name, description, scoring_mode, best_score, rank_step, ranked_count in factor_defs:
+                factor_info = cf_map.get(cf_id)
                 if factor_info:
-                    scoring_mode = factor_info['scoring_mode']
-                    
+                    score, rank, answer_desc = factor_info
                     if scoring_mode == CostFactor.SCORING_ABSOLUTE:
                         # Use absolute score
-                        if factor_info['score'] is not None:
-                            scores.append(factor_info['score'])
-                            factors_detail.append({
-                                'name': cf.name,
-                                'description': cf.description,
-                                'score': factor_info['score'],
-                                'mode': 'absolute',
-                                'answer_description': factor_info['answer_desc']
-                            })
-                        else:
-                            factors_detail.append({
-                                'name': cf.name,
-                                'description': cf.description,
-                                'score': None,
-                                'mode': 'absolute',
-                                'answer_description': factor_info['answer_desc']
-                            })
-                    else:
+                        if score is not None:
+                            total += score
+                            count += 1
+                        factors_detail.append(FactorDetail(
+                            name, description, score, None, None, 'absolute', answer_desc
+                        ))
+                    elif rank is not None and rank > 0:
                         # Use relative rank, normalized to answer scale
-                        rank = factor_info['relative_rank']
-                        if rank is not None and rank > 0:
-                            # Get normalization params
-                            score_range = cost_ranges.get(cf.id, {'min': 1, 'max': 5})
-                            ranked_count = cost_ranked_counts.get(cf.id, 1)
-                            
-                            # Normalize: rank 1 → min_score, rank N → max_score
-                            # (for cost, lower is better, so rank 1 = best = low score)
-                            normalized = _normalize_rank(
-                                rank, ranked_count,
-                                score_range['min'], score_range['max'],
-                                invert=True  # Cost: lower = better
-                            )
-                            scores.append(normalized)
-                            factors_detail.append({
-                                'name': cf.name,
-                                'description': cf.description,
-                                'score': normalized,
-                                'rank': rank,
-                                'ranked_count': ranked_count,
-                                'mode': 'relative',
-                                'answer_description': factor_info['answer_desc']
-                            })
-                        else:
-                            factors_detail.append({
-                                'name': cf.name,
-                                'description': cf.description,
-                                'score': None,
-                                'rank': rank,
-                                'mode': 'relative',
-                                'answer_description': factor_info['answer_desc']
-                            })
+                        # Normalize: rank 1 → min_score, rank N → max_score
+                        # (for cost, lower is better, so rank 1 = best = low score)
+                        normalized = best_score + (rank - 1) * rank_step
+                        total += normalized
+                        count += 1
+                        factors_detail.append(FactorDetail(
+                            name, description, normalized, rank, ranked_count, 'relative', answer_desc
+                        ))
+                    else:
+                        factors_detail.append(FactorDetail(
+                            name, description, None, rank, None, 'relative', answer_desc
+                        ))
                 else:
-                    factors_detail.append({
-                        'name': cf.name,
-                        'description': cf.description,
-                        'score': None,
-                        'mode': cf.scoring_mode,
-                        'answer_description': 'Undefined'
-                    })
+                    factors_detail.append(FactorDetail(
+                        name, description, None, None, None, scoring_mode, 'Undefined'
+                    ))
             
-            if scores:
-                avg = sum(scores) / len(scores)
-                # Build tooltip
-                tooltip_lines = []
-                for f in factors_detail:
-                    if f['score'] is not None:
-                        if f['mode'] == 'absolute':
-                            line = f"• {f['name']}: {f['score']} ({f['answer_description']})"
-                        else:
-                            ranked_count = f.get('ranked_count', '?')
-                            line = f"• {f['name']}: #{f.get('rank', '?')}/{ranked_count} → {f['score']:.1f} [relative]"
-                        tooltip_lines.append(line)
-                    else:
-                        mode_hint = "[relative]" if f['mode'] == 'relative' else ""
-                        tooltip_lines.append(f"• {f['name']}: — {mode_hint}")
-                tooltip_lines.append(f"\nAverage: {sum(scores):.1f} ÷ {len(scores)} = {avg:.1f}")
-                cost_section_data.append({
-                    'avg': avg,
-                    'factors': factors_detail,
-                    'tooltip': '\n'.join(tooltip_lines)
-                })
-            else:
-                tooltip_lines = []
-                for f in factors_detail:
-                    mode_hint = "[relative]" if f['mode'] == 'relative' else ""
-                    tooltip_lines.append(f"• {f['name']}: — {mode_hint}")
-                tooltip_lines.append('\nNo scores set')
-                cost_section_data.append({'avg': None, 'factors': factors_detail, 'tooltip': '\n'.join(tooltip_lines)})
+            if count:
+                has_scores = True
+            cost_section_data.append({
+                'avg': total / count if count else None,
+                'factors': factors_detail,
+                'tooltip': _build_section_tooltip(factors_detail, total, count),
+            })
 
         # Extract just the averages
         value_section_avgs = [d['avg'] for d in value_section_data]
@@ -412,13 +413,19 @@ def relative_report_view(request):
         cost_sum = sum(avg for avg in cost_section_avgs if avg is not None)
         
         # Build tooltip for totals
-        value_total_tooltip = ' + '.join(f"{value_sections[i].name}: {d['avg']:.1f}" for i, d in enumerate(value_section_data) if d['avg'] is not None)
+        value_total_tooltip = ' + '.join(
+            f"{vs.name}: {d['avg']:.1f}"
+            for vs, d in zip(value_sections, value_section_data) if d['avg'] is not None
+        )
         if value_total_tooltip:
             value_total_tooltip += f" = {value_sum:.1f}"
         else:
             value_total_tooltip = "No section scores"
             
-        cost_total_tooltip = ' + '.join(f"{cost_sections[i].name}: {d['avg']:.1f}" for i, d in enumerate(cost_section_data) if d['avg'] is not None)
+        cost_total_tooltip = ' + '.join(
+            f"{cs.name}: {d['avg']:.1f}"
+            for cs, d in zip(cost_sections, cost_section_data) if d['avg'] is not None
+        )
         if cost_total_tooltip:
             cost_total_tooltip += f" = {cost_sum:.1f}"
         else:
@@ -442,13 +449,11 @@ def relative_report_view(request):
             result_tooltip = f"Value ({value_sum:.1f}) ÷ Cost ({cost_sum:.1f}) = {result:.2f}"
         else:
             result_tooltip = "Cannot calculate (no cost scores)"
-        
-        # Check if story has scores
-        has_scores = any(d['avg'] is not None for d in value_section_data) or any(d['avg'] is not None for d in cost_section_data)
 
         rows.append(
             {
                 "story": s,
+                "status": status,
                 "value_section_data": value_section_data,
                 "cost_section_data": cost_section_data,
                 "value_section_avgs": value_section_avgs,
@@ -478,4 +483,14 @@ def relative_report_view(request):
         "selected_labels_objects": label_filter_ctx['selected_labels_objects'],
         "labels_param": label_filter_ctx['labels_param'],
     }
-    return render(request, "backlog/relative_report.html", context)
+    response = render(request, "backlog/relative_report.html", context)
+    if cacheable:
+        cache.set(cache_key, response.content.decode(), _REPORT_CACHE_TIMEOUT)
+    return response
+
+
+def _report_cache_key(request):
+    """Cache key for a rendered hybrid report page: its filters plus the data version."""
+    filters = f"{request.GET.get('status', '')}|{request.GET.get('labels', '').strip()}"
+    digest = hashlib.md5(filters.encode()).hexdigest()
+    return f"relative_report:{report_cache_version()}:{digest}"
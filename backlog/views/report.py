@@ -4,17 +4,41 @@ Report view for WoS backlog application.
 WSJF scoring report showing value/cost breakdown and prioritization:
 - report_view: Main report with section averages and tooltips
 - _calculate_story_score: Helper to calculate value/cost score
+- _calculate_score_from_maps: Same calculation from factor id -> score maps
 """
+import hashlib
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.shortcuts import render
 
 from ..models import (
+    REPORT_SECTIONS_CACHE_KEY,
     CostFactorSection,
     Story,
+    StoryCostFactorScore,
+    StoryValueFactorScore,
     ValueFactorSection,
+    report_cache_version,
 )
 from .helpers import apply_label_filter, get_label_filter_context
 
 
+# Seconds a rendered report page stays cached (data changes bump the
+# version in its key, so this only bounds how long orphaned pages linger)
+_REPORT_CACHE_TIMEOUT = 3600
+
+# Seconds the sections and their layouts stay cached (signals also invalidate them)
+_REPORT_SECTIONS_CACHE_TIMEOUT = 3600
+
+# Shared empty score map for stories without answered scores (never mutated)
+_NO_SCORES = {}
+
+# (score, answer_description) for factors without a defined score
+_NO_SCORE = (None, None)
+
+
 def report_view(request):
     """WSJF scoring report showing value/cost breakdown and prioritization.
     
@@ -30,168 +54,65 @@ def report_view(request):
     - Tooltips showing factor breakdown for each section
     - Tweak mode for temporary score adjustments
     """
+    # Serve the rendered page from the cache while the report data version
+    # is unchanged (skipped with pending flash messages, which are per user)
+    cacheable = not len(messages.get_messages(request))
+    if cacheable:
+        cache_key = _report_cache_key(request)
+        html = cache.get(cache_key)
+        if html is not None:
+            return HttpResponse(html)
+    
     # Get label filter context
     label_filter_ctx = get_label_filter_context(request)
     status_filter = request.GET.get('status', '')
     
-    value_sections = list(
-        ValueFactorSection.objects.prefetch_related("valuefactors").order_by("name")
-    )
-    cost_sections = list(
-        CostFactorSection.objects.prefetch_related("costfactors").order_by("name")
-    )
+    # Sections with their factors and the per-section layouts (section/factor
+    # metadata and "no scores" tooltips), cached across requests
+    value_sections, cost_sections, value_layout, cost_layout = _get_report_sections()
 
     stories_qs = (
-        Story.objects.filter(archived=False).prefetch_related("scores__answer", "cost_scores__answer", "labels__category").order_by(
-            "title",
-        )
+        Story.objects.filter(archived=False).prefetch_related("labels__category").order_by("title")
     )
     
     # Apply label filter
     stories_qs = apply_label_filter(stories_qs, label_filter_ctx['selected_labels'])
     
-    # Status filtering requires post-processing since computed_status is a property
+    # Filter by status in the database via the annotated equivalent of computed_status
     if status_filter:
-        stories_qs = [s for s in stories_qs if s.computed_status == status_filter]
-    else:
-        stories_qs = list(stories_qs)
+        stories_qs = Story.with_status(stories_qs).filter(annotated_status=status_filter)
+    stories_qs = list(stories_qs)
+
+    # maps of story id -> factor id -> (score, answer_description), only for
+    # defined scores, loaded as flat rows instead of score/answer instances
+    story_ids = [s.id for s in stories_qs]
+    vf_maps = _answered_scores_by_story(StoryValueFactorScore, 'valuefactor_id', story_ids)
+    cf_maps = _answered_scores_by_story(StoryCostFactorScore, 'costfactor_id', story_ids)
+    all_vf_ids = Story._get_all_value_factor_ids()
+    all_cf_ids = Story._get_all_cost_factor_ids()
 
     rows = []
     for s in stories_qs:
-        # maps of factor id -> (score, answer_description), only for defined scores
-        vf_map = {
-            sv.valuefactor_id: (sv.answer.score, sv.answer.description)
-            for sv in s.scores.all() if sv.answer
-        }
-        cf_map = {
-            sv.costfactor_id: (sv.answer.score, sv.answer.description)
-            for sv in s.cost_scores.all() if sv.answer
-        }
-
-        # per-value-section averages with breakdown details for tooltips
-        value_section_data = []
-        for vs in value_sections:
-            factors_detail = []
-            vals = []
-            for vf in vs.valuefactors.all():
-                score_info = vf_map.get(vf.id)
-                if score_info is not None:
-                    sc, answer_desc = score_info
-                    vals.append(sc)
-                    factors_detail.append({
-                        'name': vf.name,
-                        'description': vf.description,
-                        'score': sc,
-                        'answer_description': answer_desc
-                    })
-                else:
-                    factors_detail.append({
-                        'name': vf.name,
-                        'description': vf.description,
-                        'score': None,
-                        'answer_description': None
-                    })
-            if vals:
-                avg = sum(vals) / len(vals)
-                # Build multi-line tooltip with factor details
-                tooltip_lines = []
-                for f in factors_detail:
-                    if f['score'] is not None:
-                        line = f"• {f['name']}: {f['score']}"
-                        if f['answer_description']:
-                            line += f" ({f['answer_description']})"
-                        if f['description']:
-                            line += f"\n  {f['description']}"
-                        tooltip_lines.append(line)
-                    else:
-                        tooltip_lines.append(f"• {f['name']}: —")
-                tooltip_lines.append(f"\nAverage: {sum(vals)} ÷ {len(vals)} = {avg:.1f}")
-                value_section_data.append({
-                    'avg': avg,
-                    'factors': factors_detail,
-                    'tooltip': '\n'.join(tooltip_lines)
-                })
-            else:
-                tooltip_lines = [f"• {f['name']}: —" for f in factors_detail]
-                tooltip_lines.append('\nNo scores set')
-                value_section_data.append({'avg': None, 'factors': factors_detail, 'tooltip': '\n'.join(tooltip_lines)})
-
-        # per-cost-section averages with breakdown details for tooltips
-        cost_section_data = []
-        for cs in cost_sections:
-            factors_detail = []
-            vals = []
-            for cf in cs.costfactors.all():
-                score_info = cf_map.get(cf.id)
-                if score_info is not None:
-                    sc, answer_desc = score_info
-                    vals.append(sc)
-                    factors_detail.append({
-                        'name': cf.name,
-                        'description': cf.description,
-                        'score': sc,
-                        'answer_description': answer_desc
-                    })
-                else:
-                    factors_detail.append({
-                        'name': cf.name,
-                        'description': cf.description,
-                        'score': None,
-                        'answer_description': None
-                    })
-            if vals:
-                avg = sum(vals) / len(vals)
-                # Build multi-line tooltip with factor details
-                tooltip_lines = []
-                for f in factors_detail:
-                    if f['score'] is not None:
-                        line = f"• {f['name']}: {f['score']}"
-                        if f['answer_description']:
-                            line += f" ({f['answer_description']})"
-                        if f['description']:
-                            line += f"\n  {f['description']}"
-                        tooltip_lines.append(line)
-                    else:
-                        tooltip_lines.append(f"• {f['name']}: —")
-                tooltip_lines.append(f"\nAverage: {sum(vals)} ÷ {len(vals)} = {avg:.1f}")
-                cost_section_data.append({
-                    'avg': avg,
-                    'factors': factors_detail,
-                    'tooltip': '\n'.join(tooltip_lines)
-                })
-            else:
-                tooltip_lines = [f"• {f['name']}: —" for f in factors_detail]
-                tooltip_lines.append('\nNo scores set')
-                cost_section_data.append({'avg': None, 'factors': factors_detail, 'tooltip': '\n'.join(tooltip_lines)})
-
-        # For backwards compatibility, extract just the averages
-        value_section_avgs = [d['avg'] for d in value_section_data]
-        cost_section_avgs = [d['avg'] for d in cost_section_data]
-
-        # Total Value = sum of section averages (not sum of all individual scores)
-        value_sum = sum(avg for avg in value_section_avgs if avg is not None)
-        # Total Cost = sum of section averages (not sum of all individual scores)
-        cost_sum = sum(avg for avg in cost_section_avgs if avg is not None)
-        
-        # Build tooltip for totals
-        value_total_tooltip = ' + '.join(f"{value_sections[i].name}: {d['avg']:.1f}" for i, d in enumerate(value_section_data) if d['avg'] is not None)
-        if value_total_tooltip:
-            value_total_tooltip += f" = {value_sum:.1f}"
-        else:
-            value_total_tooltip = "No section scores"
-            
-        cost_total_tooltip = ' + '.join(f"{cost_sections[i].name}: {d['avg']:.1f}" for i, d in enumerate(cost_section_data) if d['avg'] is not None)
-        if cost_total_tooltip:
-            cost_total_tooltip += f" = {cost_sum:.1f}"
-        else:
-            cost_total_tooltip = "No section scores"
+        vf_map = vf_maps.get(s.id, _NO_SCORES)
+        cf_map = cf_maps.get(s.id, _NO_SCORES)
+
+        # Same result as s.computed_status, from the answered score maps
+        status = Story.status_from_fields(
+            s.blocked, s.finished, s.started, s.planned, s.title, s.goal, s.workitems,
+        )
+        if status is None:
+            scores_complete = all_vf_ids <= vf_map.keys() and all_cf_ids <= cf_map.keys()
+            status = 'ready' if scores_complete else 'idea'
+
+        # per-section averages with breakdown details, their total and tooltips
+        value_section_data, value_sum, value_total_tooltip = (
+            _build_section_data(value_layout, vf_map)
+        )
+        cost_section_data, cost_sum, cost_total_tooltip = (
+            _build_section_data(cost_layout, cf_map)
+        )
         
-        result = None
-        if cost_sum:
-            try:
-                result = value_sum / cost_sum
-            except Exception:
-                result = None
+        result = value_sum / cost_sum if cost_sum else None
 
         # simple result class for coloring in template
         if result is None:
@@ -208,10 +129,9 @@ def report_view(request):
         rows.append(
             {
                 "story": s,
+                "status": status,
                 "value_section_data": value_section_data,
                 "cost_section_data": cost_section_data,
-                "value_section_avgs": value_section_avgs,
-                "cost_section_avgs": cost_section_avgs,
                 "value_sum": value_sum,
                 "cost_sum": cost_sum,
                 "value_total_tooltip": value_total_tooltip,
@@ -236,7 +156,180 @@ def report_view(request):
         "selected_labels_objects": label_filter_ctx['selected_labels_objects'],
         "labels_param": label_filter_ctx['labels_param'],
     }
-    return render(request, "backlog/report.html", context)
+    response = render(request, "backlog/report.html", context)
+    if cacheable:
+        cache.set(cache_key, response.content.decode(), _REPORT_CACHE_TIMEOUT)
+    return response
+
+
+def _report_cache_key(request):
+    """Cache key for a rendered report page: its filters plus the data version."""
+    filters = f"{request.GET.get('status', '')}|{request.GET.get('labels', '').strip()}"
+    digest = hashlib.md5(filters.encode()).hexdigest()
+    return f"report:{report_cache_version()}:{digest}"
+
+
+def _get_report_sections():
+    """Get the report's sections and section layouts.
+    
+    Cached across requests; signal handlers in models drop the entry when
+    sections or factors change.
+    
+    Returns:
+        Tuple of (value_sections, cost_sections, value_layout, cost_layout),
+        sections ordered by name with their factors prefetched
+    """
+    return cache.get_or_set(
+        REPORT_SECTIONS_CACHE_KEY, _load_report_sections, _REPORT_SECTIONS_CACHE_TIMEOUT
+    )
+
+
+def _load_report_sections():
+    """Load the uncached result of _get_report_sections."""
+    value_sections = list(
+        ValueFactorSection.objects.prefetch_related("valuefactors").order_by("name")
+    )
+    cost_sections = list(
+        CostFactorSection.objects.prefetch_related("costfactors").order_by("name")
+    )
+    return (
+        value_sections,
+        cost_sections,
+        _build_section_layout(value_sections, 'valuefactors'),
+        _build_section_layout(cost_sections, 'costfactors'),
+    )
+
+
+def _build_section_layout(sections, factor_attr):
+    """Flatten sections and their factors for the per-story report loop.
+    
+    Args:
+        sections: Sections with their factors prefetched
+        factor_attr: Attribute name to access factors ('valuefactors' or 'costfactors')
+        
+    Returns:
+        Tuple of (entries, factor_section) where entries is a list of
+        (section_name, factors, no_score_tooltip, no_score_factors) per section
+        and factor_section maps factor id -> index of its section in entries.
+        factors is a list of (id, name, description) tuples; no_score_tooltip
+        and no_score_factors are the tooltip and factor breakdown shown when
+        none of the section's factors is scored
+    """
+    entries = []
+    factor_section = {}
+    for index, section in enumerate(sections):
+        factors = [(f.id, f.name, f.description) for f in getattr(section, factor_attr).all()]
+        for factor_id, _, _ in factors:
+            factor_section[factor_id] = index
+        no_score_tooltip = '\n'.join([*(f"• {name}: —" for _, name, _ in factors), '\nNo scores set'])
+        no_score_factors = tuple((name, description, None, None) for _, name, description in factors)
+        entries.append((section.name, factors, no_score_tooltip, no_score_factors))
+    return entries, factor_section
+
+
+def _answered_scores_by_story(score_model, factor_field, story_ids):
+    """Load answered scores for the given stories, grouped per story.
+    
+    Args:
+        score_model: StoryValueFactorScore or StoryCostFactorScore
+        factor_field: Factor foreign key column ('valuefactor_id' or 'costfactor_id')
+        story_ids: List of story IDs to load scores for
+        
+    Returns:
+        Dict of {story_id: {factor_id: (score, answer_description)}}
+    """
+    by_story = {}
+    rows = score_model.objects.filter(
+        story_id__in=story_ids, answer__isnull=False
+    ).values_list('story_id', factor_field, 'answer__score', 'answer__description')
+    for story_id, factor_id, score, answer_desc in rows:
+        by_story.setdefault(story_id, {})[factor_id] = (score, answer_desc)
+    return by_story
+
+
+def _build_section_data(layout, fmap):
+    """Compute a story's value or cost side of the report.
+    
+    Args:
+        layout: Section layout from _build_section_layout
+        fmap: Dict mapping factor id -> (score, answer_description), defined scores only
+        
+    Returns:
+        Tuple of (section_data, total, total_tooltip) where the
+        total is the sum of section averages (not of individual scores)
+    """
+    entries, factor_section = layout
+    # Only sections holding one of the story's (usually few) scores need
+    # their factors walked; the rest reuse their precomputed "no scores" data
+    scored_sections = {factor_section.get(factor_id) for factor_id in fmap}
+    section_data = [
+        _compute_section(factors, no_score_tooltip, fmap) if index in scored_sections
+        else {'avg': None, 'factors': no_score_factors, 'tooltip': no_score_tooltip}
+        for index, (_, factors, no_score_tooltip, no_score_factors) in enumerate(entries)
+    ]
+    total = sum(d['avg'] for d in section_data if d['avg'] is not None)
+    
+    total_tooltip = ' + '.join(
+        f"{entry[0]}: {d['avg']:.1f}"
+        for entry, d in zip(entries, section_data) if d['avg'] is not None
+    )
+    if total_tooltip:
+        total_tooltip += f" = {total:.1f}"
+    else:
+        total_tooltip = "No section scores"
+    return section_data, total, total_tooltip
+
+
+def _compute_section(factors, no_score_tooltip, fmap):
+    """Compute one section's average, factor breakdown and tooltip for a story.
+    
+    Args:
+        factors: List of (id, name, description) tuples from _build_section_layout
+        no_score_tooltip: Tooltip to use when no factor is scored
+        fmap: Dict mapping factor id -> (score, answer_description), defined scores only
+        
+    Returns:
+        Dict with 'avg' (None without scores), 'factors' as a list of
+        (name, description, score, answer_description) tuples, and 'tooltip'
+    """
+    factors_detail = []
+    total = 0
+    count = 0
+    for factor_id, name, description in factors:
+        sc, answer_desc = fmap.get(factor_id, _NO_SCORE)
+        if sc is not None:
+            total += sc
+            count += 1
+        factors_detail.append((name, description, sc, answer_desc))
+    if not count:
+        return {'avg': None, 'factors': factors_detail, 'tooltip': no_score_tooltip}
+    avg = total / count
+    return {
+        'avg': avg,
+        'factors': factors_detail,
+        'tooltip': _section_tooltip(factors_detail, total, count, avg),
+    }
+
+
+def _section_tooltip(factors_detail, total, count, avg):
+    """Build a scored section's tooltip (same text as helpers.build_factor_tooltip).
+    
+    Args:
+        factors_detail: List of (name, description, score, answer_description) tuples
+        total: Sum of scores
+        count: Number of scores
+        avg: Calculated average
+    """
+    lines = []
+    for name, description, sc, answer_desc in factors_detail:
+        if sc is None:
+            lines.append(f"• {name}: —")
+            continue
+        answer = f" ({answer_desc})" if answer_desc else ''
+        detail = f"\n  {description}" if description else ''
+        lines.append(f"• {name}: {sc}{answer}{detail}")
+    lines.append(f"\nAverage: {total} ÷ {count} = {avg:.1f}")
+    return '\n'.join(lines)
 
 
 def _calculate_story_score(story, value_sections=None, cost_sections=None):
@@ -250,7 +343,10 @@ def _calculate_story_score(story, value_sections=None, cost_sections=None):
         cost_sections: Optional pre-loaded CostFactorSection queryset
         
     If sections are not provided, they will be loaded from database.
-    For batch processing, pass pre-loaded sections to avoid N+1 queries.
+    For batch processing, pass pre-loaded sections and prefetch the scores
+    with their answers, e.g. ``Prefetch('scores',
+    queryset=StoryValueFactorScore.objects.select_related('answer'))``, to
+    avoid N+1 queries.
     """
     # Get all sections (use provided or load from DB)
     if value_sections is None:
@@ -262,6 +358,21 @@ def _calculate_story_score(story, value_sections=None, cost_sections=None):
     vf_map = {sv.valuefactor_id: sv.answer.score for sv in story.scores.all() if sv.answer}
     cf_map = {sc.costfactor_id: sc.answer.score for sc in story.cost_scores.all() if sc.answer}
     
+    return _calculate_score_from_maps(vf_map, cf_map, value_sections, cost_sections)
+
+
+def _calculate_score_from_maps(vf_map, cf_map, value_sections, cost_sections):
+    """Calculate value/cost result from factor score maps.
+    
+    Args:
+        vf_map: Dict mapping value factor id -> answered score
+        cf_map: Dict mapping cost factor id -> answered score
+        value_sections: Pre-loaded ValueFactorSections with valuefactors prefetched
+        cost_sections: Pre-loaded CostFactorSections with costfactors prefetched
+        
+    Returns:
+        Dict with 'value', 'cost' and 'result'
+    """
     # Calculate value section averages and sum them
     value_section_avgs = []
     for vs in value_sections:
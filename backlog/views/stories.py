@@ -7,13 +7,25 @@ Handles story CRUD and refinement:
 - story_list: List/filter/sort stories
 - bulk_action: Handle bulk actions on multiple stories
 """
+import hashlib
+import json
+import time
+from collections import namedtuple
+from functools import lru_cache
+
 from django.contrib import messages
-from django.db.models import Q
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Exists, ExpressionWrapper, F, OuterRef, Prefetch, Q, Subquery
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
 from django.views.decorators.http import require_POST
 
 from ..models import (
+    REFINE_FACTOR_TREE_CACHE_KEY,
     CostFactor,
     CostFactorAnswer,
     CostFactorSection,
@@ -27,243 +39,506 @@ from ..models import (
     ValueFactor,
     ValueFactorAnswer,
     ValueFactorSection,
+    bump_report_cache_version,
+)
+from .helpers import (
+    apply_label_filter,
+    collect_history,
+    get_label_filter_context,
+    track_story_change,
+    track_story_changes,
 )
-from .helpers import apply_label_filter, get_label_filter_context, track_story_change
 
 
-def refine_story(request, pk):
-    """Refine an existing story with full editing capabilities.
-    
-    This view allows editing:
-    - Basic info: title, goal, workitems
-    - Value/cost factor scores
-    - Dependencies on other stories
-    - Archive/unarchive and review flags
+# Seconds the refine form's factor tree stays cached (signals also drop it
+# when sections, factors or answers change)
+_FACTOR_TREE_CACHE_TIMEOUT = 3600
+
+# Leading radio option for an unanswered factor (empty id, not answer_id=None)
+_UNDEFINED_ANSWER = {'id': '', 'score': '—', 'description': 'Undefined'}
+
+# Selected answers of a story that has none yet
+_NO_SELECTION = {}
+
+# StoryHistory columns shown on the refine page (story_id is kept so the
+# reverse manager can attach the story without a query per entry)
+_HISTORY_FIELDS = ('id', 'story_id', 'field_name', 'old_value', 'new_value', 'changed_at')
+
+# Stories shown per page of the story list
+_STORIES_PER_PAGE = 50
+
+# How each score kind is read from the form and stored
+_ScoreKind = namedtuple(
+    '_ScoreKind',
+    'prefix label factor_model answer_model score_model factor_field',
+)
+
+_SCORE_KINDS = (
+    _ScoreKind('vf_', 'Value', ValueFactor, ValueFactorAnswer, StoryValueFactorScore, 'valuefactor'),
+    _ScoreKind('cf_', 'Cost', CostFactor, CostFactorAnswer, StoryCostFactorScore, 'costfactor'),
+)
+
+
+@lru_cache(maxsize=None)
+def _stories_url():
+    """URL of the story list, resolved once (it takes no arguments)."""
+    return reverse('backlog:stories')
+
+
+def _parse_ids(values):
+    """Parse submitted ID strings, skipping any that are not plain digits.
     
-    Also displays story history and dependent stories.
+    Args:
+        values: Iterable of strings, e.g. a POST list or a split CSV value
+        
+    Returns:
+        List of integer IDs in submission order
     """
-    story = get_object_or_404(Story, pk=pk)
-    # load factor sections for scoring UI
-    value_sections = ValueFactorSection.objects.prefetch_related("valuefactors__answers").order_by("name")
-    cost_sections = CostFactorSection.objects.prefetch_related("costfactors__answers").order_by("name")
+    return [int(value) for value in map(str.strip, values) if value.isdigit()]
 
-    # build initial selected answer maps (answer_id or None for undefined)
-    vf_initial = {sv.valuefactor_id: sv.answer_id for sv in story.scores.all()}
-    cf_initial = {sv.costfactor_id: sv.answer_id for sv in story.cost_scores.all()}
 
-    # Build structured data for templates: sections -> factors -> answers + selected id
-    value_sections_data = []
-    for vs in value_sections:
-        vf_list = []
-        for vf in vs.valuefactors.all():
-            answers = list(vf.answers.order_by('score'))
-            # Add undefined option (empty string id to distinguish from answer_id=None)
-            answers_with_undefined = [{'id': '', 'score': '—', 'description': 'Undefined'}] + answers
-            # Get selected answer_id; None or missing means undefined (select the '' option)
-            selected = vf_initial.get(vf.id)
-            if selected is None:
-                selected = ''  # Mark as undefined
-            vf_list.append({'vf': vf, 'answers': answers_with_undefined, 'selected': selected})
-        value_sections_data.append({'section': vs, 'valuefactors': vf_list})
-
-    cost_sections_data = []
-    for cs in cost_sections:
-        cf_list = []
-        for cf in cs.costfactors.all():
-            answers = list(cf.answers.order_by('score'))
-            # Add undefined option
-            answers_with_undefined = [{'id': '', 'score': '—', 'description': 'Undefined'}] + answers
-            # Get selected answer_id; None or missing means undefined (select the '' option)
-            selected = cf_initial.get(cf.id)
-            if selected is None:
-                selected = ''  # Mark as undefined
-            cf_list.append({'cf': cf, 'answers': answers_with_undefined, 'selected': selected})
-        cost_sections_data.append({'section': cs, 'costfactors': cf_list})
+def _submitted_answers(post, kind):
+    """Collect the submitted answer per factor from the form fields.
     
-    # Get current dependencies
-    dependencies = story.dependencies.select_related('depends_on').all()
+    Reads the ``<prefix><factor id>`` keys present in the POST data. The
+    factor IDs are not checked here: callers validate them against the
+    factors (or answers) they load for the submitted IDs, so a factor added
+    since any cached ID set was built is still accepted.
     
-    # Get stories that depend on this story (dependents)
-    dependents = story.dependents.select_related('story').all()
-    
-    # Get available stories for dependency picker
-    other_stories = Story.objects.exclude(pk=story.pk).order_by('title')
-    
-    if request.method == "POST":
-        action = request.POST.get("action")
+    Args:
+        post: The request's POST data
+        kind: Entry of _SCORE_KINDS to read
         
-        # Handle dependency actions
-        if action == "add_dependency":
-            dep_story_id = request.POST.get("dependency_story_id")
-            if dep_story_id:
-                dep_story = get_object_or_404(Story, pk=dep_story_id)
-                if dep_story.pk != story.pk:
-                    created = StoryDependency.objects.get_or_create(story=story, depends_on=dep_story)[1]
-                    if created:
-                        track_story_change(story, 'Dependency added', None, dep_story.title)
-            return redirect(request.path)
+    Returns:
+        Dict mapping factor_id -> stripped answer value ('' for undefined)
+    """
+    prefix_len = len(kind.prefix)
+    return {
+        int(key[prefix_len:]): value.strip()
+        for key, value in post.items()
+        if key.startswith(kind.prefix) and key[prefix_len:].isdigit()
+    }
+
+
+def _load_submitted_answers(kind, submitted):
+    """Bulk-load the answers chosen in `submitted`, keyed by factor id.
+    
+    Answers that do not exist or belong to another factor are left out.
+    """
+    chosen = {factor_id: int(value) for factor_id, value in submitted.items() if value.isdigit()}
+    if not chosen:
+        return {}
+    factor_id_attr = f'{kind.factor_field}_id'
+    answers = kind.answer_model.objects.in_bulk(list(chosen.values()))
+    return {
+        factor_id: answers[answer_id]
+        for factor_id, answer_id in chosen.items()
+        if answer_id in answers and getattr(answers[answer_id], factor_id_attr) == factor_id
+    }
+
+
+def _save_submitted_scores(story, post):
+    """Persist the value/cost answers submitted from the refine form.
+    
+    Loads the submitted factors, answers and the story's existing scores in
+    one query each, and writes the changes with ``bulk_update`` /
+    ``bulk_create``. An empty value resets the score to undefined; answers
+    that do not belong to the factor are ignored. Score changes are recorded
+    in the story history.
+    
+    Args:
+        story: The Story being refined
+        post: The request's POST data
         
-        if action == "remove_dependency":
-            dep_id = request.POST.get("dependency_id")
-            if dep_id:
-                dep = StoryDependency.objects.filter(pk=dep_id, story=story).first()
-                if dep:
-                    track_story_change(story, 'Dependency removed', dep.depends_on.title, None)
-                    dep.delete()
-            return redirect(request.path)
+    Returns:
+        True if any score row was written
+    """
+    changes = []
+    written = False
+    for kind in _SCORE_KINDS:
+        submitted = _submitted_answers(post, kind)
+        if not submitted:
+            continue
         
-        if action == "archive_story":
-            track_story_change(story, 'Archived', 'No', 'Yes')
-            story.archived = True
-            story.save()
-            return redirect('backlog:stories')
+        factor_id_attr = f'{kind.factor_field}_id'
+        factors = kind.factor_model.objects.only('id', 'name').in_bulk(list(submitted))
+        answers = _load_submitted_answers(kind, submitted)
+        existing = {
+            getattr(score, factor_id_attr): score
+            for score in kind.score_model.objects.filter(
+                story=story, **{f'{kind.factor_field}__in': list(factors)}
+            ).select_related('answer')
+        }
         
-        if action == "unarchive_story":
-            track_story_change(story, 'Archived', 'Yes', 'No')
-            story.archived = False
-            story.save()
-            return redirect(request.path)
+        to_update = []
+        to_create = []
+        for factor_id, ans_value in submitted.items():
+            factor = factors.get(factor_id)
+            if factor is None:
+                continue
+            current = existing.get(factor_id)
+            old_score_str = f"{current.answer.score}" if current and current.answer else 'Undefined'
+            
+            if not ans_value:
+                # Undefined selected - set answer to None
+                if current and current.answer:
+                    changes.append((f'{kind.label}: {factor.name}', old_score_str, 'Undefined'))
+                    current.answer = None
+                    to_update.append(current)
+                continue
+            answer = answers.get(factor_id)
+            if answer is None:
+                continue
+            changes.append((f'{kind.label}: {factor.name}', old_score_str, f"{answer.score}"))
+            if current is None:
+                to_create.append(kind.score_model(story=story, answer=answer, **{kind.factor_field: factor}))
+            elif current.answer_id != answer.id:
+                current.answer = answer
+                to_update.append(current)
         
-        if action == "toggle_review":
-            old_val = 'Yes' if story.review_required else 'No'
-            story.review_required = not story.review_required
-            new_val = 'Yes' if story.review_required else 'No'
-            track_story_change(story, 'Review required', old_val, new_val)
-            story.save()
-            return redirect(request.path)
+        if to_update:
+            kind.score_model.objects.bulk_update(to_update, ['answer'])
+        if to_create:
+            kind.score_model.objects.bulk_create(to_create, ignore_conflicts=True)
+        written = written or bool(to_update or to_create)
+    
+    track_story_changes(story, changes)
+    return written
+
+
+def _save_initial_scores(story, post):
+    """Persist the value/cost answers submitted when creating a story.
+    
+    Undefined answers delete the score row created by the story signal;
+    chosen answers are written with ``bulk_update`` / ``bulk_create``.
+    
+    Args:
+        story: The newly created Story
+        post: The request's POST data
         
-        # Check if remove_blocked button was clicked
-        if request.POST.get("remove_blocked"):
-            track_story_change(story, 'Blocked', story.blocked, '')
-            story.blocked = ""
-            story.save()
-            return redirect(request.path)
+    Returns:
+        True if any score row was written or deleted
+    """
+    written = False
+    for kind in _SCORE_KINDS:
+        submitted = _submitted_answers(post, kind)
+        if not submitted:
+            continue
         
-        # Store old values for tracking
-        old_title = story.title
-        old_goal = story.goal
-        old_workitems = story.workitems
-        old_blocked = story.blocked
+        factor_field_in = f'{kind.factor_field}__in'
+        undefined = [factor_id for factor_id, value in submitted.items() if not value]
+        if undefined:
+            # Undefined selected - delete the score (if it exists from signal)
+            deleted = kind.score_model.objects.filter(story=story, **{factor_field_in: undefined}).delete()[0]
+            written = written or bool(deleted)
         
-        # allow updating title here (refinement)
-        title = request.POST.get("title")
-        if title is not None:
-            story.title = title.strip()
+        answers = _load_submitted_answers(kind, submitted)
+        if not answers:
+            continue
+        factor_id_attr = f'{kind.factor_field}_id'
+        to_update = list(kind.score_model.objects.filter(story=story, **{factor_field_in: list(answers)}))
+        for score in to_update:
+            score.answer = answers[getattr(score, factor_id_attr)]
+        existing_ids = {getattr(score, factor_id_attr) for score in to_update}
+        to_create = [
+            kind.score_model(story=story, answer=answer, **{factor_id_attr: factor_id})
+            for factor_id, answer in answers.items()
+            if factor_id not in existing_ids
+        ]
+        if to_update:
+            kind.score_model.objects.bulk_update(to_update, ['answer'])
+        if to_create:
+            kind.score_model.objects.bulk_create(to_create, ignore_conflicts=True)
+        written = True
+    return written
 
-        story.goal = request.POST.get("goal", story.goal)
-        story.workitems = request.POST.get("workitems", story.workitems)
-        
-        # Handle blocked field
-        story.blocked = request.POST.get("blocked", "").strip()
+
+# Bulk actions that only set one flag: action -> (field, value, success message)
+_BULK_UPDATE_ACTIONS = {
+    'set_review': ('review_required', True, '🚩 Set review required on {count} stories.'),
+    'clear_review': ('review_required', False, '✅ Cleared review flag from {count} stories.'),
+    'archive': ('archived', True, '📦 Archived {count} stories.'),
+    'unarchive': ('archived', False, '📤 Unarchived {count} stories.'),
+}
+
+
+def _with_linked_status(queryset, story_field):
+    """Annotate StoryDependency rows with the computed status of one side.
+    
+    Args:
+        queryset: StoryDependency queryset
+        story_field: 'depends_on' or 'story', the side whose status is needed
         
-        # Track text field changes
-        track_story_change(story, 'Title', old_title, story.title)
-        track_story_change(story, 'Goal', old_goal, story.goal)
-        track_story_change(story, 'Work items', old_workitems, story.workitems)
-        track_story_change(story, 'Blocked', old_blocked, story.blocked)
+    Returns:
+        The queryset with a `linked_status` annotation
+    """
+    status = Story.with_status(
+        Story.objects.filter(pk=OuterRef(f'{story_field}_id'))
+    ).values('annotated_status')[:1]
+    return queryset.annotate(linked_status=Subquery(status))
+
+
+def _load_factor_tree():
+    """Load the sections -> factors -> answers tree shown on the refine form.
+    
+    Returns:
+        Tuple of (version, value_tree, cost_tree). version is a stamp taken
+        at load time, so it changes whenever the tree is rebuilt; each tree
+        is a list of (section, [(factor, answers_with_undefined), ...]) with
+        answers ordered by score after the leading 'Undefined' option
+    """
+    def build(section_model, factors_attr, answer_model):
+        sections = section_model.objects.prefetch_related(
+            Prefetch(f'{factors_attr}__answers', queryset=answer_model.objects.order_by('score'))
+        ).order_by('name')
+        return [
+            (section, [
+                (factor, [_UNDEFINED_ANSWER, *factor.answers.all()])
+                for factor in getattr(section, factors_attr).all()
+            ])
+            for section in sections
+        ]
+    
+    return (
+        time.time_ns(),
+        build(ValueFactorSection, 'valuefactors', ValueFactorAnswer),
+        build(CostFactorSection, 'costfactors', CostFactorAnswer),
+    )
+
+
+def _get_factor_tree():
+    """Return the refine form's factor tree, cached until factors change."""
+    return cache.get_or_set(REFINE_FACTOR_TREE_CACHE_KEY, _load_factor_tree, _FACTOR_TREE_CACHE_TIMEOUT)
+
+
+def _scoring_cache_key(tree_version, vf_initial, cf_initial):
+    """Cache key of the rendered scoring grid for a tree version and selection.
+    
+    Undefined answers are left out, so every story without answers shares
+    the key of the create page.
+    """
+    selection = repr((
+        sorted((fid, aid) for fid, aid in vf_initial.items() if aid is not None),
+        sorted((fid, aid) for fid, aid in cf_initial.items() if aid is not None),
+    ))
+    return f"{tree_version}:{hashlib.md5(selection.encode()).hexdigest()}"
+
+
+def _build_sections_data(tree, factors_key, factor_key, selected_answers):
+    """Overlay a story's selected answers on the cached factor tree.
+    
+    Args:
+        tree: Value or cost tree from _get_factor_tree()
+        factors_key: Template key for the section's factors ('valuefactors'/'costfactors')
+        factor_key: Template key for each factor ('vf'/'cf')
+        selected_answers: Dict mapping factor_id -> answer_id (None for undefined)
         
-        story.save()
-        # Persist selected answers for each ValueFactor submitted from the form
-        for vf in ValueFactor.objects.all():
-            field_name = f"vf_{vf.id}"
-            if field_name not in request.POST:
-                continue
-            ans_value = request.POST.get(field_name, '').strip()
+    Returns:
+        List of section dicts as used by refine.html; '' marks an undefined answer
+    """
+    sections_data = []
+    for section, factors in tree:
+        factor_list = []
+        for factor, answers in factors:
+            selected = selected_answers.get(factor.id)
+            if selected is None:
+                selected = ''  # Mark as undefined
+            factor_list.append({factor_key: factor, 'answers': answers, 'selected': selected})
+        sections_data.append({'section': section, factors_key: factor_list})
+    return sections_data
+
+
+def refine_story(request, pk):
+    """Refine an existing story with full editing capabilities.
+    
+    This view allows editing:
+    - Basic info: title, goal, workitems
+    - Value/cost factor scores
+    - Dependencies on other stories
+    - Archive/unarchive and review flags
+    
+    Also displays story history and dependent stories.
+    """
+    if request.method == "POST":
+        # Apply the whole save in one transaction with the story row locked
+        # against concurrent edits; history entries are queued and inserted
+        # in one batch before it commits
+        with transaction.atomic(), collect_history():
+            story = get_object_or_404(Story.objects.select_for_update(), pk=pk)
+            action = request.POST.get("action")
             
-            # Get current score for tracking
-            current_score = StoryValueFactorScore.objects.filter(story=story, valuefactor=vf).first()
-            old_score_str = f"{current_score.answer.score}" if current_score and current_score.answer else 'Undefined'
+            # Handle dependency actions
+            if action == "add_dependency":
+                dep_story_id = request.POST.get("dependency_story_id", "")
+                if dep_story_id:
+                    # Only the title is needed (for history); no Story instance is loaded
+                    dep_title = None
+                    if dep_story_id.isdigit():
+                        dep_title = Story.objects.filter(pk=dep_story_id).values_list('title', flat=True).first()
+                    if dep_title is None:
+                        raise Http404("No Story matches the given query.")
+                    dep_story_id = int(dep_story_id)
+                    if dep_story_id != story.pk:
+                        # Refuse edges that would make the dependencies circular
+                        if StoryDependency.would_create_cycle(story.pk, dep_story_id):
+                            messages.warning(request, f'⚠️ "{dep_title}" already depends on this story.')
+                        else:
+                            created = StoryDependency.objects.get_or_create(
+                                story=story, depends_on_id=dep_story_id
+                            )[1]
+                            if created:
+                                track_story_change(story, 'Dependency added', None, dep_title)
+                return HttpResponseRedirect(request.path)
             
-            if not ans_value or ans_value == '':
-                # Undefined selected - set answer to None
-                if current_score and current_score.answer:
-                    track_story_change(story, f'Value: {vf.name}', old_score_str, 'Undefined')
-                    current_score.answer = None
-                    current_score.save()
-                continue
-            try:
-                ans_id = int(ans_value)
-                answer = ValueFactorAnswer.objects.filter(id=ans_id, valuefactor=vf).first()
-            except Exception:
-                answer = None
-            if answer:
-                new_score_str = f"{answer.score}"
-                if old_score_str != new_score_str:
-                    track_story_change(story, f'Value: {vf.name}', old_score_str, new_score_str)
-                StoryValueFactorScore.objects.update_or_create(
-                    story=story, valuefactor=vf, defaults={"answer": answer}
-                )
+            if action == "remove_dependency":
+                dep_id = request.POST.get("dependency_id")
+                if dep_id:
+                    deps = StoryDependency.objects.filter(pk=dep_id, story=story)
+                    dep_title = deps.values_list('depends_on__title', flat=True).first()
+                    if dep_title is not None:
+                        track_story_change(story, 'Dependency removed', dep_title, None)
+                        deps.delete()
+                return HttpResponseRedirect(request.path)
+            
+            if action == "archive_story":
+                track_story_change(story, 'Archived', 'No', 'Yes')
+                story.archived = True
+                story.save(update_fields=['archived', 'updated_at'])
+                return redirect('backlog:stories')
+            
+            if action == "unarchive_story":
+                track_story_change(story, 'Archived', 'Yes', 'No')
+                story.archived = False
+                story.save(update_fields=['archived', 'updated_at'])
+                return HttpResponseRedirect(request.path)
+            
+            if action == "toggle_review":
+                old_val = 'Yes' if story.review_required else 'No'
+                story.review_required = not story.review_required
+                new_val = 'Yes' if story.review_required else 'No'
+                track_story_change(story, 'Review required', old_val, new_val)
+                story.save(update_fields=['review_required', 'updated_at'])
+                return HttpResponseRedirect(request.path)
+            
+            # Check if remove_blocked button was clicked
+            if request.POST.get("remove_blocked"):
+                track_story_change(story, 'Blocked', story.blocked, '')
+                story.blocked = ""
+                story.save(update_fields=['blocked', 'updated_at'])
+                return HttpResponseRedirect(request.path)
+            
+            # Store old values for tracking
+            old_title = story.title
+            old_goal = story.goal
+            old_workitems = story.workitems
+            old_blocked = story.blocked
+            
+            # allow updating title here (refinement)
+            title = request.POST.get("title")
+            if title is not None:
+                story.title = title.strip()
 
-        # Persist selected answers for each CostFactor
-        for cf in CostFactor.objects.all():
-            field_name = f"cf_{cf.id}"
-            if field_name not in request.POST:
-                continue
-            ans_value = request.POST.get(field_name, '').strip()
+            story.goal = request.POST.get("goal", story.goal)
+            story.workitems = request.POST.get("workitems", story.workitems)
             
-            # Get current score for tracking
-            current_score = StoryCostFactorScore.objects.filter(story=story, costfactor=cf).first()
-            old_score_str = f"{current_score.answer.score}" if current_score and current_score.answer else 'Undefined'
+            # Handle blocked field
+            story.blocked = request.POST.get("blocked", "").strip()
             
-            if not ans_value or ans_value == '':
-                # Undefined selected - set answer to None
-                if current_score and current_score.answer:
-                    track_story_change(story, f'Cost: {cf.name}', old_score_str, 'Undefined')
-                    current_score.answer = None
-                    current_score.save()
-                continue
-            try:
-                ans_id = int(ans_value)
-                answer = CostFactorAnswer.objects.filter(id=ans_id, costfactor=cf).first()
-            except Exception:
-                answer = None
-            if answer:
-                new_score_str = f"{answer.score}"
-                if old_score_str != new_score_str:
-                    track_story_change(story, f'Cost: {cf.name}', old_score_str, new_score_str)
-                StoryCostFactorScore.objects.update_or_create(
-                    story=story, costfactor=cf, defaults={"answer": answer}
+            # Track and write only the changed text fields (status follows
+            # goal/workitems); skip the UPDATE entirely when nothing changed
+            changed = [
+                (field, label, old_value) for field, label, old_value in (
+                    ('title', 'Title', old_title),
+                    ('goal', 'Goal', old_goal),
+                    ('workitems', 'Work items', old_workitems),
+                    ('blocked', 'Blocked', old_blocked),
                 )
-        
-        # Handle labels
-        old_labels = set(story.labels.values_list('id', flat=True))
-        new_label_ids = request.POST.getlist('labels')
-        new_labels = set()
-        for lid in new_label_ids:
-            try:
-                new_labels.add(int(lid))
-            except (ValueError, TypeError):
-                pass
-        
-        if old_labels != new_labels:
-            # Track label changes
-            old_label_names = sorted([l.name for l in Label.objects.filter(id__in=old_labels)])
-            new_label_names = sorted([l.name for l in Label.objects.filter(id__in=new_labels)])
-            track_story_change(
-                story, 
-                'Labels', 
-                ', '.join(old_label_names) or '(none)',
-                ', '.join(new_label_names) or '(none)'
-            )
-            story.labels.set(new_labels)
-        
-        messages.success(request, f'✅ Story "{story.title}" has been updated successfully.')
-        # Redirect to next URL if provided, otherwise to story detail
-        next_url = request.POST.get('next', '').strip()
-        if next_url:
-            return redirect(next_url)
-        return redirect('backlog:story_detail', pk=story.pk)
+                if getattr(story, field) != old_value
+            ]
+            if changed:
+                track_story_changes(story, [
+                    (label, old_value, getattr(story, field)) for field, label, old_value in changed
+                ])
+                story.save(update_fields=[*(field for field, _, _ in changed), 'status', 'updated_at'])
+            
+            # Persist selected answers for each value/cost factor submitted from the form
+            if _save_submitted_scores(story, request.POST):
+                # bulk writes send no signals, so invalidate cached reports here
+                bump_report_cache_version()
+            
+            # Handle labels
+            old_labels = set(story.labels.values_list('id', flat=True))
+            new_labels = set(_parse_ids(request.POST.getlist('labels')))
+            
+            if old_labels != new_labels:
+                # Track label changes
+                # Names of the old and new labels from one query
+                label_names = dict(
+                    Label.objects.filter(id__in=old_labels | new_labels).values_list('id', 'name')
+                )
+                old_label_names = sorted(name for lid, name in label_names.items() if lid in old_labels)
+                new_label_names = sorted(name for lid, name in label_names.items() if lid in new_labels)
+                track_story_change(
+                    story, 
+                    'Labels', 
+                    ', '.join(old_label_names) or '(none)',
+                    ', '.join(new_label_names) or '(none)'
+                )
+                story.labels.set(new_labels)
+            
+            messages.success(request, f'✅ Story "{story.title}" has been updated successfully.')
+            # Redirect to next URL if provided, otherwise to story detail
+            next_url = request.POST.get('next', '').strip()
+            if next_url:
+                return redirect(next_url)
+            return redirect('backlog:story_detail', pk=story.pk)
 
-    # Get history for this story
-    history = story.history.all()[:50]  # Limit to last 50 entries
+    story = get_object_or_404(Story, pk=pk)
+    # GET only from here on (every POST above redirects), so saves skip
+    # loading the form data. Build initial selected answer maps
+    # (answer_id or None for undefined)
+    vf_initial = {sv.valuefactor_id: sv.answer_id for sv in story.scores.all()}
+    cf_initial = {sv.costfactor_id: sv.answer_id for sv in story.cost_scores.all()}
+
+    # Build structured data for templates: sections -> factors -> answers + selected id
+    tree_version, value_tree, cost_tree = _get_factor_tree()
+    value_sections_data = _build_sections_data(value_tree, 'valuefactors', 'vf', vf_initial)
+    cost_sections_data = _build_sections_data(cost_tree, 'costfactors', 'cf', cf_initial)
+    scoring_cache_key = _scoring_cache_key(tree_version, vf_initial, cf_initial)
+    
+    # Get current dependencies and the stories that depend on this story
+    # (dependents), each with the linked story's title and its status computed
+    # in the same query
+    dependencies = _with_linked_status(
+        story.dependencies.select_related('depends_on').only('id', 'story_id', 'depends_on__title'),
+        'depends_on',
+    )
+    dependents = _with_linked_status(
+        story.dependents.select_related('story').only('id', 'depends_on_id', 'story__title'),
+        'story',
+    )
     
-    # Get all labels grouped by category
-    label_categories = LabelCategory.objects.prefetch_related('labels').order_by('name')
-    story_labels = set(story.labels.values_list('id', flat=True))
+    # Get available stories for dependency picker as plain rows, with the
+    # status computed in the same query
+    other_stories = Story.with_status(Story.objects.exclude(pk=story.pk)).values(
+        'id', 'title', 'annotated_status'
+    ).order_by('title')
+    
+    # Get history for this story: last 50 entries, newest first (served by
+    # the story/changed_at index), with only the displayed columns
+    history = story.history.order_by('-changed_at').only(*_HISTORY_FIELDS)[:50]
+    
+    # Get all labels grouped by category; the label prefetch also flags the
+    # story's labels, so no separate story.labels query is needed
+    story_label_rows = Story.labels.through.objects.filter(story_id=story.pk, label_id=OuterRef('pk'))
+    label_categories = list(LabelCategory.objects.prefetch_related(
+        Prefetch('labels', queryset=Label.objects.annotate(selected=Exists(story_label_rows)))
+    ).order_by('name'))
+    story_labels = {label.id for cat in label_categories for label in cat.labels.all() if label.selected}
     
     # Get next URL from query param for back link
     next_url = request.GET.get('next', '').strip()
-    back_url = reverse('backlog:stories')
+    back_url = _stories_url()
 
     return render(
         request,
@@ -272,6 +547,7 @@ def refine_story(request, pk):
             "story": story,
             "value_sections": value_sections_data,
             "cost_sections": cost_sections_data,
+            "scoring_cache_key": scoring_cache_key,
             "dependencies": dependencies,
             "dependents": dependents,
             "other_stories": other_stories,
@@ -290,43 +566,24 @@ def create_story_refine(request):
     On GET: render the same `refine.html` but with an unsaved Story-like object.
     On POST: create the story and redirect to overview.
     """
-    # factor sections for scoring UI (useful for preselecting defaults)
-    value_sections = ValueFactorSection.objects.prefetch_related("valuefactors__answers").order_by("name")
-    cost_sections = CostFactorSection.objects.prefetch_related("costfactors__answers").order_by("name")
-
-    # build defaults structure for template
-    value_sections_data = []
-    for vs in value_sections:
-        vf_list = []
-        for vf in vs.valuefactors.all():
-            answers = list(vf.answers.order_by('score'))
-            # Add undefined option (default for new stories)
-            answers_with_undefined = [{'id': '', 'score': '—', 'description': 'Undefined'}] + answers
-            selected = ''  # Default to undefined for new stories
-            vf_list.append({'vf': vf, 'answers': answers_with_undefined, 'selected': selected})
-        value_sections_data.append({'section': vs, 'valuefactors': vf_list})
-
-    cost_sections_data = []
-    for cs in cost_sections:
-        cf_list = []
-        for cf in cs.costfactors.all():
-            answers = list(cf.answers.order_by('score'))
-            # Add undefined option (default for new stories)
-            answers_with_undefined = [{'id': '', 'score': '—', 'description': 'Undefined'}] + answers
-            selected = ''  # Default to undefined for new stories
-            cf_list.append({'cf': cf, 'answers': answers_with_undefined, 'selected': selected})
-        cost_sections_data.append({'section': cs, 'costfactors': cf_list})
+    # factor sections for scoring UI; new stories default to undefined answers
+    tree_version, value_tree, cost_tree = _get_factor_tree()
+    value_sections_data = _build_sections_data(value_tree, 'valuefactors', 'vf', _NO_SELECTION)
+    cost_sections_data = _build_sections_data(cost_tree, 'costfactors', 'cf', _NO_SELECTION)
+    scoring_cache_key = _scoring_cache_key(tree_version, _NO_SELECTION, _NO_SELECTION)
     if request.method == "POST":
         title = request.POST.get("title", "").strip()
         goal = request.POST.get("goal", "").strip()
         workitems = request.POST.get("workitems", "").strip()
         
         if title:
-            # Create story with all fields
+            # Create story with all fields (started/finished are read-only
+            # and not set on creation)
             story = Story.objects.create(
                 title=title,
                 goal=goal,
-                workitems=workitems
+                workitems=workitems,
+                blocked=request.POST.get("blocked", "").strip(),
             )
             
             # Track story creation
@@ -337,67 +594,22 @@ def create_story_refine(request):
                 new_value=f'Created: {title}'
             )
             
-            # Handle blocked field (started/finished are read-only and not set on creation)
-            story.blocked = request.POST.get("blocked", "").strip()
-            story.save()
-            
             # Persist any selected answers that were submitted on creation
-            for vf in ValueFactor.objects.all():
-                field_name = f"vf_{vf.id}"
-                if field_name not in request.POST:
-                    continue
-                ans_value = request.POST.get(field_name, '').strip()
-                if not ans_value or ans_value == '':
-                    # Undefined selected - delete the score (if it exists from signal)
-                    StoryValueFactorScore.objects.filter(story=story, valuefactor=vf).delete()
-                    continue
-                try:
-                    ans_id = int(ans_value)
-                    answer = ValueFactorAnswer.objects.filter(id=ans_id, valuefactor=vf).first()
-                except Exception:
-                    answer = None
-                if answer:
-                    StoryValueFactorScore.objects.update_or_create(
-                        story=story, valuefactor=vf, defaults={"answer": answer}
-                    )
-
-            for cf in CostFactor.objects.all():
-                field_name = f"cf_{cf.id}"
-                if field_name not in request.POST:
-                    continue
-                ans_value = request.POST.get(field_name, '').strip()
-                if not ans_value or ans_value == '':
-                    # Undefined selected - delete the score (if it exists from signal)
-                    StoryCostFactorScore.objects.filter(story=story, costfactor=cf).delete()
-                    continue
-                try:
-                    ans_id = int(ans_value)
-                    answer = CostFactorAnswer.objects.filter(id=ans_id, costfactor=cf).first()
-                except Exception:
-                    answer = None
-                if answer:
-                    StoryCostFactorScore.objects.update_or_create(
-                        story=story, costfactor=cf, defaults={"answer": answer}
-                    )
+            if _save_initial_scores(story, request.POST):
+                # bulk writes send no signals, so invalidate cached reports here
+                bump_report_cache_version()
 
             # Handle labels on creation
-            new_label_ids = request.POST.getlist('labels')
-            if new_label_ids:
-                label_ids = []
-                for lid in new_label_ids:
-                    try:
-                        label_ids.append(int(lid))
-                    except (ValueError, TypeError):
-                        pass
-                if label_ids:
-                    story.labels.set(label_ids)
-                    label_names = sorted([l.name for l in Label.objects.filter(id__in=label_ids)])
-                    StoryHistory.objects.create(
-                        story=story,
-                        field_name='Labels',
-                        old_value='(none)',
-                        new_value=', '.join(label_names)
-                    )
+            label_ids = _parse_ids(request.POST.getlist('labels'))
+            if label_ids:
+                story.labels.set(label_ids)
+                label_names = sorted([l.name for l in Label.objects.filter(id__in=label_ids)])
+                StoryHistory.objects.create(
+                    story=story,
+                    field_name='Labels',
+                    old_value='(none)',
+                    new_value=', '.join(label_names)
+                )
 
             messages.success(request, f'✅ Story "{story.title}" has been created successfully.')
             # Redirect to next URL if provided, otherwise to story detail
@@ -427,15 +639,10 @@ def create_story_refine(request):
             story = _S()
             # Preserve next_url on validation error
             next_url = request.POST.get('next', '').strip()
-            back_url = reverse('backlog:stories')
+            back_url = _stories_url()
             # Get labels for the form, preserving selection
             label_categories = LabelCategory.objects.prefetch_related('labels').order_by('name')
-            story_labels = set()
-            for lid in request.POST.getlist('labels'):
-                try:
-                    story_labels.add(int(lid))
-                except (ValueError, TypeError):
-                    pass
+            story_labels = set(_parse_ids(request.POST.getlist('labels')))
             return render(
                 request,
                 "backlog/refine.html",
@@ -443,6 +650,7 @@ def create_story_refine(request):
                     "story": story,
                     "value_sections": value_sections_data,
                     "cost_sections": cost_sections_data,
+                    "scoring_cache_key": scoring_cache_key,
                     "label_categories": label_categories,
                     "story_labels": story_labels,
                     "next_url": next_url,
@@ -466,7 +674,7 @@ def create_story_refine(request):
     
     # Get next URL from query param for back link
     next_url = request.GET.get('next', '').strip()
-    back_url = reverse('backlog:stories')
+    back_url = _stories_url()
     
     # Get all labels grouped by category
     label_categories = LabelCategory.objects.prefetch_related('labels').order_by('name')
@@ -479,6 +687,7 @@ def create_story_refine(request):
             "story": story,
             "value_sections": value_sections_data,
             "cost_sections": cost_sections_data,
+            "scoring_cache_key": scoring_cache_key,
             "label_categories": label_categories,
             "story_labels": story_labels,
             "next_url": next_url,
@@ -495,34 +704,28 @@ def story_list(request):
     - Search by title, goal, or workitems
     - Sort by title, epic, created date, or status
     - Toggle between active and archived stories
+    - Pagination (50 stories per page)
     - Inline archive/unarchive/delete actions
     """
     # Handle POST actions for archiving
     if request.method == "POST":
         action = request.POST.get('action')
-        if action == 'archive_story':
-            sid = request.POST.get('story_id')
-            story = get_object_or_404(Story, pk=sid)
-            story.archived = True
-            story.save()
-            return redirect(request.get_full_path())
-        if action == 'unarchive_story':
-            sid = request.POST.get('story_id')
-            story = get_object_or_404(Story, pk=sid)
-            story.archived = False
-            story.save()
-            return redirect(request.get_full_path())
-        if action == 'toggle_review':
-            sid = request.POST.get('story_id')
-            story = get_object_or_404(Story, pk=sid)
-            story.review_required = not story.review_required
-            story.save()
-            return redirect(request.get_full_path())
+        # Single-row UPDATE/DELETE by id, without loading the story first
+        story_qs = Story.objects.filter(pk=request.POST.get('story_id'))
         if action == 'delete_story':
-            sid = request.POST.get('story_id')
-            story = get_object_or_404(Story, pk=sid)
-            story.delete()
-            return redirect(request.get_full_path())
+            if not story_qs.delete()[0]:
+                raise Http404("No Story matches the given query.")
+            return HttpResponseRedirect(request.get_full_path())
+        updates = {
+            'archive_story': {'archived': True},
+            'unarchive_story': {'archived': False},
+            'toggle_review': {'review_required': ~F('review_required')},
+        }.get(action)
+        if updates is not None:
+            if not story_qs.update(**updates, updated_at=timezone.now()):
+                raise Http404("No Story matches the given query.")
+            bump_report_cache_version()  # update() sends no signals
+            return HttpResponseRedirect(request.get_full_path())
     
     # Get label filter context
     label_filter_ctx = get_label_filter_context(request)
@@ -537,7 +740,14 @@ def story_list(request):
     # provide list of possible statuses
     all_statuses = ['idea', 'ready', 'planned', 'started', 'done', 'blocked']
 
-    qs = Story.objects.prefetch_related('scores', 'cost_scores', 'labels__category')
+    # Status and score completeness are computed in SQL, so no scores are loaded
+    qs = Story.with_scores_complete(Story.with_status(Story.objects.prefetch_related('labels__category')))
+    # Details are complete when title, goal and work items are non-blank
+    # (the trimmed columns are annotated by with_status)
+    qs = qs.annotate(details_complete=ExpressionWrapper(
+        ~Q(_title_trim='') & ~Q(_goal_trim='') & ~Q(_workitems_trim=''),
+        output_field=BooleanField(),
+    ))
     
     # Filter by archived status
     qs = qs.filter(archived=show_archived)
@@ -548,6 +758,14 @@ def story_list(request):
     if q:
         qs = qs.filter(Q(title__icontains=q) | Q(goal__icontains=q) | Q(workitems__icontains=q))
 
+    # Filter by computed status and review flag in the database
+    if status_filter:
+        qs = qs.filter(annotated_status=status_filter)
+    if review_filter == 'yes':
+        qs = qs.filter(review_required=True)
+    elif review_filter == 'no':
+        qs = qs.filter(review_required=False)
+
     sort_map = {
         'title': 'title',
         'created': 'created_at',
@@ -557,51 +775,35 @@ def story_list(request):
     if order == 'desc':
         sort_field = '-' + sort_field
 
-    qs = qs.order_by(sort_field)
-    stories = list(qs)
+    if sort == 'status':
+        # Sort by computed status, keeping the stored status as tie-breaker
+        status_field = '-annotated_status' if order == 'desc' else 'annotated_status'
+        qs = qs.order_by(status_field, sort_field)
+    else:
+        qs = qs.order_by(sort_field)
     
-    # Filter by computed_status (must be done after fetching since it's a property)
-    if status_filter:
-        stories = [s for s in stories if s.computed_status == status_filter]
+    # Only the requested page of stories is loaded and enriched
+    page_obj = Paginator(qs, _STORIES_PER_PAGE).get_page(request.GET.get('page'))
+    stories = page_obj.object_list
     
-    # Filter by review_required
-    if review_filter == 'yes':
-        stories = [s for s in stories if s.review_required]
-    elif review_filter == 'no':
-        stories = [s for s in stories if not s.review_required]
+    # Current query string without the page number, for the page links
+    page_params = request.GET.copy()
+    page_params.pop('page', None)
     
-    # Sort by status if requested (must be done after fetching since it's a property)
-    if sort == 'status':
-        stories.sort(key=lambda s: s.computed_status, reverse=(order == 'desc'))
-    
-    # Get all value and cost factors for completeness check
-    all_value_factors = list(ValueFactor.objects.all())
-    all_cost_factors = list(CostFactor.objects.all())
-    
-    # Add completeness info to each story
-    story_data = []
-    for s in stories:
-        # Check if all details are filled
-        has_title = bool(s.title and s.title.strip())
-        has_goal = bool(s.goal and s.goal.strip())
-        has_workitems = bool(s.workitems and s.workitems.strip())
-        details_complete = has_title and has_goal and has_workitems
-        
-        # Check if all scores are set
-        story_vf_ids = set(score.valuefactor_id for score in s.scores.all())
-        story_cf_ids = set(score.costfactor_id for score in s.cost_scores.all())
-        all_vf_ids = set(vf.id for vf in all_value_factors)
-        all_cf_ids = set(cf.id for cf in all_cost_factors)
-        scores_complete = (story_vf_ids >= all_vf_ids) and (story_cf_ids >= all_cf_ids)
-        
-        story_data.append({
+    # Completeness flags come from the annotations; rows are only wrapped
+    story_data = [
+        {
             'story': s,
-            'details_complete': details_complete,
-            'scores_complete': scores_complete,
-        })
+            'details_complete': s.details_complete,
+            'scores_complete': s.scores_complete,
+        }
+        for s in stories
+    ]
     
     context = {
         'stories': story_data,
+        'page_obj': page_obj,
+        'page_query': page_params.urlencode(),
         'q': q,
         'sort': sort,
         'order': order,
@@ -635,99 +837,104 @@ def bulk_action(request):
     """
     action = request.POST.get('action', '')
     story_ids_str = request.POST.get('story_ids', '')
-    next_url = request.POST.get('next', reverse('backlog:stories'))
+    next_url = request.POST.get('next') or _stories_url()
     
     # Parse story IDs
-    story_ids = []
-    for sid in story_ids_str.split(','):
-        try:
-            story_ids.append(int(sid.strip()))
-        except (ValueError, TypeError):
-            pass
+    story_ids = _parse_ids(story_ids_str.split(','))
     
     if not story_ids:
         messages.warning(request, '⚠️ No stories selected.')
         return redirect(next_url)
     
     stories = Story.objects.filter(id__in=story_ids)
-    count = stories.count()
+    
+    # Flag-only actions are a single UPDATE whose row count is the story count
+    if action in _BULK_UPDATE_ACTIONS:
+        field, value, message = _BULK_UPDATE_ACTIONS[action]
+        count = stories.update(**{field: value})
+        if count == 0:
+            messages.warning(request, '⚠️ No valid stories found.')
+            return redirect(next_url)
+        bump_report_cache_version()  # update() sends no signals
+        messages.success(request, message.format(count=count))
+        return redirect(next_url)
+    
+    if action == 'delete':
+        count = stories.delete()[1].get(Story._meta.label, 0)
+        if count == 0:
+            messages.warning(request, '⚠️ No valid stories found.')
+        else:
+            messages.success(request, f'🗑️ Deleted {count} stories.')
+        return redirect(next_url)
+    
+    if action == 'set_blocked':
+        blocked_reason = request.POST.get('blocked_reason', '').strip()
+        if not blocked_reason:
+            messages.warning(request, '⚠️ No blocked reason provided.')
+            return redirect(next_url)
+        rows = list(stories.values_list('id', 'blocked'))
+        if not rows:
+            messages.warning(request, '⚠️ No valid stories found.')
+            return redirect(next_url)
+        # One UPDATE and one history INSERT for the stories whose reason changes
+        changed = [(story_id, old_blocked) for story_id, old_blocked in rows if old_blocked != blocked_reason]
+        if changed:
+            Story.objects.filter(id__in=[story_id for story_id, _ in changed]).update(
+                blocked=blocked_reason, updated_at=timezone.now()
+            )
+            bump_report_cache_version()  # update() sends no signals
+            StoryHistory.objects.bulk_create([
+                StoryHistory(
+                    story_id=story_id,
+                    field_name='Blocked',
+                    old_value=old_blocked or '(not blocked)',
+                    new_value=blocked_reason
+                )
+                for story_id, old_blocked in changed
+            ], batch_size=500)
+        messages.success(request, f'🚫 Marked {len(rows)} stories as blocked.')
+        return redirect(next_url)
+    
+    # The remaining actions walk the stories, so load them once and count the list
+    stories = list(stories)
+    count = len(stories)
     
     if count == 0:
         messages.warning(request, '⚠️ No valid stories found.')
         return redirect(next_url)
     
     if action == 'add_labels':
-        label_ids_str = request.POST.get('label_ids', '')
-        label_ids = []
-        for lid in label_ids_str.split(','):
-            try:
-                label_ids.append(int(lid.strip()))
-            except (ValueError, TypeError):
-                pass
+        label_ids = _parse_ids(request.POST.get('label_ids', '').split(','))
         
         if label_ids:
             labels = Label.objects.filter(id__in=label_ids)
             label_names = ', '.join(sorted([l.name for l in labels]))
+            history_rows = []
             for story in stories:
                 # Add labels (don't remove existing)
                 current_labels = set(story.labels.values_list('id', flat=True))
                 new_labels = set(label_ids) - current_labels
                 if new_labels:
                     story.labels.add(*new_labels)
-                    StoryHistory.objects.create(
+                    history_rows.append(StoryHistory(
                         story=story,
                         field_name='Labels',
                         old_value='(added)',
                         new_value=label_names
-                    )
+                    ))
+            # One INSERT for all history rows
+            StoryHistory.objects.bulk_create(history_rows, batch_size=500)
             messages.success(request, f'🏷️ Added labels to {count} stories.')
         else:
             messages.warning(request, '⚠️ No labels selected.')
     
-    elif action == 'set_review':
-        stories.update(review_required=True)
-        messages.success(request, f'🚩 Set review required on {count} stories.')
-    
-    elif action == 'clear_review':
-        stories.update(review_required=False)
-        messages.success(request, f'✅ Cleared review flag from {count} stories.')
-    
-    elif action == 'set_blocked':
-        blocked_reason = request.POST.get('blocked_reason', '').strip()
-        if blocked_reason:
-            for story in stories:
-                old_blocked = story.blocked
-                story.blocked = blocked_reason
-                story.save()
-                if old_blocked != blocked_reason:
-                    StoryHistory.objects.create(
-                        story=story,
-                        field_name='Blocked',
-                        old_value=old_blocked or '(not blocked)',
-                        new_value=blocked_reason
-                    )
-            messages.success(request, f'🚫 Marked {count} stories as blocked.')
-        else:
-            messages.warning(request, '⚠️ No blocked reason provided.')
-    
-    elif action == 'archive':
-        stories.update(archived=True)
-        messages.success(request, f'📦 Archived {count} stories.')
-    
-    elif action == 'unarchive':
-        stories.update(archived=False)
-        messages.success(request, f'📤 Unarchived {count} stories.')
-    
-    elif action == 'delete':
-        stories.delete()
-        messages.success(request, f'🗑️ Deleted {count} stories.')
-    
     else:
         messages.warning(request, f'⚠️ Unknown action: {action}')
     
     return redirect(next_url)
 
 
+@require_POST
 def create_label(request):
     """AJAX endpoint to create a new label.
     
@@ -741,13 +948,6 @@ def create_label(request):
     - label_name: Name of the created label (on success)
     - error: Error message (on failure)
     """
-    import json
-    from django.http import JsonResponse
-    from django.views.decorators.http import require_POST
-    
-    if request.method != 'POST':
-        return JsonResponse({'success': False, 'error': 'POST required'}, status=405)
-    
     try:
         data = json.loads(request.body)
         category_id = data.get('category_id')
@@ -759,20 +959,20 @@ def create_label(request):
         if not name:
             return JsonResponse({'success': False, 'error': 'Label name required'})
         
-        # Get the category
-        from ..models import LabelCategory
+        # Get the category (only its id is needed to attach the label)
         try:
-            category = LabelCategory.objects.get(pk=category_id)
+            category = LabelCategory.objects.only('id').get(pk=category_id)
         except LabelCategory.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Category not found'})
         
-        # Check if label with same name already exists in this category
-        if Label.objects.filter(category=category, name__iexact=name).exists():
+        # Create the label; the case-insensitive unique constraint rejects a
+        # name already used in this category without a separate lookup
+        try:
+            with transaction.atomic():
+                label = Label.objects.create(category=category, name=name)
+        except IntegrityError:
             return JsonResponse({'success': False, 'error': 'Label already exists in this category'})
         
-        # Create the label
-        label = Label.objects.create(category=category, name=name)
-        
         return JsonResponse({
             'success': True,
             'label_id': label.id,
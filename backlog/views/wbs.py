@@ -8,13 +8,23 @@ Provides visual dependency mapping:
 """
 import json
 
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, render
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
 from django.views.decorators.http import require_POST
 
-from ..models import Story, StoryDependency
+from ..models import Story, StoryDependency, report_cache_version
 from .helpers import apply_label_filter, get_label_filter_context
 
+# json.dumps separators without the default padding spaces
+_COMPACT_JSON = (',', ':')
+
+# Seconds computed WBS data stays cached (a data version bump orphans it sooner)
+_WBS_CACHE_TIMEOUT = 3600
+
 
 def wbs_view(request):
     """Work Breakdown Structure showing stories with dependencies.
@@ -30,66 +40,23 @@ def wbs_view(request):
     # Get label filter context
     label_filter_ctx = get_label_filter_context(request)
     
-    # Get stories (exclude archived)
-    stories_qs = Story.objects.filter(archived=False).prefetch_related(
-        'dependencies__depends_on', 'dependents__story', 'cost_scores__answer', 'labels__category'
+    # The computed layout is cached per label filter and report data version
+    # (bumped by signals on story, score, label and dependency changes)
+    selected_labels = label_filter_ctx['selected_labels']
+    stories_data, dependencies_data, all_stories, max_cost = cache.get_or_set(
+        _wbs_cache_key(selected_labels),
+        lambda: _load_wbs_data(selected_labels),
+        _WBS_CACHE_TIMEOUT,
     )
     
-    # Apply label filter
-    stories_qs = apply_label_filter(stories_qs, label_filter_ctx['selected_labels'])
-    
-    stories_qs = stories_qs.order_by('title')
-    
-    # Calculate max cost for scaling the Gantt bars
-    max_cost = 1  # minimum to avoid division by zero
-    story_costs = {}
-    for story in stories_qs:
-        cost_sum = sum(cs.answer.score for cs in story.cost_scores.all() if cs.answer)
-        story_costs[story.id] = cost_sum
-        if cost_sum > max_cost:
-            max_cost = cost_sum
-    
-    # Build story data with positions for the visual layout
-    stories_data = []
-    dependencies_data = []
-    gantt_data = []  # For the Gantt chart
-    
-    # Assign positions - simple row layout
-    for row, story in enumerate(stories_qs):
-        cost = story_costs.get(story.id, 0)
-        cost_percent = (cost / max_cost * 100) if max_cost > 0 else 0
-        
-        story_entry = {
-            'id': story.id,
-            'title': story.title,
-            'status': story.computed_status,
-            'col': 0,
-            'row': row,
-            'cost': cost,
-            'cost_percent': cost_percent,
-        }
-        stories_data.append(story_entry)
-        gantt_data.append(story_entry)
-    
-    # Build dependencies list
-    for story in stories_qs:
-        for dep in story.dependencies.all():
-            dependencies_data.append({
-                'from_id': story.id,
-                'to_id': dep.depends_on.id,
-            })
-    
-    # All stories for the dropdown (unfiltered)
-    all_stories = Story.objects.all().order_by('title')
-    
     context = {
         'stories': stories_data,
         'dependencies': dependencies_data,
         'all_stories': all_stories,
-        'gantt_data': gantt_data,
+        'gantt_data': stories_data,
         'max_cost': max_cost,
-        'stories_json': json.dumps(stories_data),
-        'dependencies_json': json.dumps(dependencies_data),
+        'stories_json': json.dumps(stories_data, separators=_COMPACT_JSON),
+        'dependencies_json': json.dumps(dependencies_data, separators=_COMPACT_JSON),
         # Label filter context
         'label_categories': label_filter_ctx['label_categories'],
         'selected_labels': label_filter_ctx['selected_labels'],
@@ -99,29 +66,125 @@ def wbs_view(request):
     return render(request, 'backlog/wbs.html', context)
 
 
+def _wbs_cache_key(selected_labels):
+    """Cache key for the WBS data: the label filter plus the data version."""
+    labels = ','.join(map(str, sorted(selected_labels)))
+    return f"wbs:{report_cache_version()}:{labels}"
+
+
+def _load_wbs_data(selected_labels):
+    """Load the WBS stories, bars and dependency edges.
+    
+    Args:
+        selected_labels: Label IDs the stories must all have (empty for all)
+        
+    Returns:
+        Tuple of (stories_data, dependencies_data, all_stories, max_cost)
+    """
+    # Get stories (exclude archived), with their summed cost and computed
+    # status from the database instead of prefetching every cost score
+    stories_qs = Story.with_status(Story.objects.filter(archived=False)).annotate(
+        cost_sum=Coalesce(Sum('cost_scores__answer__score'), 0)
+    )
+    
+    # Apply label filter
+    stories_qs = apply_label_filter(stories_qs, selected_labels)
+    
+    # Build story data with positions for the visual layout (simple row
+    # layout) in one streamed pass, so Story instances are not kept around;
+    # the same entries feed the Gantt chart
+    stories_data = []
+    max_cost = 1  # minimum to avoid division by zero
+    stories_qs = stories_qs.only('id', 'title').order_by('title')
+    for row, story in enumerate(stories_qs.iterator(chunk_size=500)):
+        stories_data.append({
+            'id': story.id,
+            'title': story.title,
+            'status': story.annotated_status,
+            'col': 0,
+            'row': row,
+            'cost': story.cost_sum,
+        })
+        if story.cost_sum > max_cost:
+            max_cost = story.cost_sum
+    
+    # Scale the Gantt bars to the largest cost (percent per cost unit)
+    scale = 100.0 / max_cost
+    for entry in stories_data:
+        entry['cost_percent'] = entry['cost'] * scale
+    
+    # Build dependencies list from the (story, depends_on) id pairs alone
+    dependencies_data = [
+        {'from_id': from_id, 'to_id': to_id}
+        for from_id, to_id in _fetch_dep_edges([entry['id'] for entry in stories_data])
+    ]
+    
+    # All active stories for the dropdowns (ignoring the label filter), as
+    # plain id/title rows
+    all_stories = list(Story.objects.filter(archived=False).order_by('title').values('id', 'title'))
+    
+    return stories_data, dependencies_data, all_stories, max_cost
+
+
+def _fetch_dep_edges(story_ids):
+    """Fetch the dependency edges leaving the given stories.
+    
+    Args:
+        story_ids: IDs of the stories shown on the WBS
+        
+    Returns:
+        List of (story_id, depends_on_id) tuples
+    """
+    return list(
+        StoryDependency.objects.filter(story_id__in=story_ids).values_list('story_id', 'depends_on_id')
+    )
+
+
+def _parse_edge(data):
+    """Read the story and depends-on IDs of a dependency AJAX request.
+    
+    Args:
+        data: Decoded JSON body with story_id and depends_on_id
+        
+    Returns:
+        Tuple of (story_id, depends_on_id) as ints, or None if either is
+        missing or not a positive integer
+    """
+    try:
+        story_id, depends_on_id = int(data['story_id']), int(data['depends_on_id'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if story_id <= 0 or depends_on_id <= 0:
+        return None
+    return story_id, depends_on_id
+
+
 @require_POST
 def wbs_add_dependency(request):
     """Add a dependency via AJAX."""
     try:
-        data = json.loads(request.body)
-        story_id = data.get('story_id')
-        depends_on_id = data.get('depends_on_id')
-        
-        if not story_id or not depends_on_id:
+        edge = _parse_edge(json.loads(request.body))
+        if edge is None:
             return JsonResponse({'error': 'Missing story_id or depends_on_id'}, status=400)
+        story_id, depends_on_id = edge
         
-        if str(story_id) == str(depends_on_id):
+        if story_id == depends_on_id:
             return JsonResponse({'error': 'A story cannot depend on itself'}, status=400)
         
-        story = get_object_or_404(Story, pk=story_id)
-        depends_on = get_object_or_404(Story, pk=depends_on_id)
+        # Both stories must exist; check them with one query
+        if Story.objects.filter(pk__in=[story_id, depends_on_id]).count() != 2:
+            raise Http404("No Story matches the given query.")
         
-        # Check if dependency already exists
-        if StoryDependency.objects.filter(story=story, depends_on=depends_on).exists():
-            return JsonResponse({'error': 'Dependency already exists'}, status=400)
+        if StoryDependency.would_create_cycle(story_id, depends_on_id):
+            return JsonResponse({'error': 'This dependency would create a cycle'}, status=400)
         
-        StoryDependency.objects.create(story=story, depends_on=depends_on)
-        return JsonResponse({'success': True, 'from_id': story.id, 'to_id': depends_on.id})
+        # The (story, depends_on) unique constraint rejects duplicates
+        try:
+            with transaction.atomic():
+                StoryDependency.objects.create(story_id=story_id, depends_on_id=depends_on_id)
+        except IntegrityError:
+            return JsonResponse({'error': 'Dependency already exists'}, status=400)
+        return JsonResponse({'success': True, 'from_id': story_id, 'to_id': depends_on_id})
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
 
@@ -130,16 +193,14 @@ def wbs_add_dependency(request):
 def wbs_remove_dependency(request):
     """Remove a dependency via AJAX."""
     try:
-        data = json.loads(request.body)
-        story_id = data.get('story_id')
-        depends_on_id = data.get('depends_on_id')
-        
-        if not story_id or not depends_on_id:
+        edge = _parse_edge(json.loads(request.body))
+        if edge is None:
             return JsonResponse({'error': 'Missing story_id or depends_on_id'}, status=400)
+        story_id, depends_on_id = edge
         
-        dep = StoryDependency.objects.filter(story_id=story_id, depends_on_id=depends_on_id).first()
-        if dep:
-            dep.delete()
+        # Delete by the id pair in one statement, without loading the row
+        deleted, _ = StoryDependency.objects.filter(story_id=story_id, depends_on_id=depends_on_id).delete()
+        if deleted:
             return JsonResponse({'success': True})
         return JsonResponse({'error': 'Dependency not found'}, status=404)
     except json.JSONDecodeError:
@@ -118,6 +118,31 @@ DATABASES = {
     }
 }
 
+# Cache
+# Rendered report pages and factor metadata are cached and invalidated by
+# signals. Gunicorn runs several worker processes, so the cache has to be
+# shared between them: with the default per-process LocMemCache, a worker
+# would keep serving data that another worker had already invalidated.
+# Use CACHE_DIR env var if set, otherwise a cache directory next to the database
+
+CACHE_DIR = os.environ.get('CACHE_DIR', str(Path(DATABASE_PATH).parent / 'cache'))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+        'OPTIONS': {
+            # Rendered report, hybrid report and WBS pages per filter and data
+            # version (orphaned versions linger until they time out), plus the
+            # factor, label and refine entries. The default of 300 entries is
+            # reached quickly and culling would evict the live entries too.
+            'MAX_ENTRIES': 10000,
+            # Drop a quarter of the entries when the limit is reached
+            'CULL_FREQUENCY': 4,
+        },
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/X.X/ref/settings/#auth-password-validators
 